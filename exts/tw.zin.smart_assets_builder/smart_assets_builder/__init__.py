@@ -1 +1,7 @@
-from .extension import SmartAssetsBuilderExtension
\ No newline at end of file
+try:
+    import omni.ext  # noqa: F401
+except ImportError:
+    # Headless (usd-core only): CLI and pool worker processes import the pipeline directly.
+    pass
+else:
+    from .extension import SmartAssetsBuilderExtension
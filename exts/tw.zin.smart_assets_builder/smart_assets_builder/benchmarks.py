@@ -0,0 +1,352 @@
+# SmartAssetsBuilder — benchmarks.py
+# Micro-benchmarks for the build pipeline: `python -m smart_assets_builder bench-authoring`
+#                                           `python -m smart_assets_builder bench-load`
+#                                           `python -m smart_assets_builder bench-io`
+#                                           `python -m smart_assets_builder bench-arcs`
+# Runs on plain usd-core (no Kit). Every benchmark writes into a scratch folder it removes.
+
+import os
+import sys
+import asyncio
+import shutil
+import tempfile
+import statistics
+import time
+import multiprocessing
+import concurrent.futures as cf
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pxr import Usd, UsdGeom, Sdf, Kind, Vt, Gf
+
+from . import pipeline as _p
+from .nucleus_io import AsyncIO, LocalBackend
+from .templates import _make_custom_layer_data, _ASSET_CAM, _MAIN_CAM, _ID_CAM
+
+
+# ============================ Fixtures ===============================
+
+def _make_source(folder: str, core: str, points: int = 0) -> str:
+    """Small stand-in for a `max_<core>.usd` export: a World Xform with a few prims.
+
+    With `points`, a mesh with that many points is added so opening it costs something.
+    """
+    path = os.path.join(folder, core, f"max_{core}.usd")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    layer = Sdf.Layer.CreateNew(path)
+    world = Sdf.PrimSpec(layer, "World", Sdf.SpecifierDef, "Xform")
+    layer.defaultPrim = "World"
+    for i in range(8):
+        Sdf.PrimSpec(world, f"Cube_{i}", Sdf.SpecifierDef, "Cube")
+    if points:
+        mesh = Sdf.PrimSpec(world, "Body", Sdf.SpecifierDef, "Mesh")
+        attr = Sdf.AttributeSpec(mesh, "points", Sdf.ValueTypeNames.Point3fArray)
+        attr.default = Vt.Vec3fArray([Gf.Vec3f(i, i * 0.5, i * 0.25) for i in range(points)])
+    layer.Save()
+    return path
+
+
+# ==================== Legacy (composed stage) authoring ====================
+# The pre-Sdf implementation, kept as the "before" side of bench_authoring.
+
+def _legacy_stage(out_path: str) -> Usd.Stage:
+    out_path = _p._ensure_usd_ext(out_path)
+    _p._ensure_dir_local(os.path.dirname(out_path))
+    root = Sdf.Layer.CreateNew(out_path)
+    stage = Usd.Stage.Open(root)
+    UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
+    UsdGeom.SetStageMetersPerUnit(stage, 0.01)
+    stage.SetTimeCodesPerSecond(60)
+    stage.SetStartTimeCode(0)
+    stage.SetEndTimeCode(100)
+    stage.SetDefaultPrim(UsdGeom.Xform.Define(stage, "/World").GetPrim())
+    return stage
+
+
+def _legacy_trio(out_dir: str, max_path: str, core: str) -> None:
+    asset = os.path.join(out_dir, f"asset_{core}.usd")
+    main = os.path.join(out_dir, f"{core}.usd")
+    id_ = os.path.join(out_dir, f"id_{core}_TEMP00000001.usd")
+
+    stage = _legacy_stage(asset)
+    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_ASSET_CAM)
+    stage.GetRootLayer().subLayerPaths = [_p._dotify_rel(_p._relref(asset, max_path))]
+    stage.GetRootLayer().Save()
+
+    stage = _legacy_stage(main)
+    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_MAIN_CAM)
+    UsdGeom.Scope.Define(stage, "/World/ASSET")
+    prim = stage.DefinePrim(f"/World/ASSET/asset_{core}")
+    prim.GetReferences().AddReference(_p._relref(main, asset))
+    stage.GetRootLayer().Save()
+
+    stage = _legacy_stage(id_)
+    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_ID_CAM)
+    prim = stage.DefinePrim(f"/World/{core}")
+    Usd.ModelAPI(prim).SetKind(Kind.Tokens.component)
+    prim.GetReferences().AddReference(_p._relref(id_, main))
+    stage.GetRootLayer().Save()
+
+
+def _sdf_trio(out_dir: str, max_path: str, core: str) -> None:
+    asset = _p._build_asset(os.path.join(out_dir, f"asset_{core}.usd"), max_path)
+    main = _p._build_main(os.path.join(out_dir, f"{core}.usd"), asset, core)
+    _p._build_id(os.path.join(out_dir, f"id_{core}_TEMP00000001.usd"), main, core)
+
+
+# ============================ Benchmarks ===============================
+
+def _time_trios(build: Callable[[str, str, str], None], sources: List[str], out_dir: str) -> List[float]:
+    """Seconds per asset for building every trio once into `out_dir`."""
+    out = []
+    for src in sources:
+        core = os.path.basename(os.path.dirname(src))
+        dst = os.path.join(out_dir, core)
+        t0 = time.perf_counter()
+        build(dst, src, core)
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000.0, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000.0, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000.0, 3),
+    }
+
+
+def bench_authoring(count: int = 100, repeat: int = 3, work_dir: Optional[str] = None) -> dict:
+    """Per-asset authoring time of the asset/main/id trio: composed stages vs. Sdf-only layers.
+
+    Each round writes `count` trios per method into fresh folders (so the layer
+    registry never hands back a cached layer). Returns per-method summaries and
+    the speed-up of the Sdf path.
+    """
+    root = tempfile.mkdtemp(prefix="sab_bench_", dir=work_dir)
+    try:
+        sources = [_make_source(os.path.join(root, "src"), f"B{i:04d}") for i in range(max(1, count))]
+        samples = {"stage": [], "sdf": []}
+        for r in range(max(1, repeat)):
+            # Alternate the order so neither method always runs on a warm disk cache.
+            order = ("stage", "sdf") if r % 2 == 0 else ("sdf", "stage")
+            for name in order:
+                build = _legacy_trio if name == "stage" else _sdf_trio
+                samples[name] += _time_trios(build, sources, os.path.join(root, f"out_{name}_{r}"))
+        result = {"count": len(sources), "repeat": max(1, repeat),
+                  "stage": _summary(samples["stage"]), "sdf": _summary(samples["sdf"])}
+        if result["sdf"]["mean_ms"] > 0:
+            result["speedup"] = round(result["stage"]["mean_ms"] / result["sdf"]["mean_ms"], 2)
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None where it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource  # peak, not current, but the best portable fallback
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _open_all(paths: List[str]) -> dict:
+    """Runs in a fresh process: open every path as a stage and hold them all open."""
+    warm = Usd.Stage.Open(paths[0])  # plugin loading is not part of the measurement
+    del warm
+    rss0 = _rss_bytes()
+    stages, times = [], []
+    t_all = time.perf_counter()
+    for p in paths:
+        t0 = time.perf_counter()
+        stages.append(Usd.Stage.Open(p))
+        times.append(time.perf_counter() - t0)
+    total = time.perf_counter() - t_all
+    rss1 = _rss_bytes()
+    out = {"open": _summary(times), "total_s": round(total, 3)}
+    if rss0 is not None and rss1 is not None:
+        out["rss_mb"] = round((rss1 - rss0) / 2.0 ** 20, 2)
+    return out
+
+
+def bench_load(count: int = 200, encodings: Sequence[str] = ("usda", "usdc", "usdz"),
+               points: int = 2048, work_dir: Optional[str] = None) -> dict:
+    """Open time and memory of `count` built assets per output encoding.
+
+    For usda/usdc every layer of the trio is written in that encoding and the id
+    files are opened; for usdz the packaged `<core>.usdz` files are opened. Each
+    encoding is measured in its own fresh process so layer caches do not leak
+    between them.
+    """
+    root = tempfile.mkdtemp(prefix="sab_bench_", dir=work_dir)
+    try:
+        sources = [_make_source(os.path.join(root, "src"), f"B{i:04d}", points) for i in range(max(1, count))]
+        result = {"count": len(sources), "points": points}
+        ctx = multiprocessing.get_context("spawn")
+        for enc in encodings:
+            out_root = os.path.join(root, f"out_{enc}")
+            layer_enc = enc if enc in (_p.ENCODING_USDA, _p.ENCODING_USDC) else _p.ENCODING_DEFAULT
+            opts = _p.BuildOptions(out_root=out_root, asset_encoding=layer_enc, main_encoding=layer_enc,
+                                   id_encoding=layer_enc, usdz=(enc == "usdz"))
+            paths = []
+            for src in sources:
+                res = _p.build_item(src, opts)
+                if res.status != "done":
+                    raise RuntimeError(f"Build failed for {src}: {res.logs[-1][1] if res.logs else ''}")
+                core = os.path.basename(os.path.dirname(src))
+                paths.append(os.path.join(out_root, core, f"{core}.usdz") if enc == "usdz"
+                             else os.path.join(out_root, f"id_{core}_{opts.id_suffix}.usd"))
+            with cf.ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                result[enc] = pool.submit(_open_all, paths).result()
+            result[enc]["bytes_on_disk"] = sum(os.path.getsize(p) for p in paths)
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_io(files: int = 400, size_kb: int = 64, latency_ms: float = 20.0, jitter_ms: float = 0.0,
+             bandwidth_mbps: float = 0.0, in_flight: Sequence[int] = (1, 4, 16, 64),
+             work_dir: Optional[str] = None) -> dict:
+    """Async I/O layer throughput against the in-process stand-in server.
+
+    `files` files of `size_kb` are spread over a few folders of a fake
+    `omniverse://bench` server. For each `in_flight` bound the stand-in with the
+    given latency/bandwidth is walked, stat'ed and copied (copy_tree); bound 1
+    is what one blocking call at a time costs.
+    """
+    root = tempfile.mkdtemp(prefix="sab_bench_", dir=work_dir)
+    try:
+        backend = LocalBackend(root, latency=latency_ms / 1000.0, jitter=jitter_ms / 1000.0,
+                               bandwidth_mbps=bandwidth_mbps)
+        payload = os.urandom(max(0, size_kb) * 1024)
+        for i in range(max(1, files)):
+            path = backend.path(f"omniverse://bench/src/d{i % 8}/f{i:05d}.bin")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(payload)
+        result = {"files": max(1, files), "size_kb": size_kb, "latency_ms": latency_ms,
+                  "jitter_ms": jitter_ms, "bandwidth_mbps": bandwidth_mbps}
+
+        async def _round(n: int) -> dict:
+            aio = AsyncIO(backend, max_in_flight=n)
+            t0 = time.perf_counter()
+            found = await aio.walk("omniverse://bench/src")
+            t1 = time.perf_counter()
+            await aio.stat_many([u for _rel, u in found])
+            t2 = time.perf_counter()
+            copied, failed = await aio.copy_tree("omniverse://bench/src", f"omniverse://bench/dst_{n}")
+            t3 = time.perf_counter()
+            return {"walk_s": round(t1 - t0, 3), "stat_s": round(t2 - t1, 3), "copy_s": round(t3 - t2, 3),
+                    "copied": copied, "failed": len(failed),
+                    "files_per_s": round(copied / (t3 - t2), 1) if t3 > t2 else 0.0,
+                    "mb_per_s": round(copied * len(payload) / 2.0 ** 20 / (t3 - t2), 2) if t3 > t2 else 0.0,
+                    "calls": {k: v for k, v in aio.calls.items() if v}}
+
+        for n in in_flight:
+            result[f"in_flight_{n}"] = asyncio.run(_round(max(1, n)))
+        lo, hi = f"in_flight_{min(in_flight)}", f"in_flight_{max(in_flight)}"
+        if result[hi]["copy_s"] > 0:
+            result["speedup"] = round(result[lo]["copy_s"] / result[hi]["copy_s"], 2)
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+# ======================= References vs. payloads ==========================
+
+def _write_layout(out_root: str, id_paths: List[str]) -> str:
+    """A layout layer that references every id file once, spread on a grid."""
+    path = os.path.join(out_root, "layout.usda")
+    layer = Sdf.Layer.CreateNew(path)
+    world = Sdf.PrimSpec(layer, "World", Sdf.SpecifierDef, "Xform")
+    world.kind = Kind.Tokens.group   # contiguous model hierarchy: bounds can use extentsHint
+    layer.defaultPrim = "World"
+    side = max(1, int(len(id_paths) ** 0.5))
+    for i, p in enumerate(id_paths):
+        prim = Sdf.PrimSpec(world, f"Item_{i:05d}", Sdf.SpecifierDef, "Xform")
+        prim.kind = Kind.Tokens.group
+        prim.referenceList.Prepend(Sdf.Reference("./" + os.path.relpath(p, out_root).replace(os.sep, "/")))
+        op = Sdf.AttributeSpec(prim, "xformOp:translate", Sdf.ValueTypeNames.Double3)
+        op.default = Gf.Vec3d((i % side) * 300.0, (i // side) * 300.0, 0.0)
+        order = Sdf.AttributeSpec(prim, "xformOpOrder", Sdf.ValueTypeNames.TokenArray)
+        order.default = Vt.TokenArray(["xformOp:translate"])
+    layer.Save()
+    return path
+
+
+def _open_layout(path: str, load_all: bool, region: int) -> dict:
+    """Runs in a fresh process: open the layout, query its bounds, then load `region` items."""
+    warm = Usd.Stage.CreateInMemory()  # plugin loading is not part of the measurement
+    UsdGeom.Xform.Define(warm, "/W")
+    del warm
+    rss0 = _rss_bytes()
+    t0 = time.perf_counter()
+    stage = Usd.Stage.Open(path, Usd.Stage.LoadAll if load_all else Usd.Stage.LoadNone)
+    t1 = time.perf_counter()
+    rss1 = _rss_bytes()
+    prims = sum(1 for _ in stage.TraverseAll())
+    t2 = time.perf_counter()
+    cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_], useExtentsHint=True)
+    bound = cache.ComputeWorldBound(stage.GetPseudoRoot()).ComputeAlignedRange()
+    t3 = time.perf_counter()
+    out = {"open_s": round(t1 - t0, 3), "prims": prims, "bounds_s": round(t3 - t2, 3),
+           "bounds": None if bound.IsEmpty() else [[round(v, 3) for v in bound.GetMin()],
+                                                   [round(v, 3) for v in bound.GetMax()]]}
+    if rss0 is not None and rss1 is not None:
+        out["rss_mb"] = round((rss1 - rss0) / 2.0 ** 20, 2)
+    if not load_all and region:
+        items = stage.GetDefaultPrim().GetChildren()[:region]
+        t4 = time.perf_counter()
+        stage.LoadAndUnload([p.GetPath() for p in items], [])
+        out["load_region_s"] = round(time.perf_counter() - t4, 3)
+        out["region"] = len(items)
+    return out
+
+
+def bench_arcs(count: int = 500, points: int = 2048, region: int = 0, work_dir: Optional[str] = None) -> dict:
+    """Open time and memory of a layout of `count` id files: reference arcs vs. payload arcs.
+
+    Both variants are built with bounds (extentsHint) and laid out by one
+    layout layer. Each opening runs in its own fresh process: references
+    (everything composes and loads), payloads opened unloaded, and payloads
+    opened fully loaded. The unloaded payload stage then loads `region` items
+    (default: a tenth) to show on-demand loading.
+    """
+    root = tempfile.mkdtemp(prefix="sab_bench_", dir=work_dir)
+    try:
+        sources = [_make_source(os.path.join(root, "src"), f"B{i:04d}", points) for i in range(max(1, count))]
+        region = region or max(1, len(sources) // 10)
+        result = {"count": len(sources), "points": points}
+        ctx = multiprocessing.get_context("spawn")
+        layouts = {}
+        for arc in _p.ARCS:
+            out_root = os.path.join(root, f"out_{arc}")
+            opts = _p.BuildOptions(out_root=out_root, bounds=True, arc=arc)
+            ids = []
+            for src in sources:
+                res = _p.build_item(src, opts)
+                if res.status != "done":
+                    raise RuntimeError(f"Build failed for {src}: {res.logs[-1][1] if res.logs else ''}")
+                core = os.path.basename(os.path.dirname(src))
+                ids.append(os.path.join(out_root, f"id_{core}_{opts.id_suffix}.usd"))
+            layouts[arc] = _write_layout(out_root, ids)
+        runs = (("references", _p.ARC_REFERENCE, True), ("payloads_unloaded", _p.ARC_PAYLOAD, False),
+                ("payloads_loaded", _p.ARC_PAYLOAD, True))
+        for name, arc, load_all in runs:
+            with cf.ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                result[name] = pool.submit(_open_layout, layouts[arc], load_all, region).result()
+        ref, lazy = result["references"], result["payloads_unloaded"]
+        if lazy["open_s"] > 0:
+            result["open_speedup"] = round(ref["open_s"] / lazy["open_s"], 2)
+        if "rss_mb" in ref and "rss_mb" in lazy:
+            result["rss_saved_mb"] = round(ref["rss_mb"] - lazy["rss_mb"], 2)
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,551 @@
+# SmartAssetsBuilder — cli.py
+# Headless entry point: `python -m smart_assets_builder build <source> <output> ...`
+#                       `python -m smart_assets_builder plan <source> <output> ...`   (dry run)
+#                       `python -m smart_assets_builder scan <source> [--full]`       (indexed rescan)
+#                       `python -m smart_assets_builder resume <output>`
+#                       `python -m smart_assets_builder queue add|list|remove|retry|clear|run`
+#                       `python -m smart_assets_builder bench-authoring [--count N]`
+#                       `python -m smart_assets_builder bench-load [--count N]`
+#                       `python -m smart_assets_builder bench-io [--latency-ms MS]`
+#                       `python -m smart_assets_builder bench-arcs [--count N]`
+# Runs on plain usd-core (no Kit). Progress is streamed to stdout as JSON lines.
+
+import argparse
+import dataclasses
+import json
+import signal
+import sys
+import threading
+import time
+import concurrent.futures as cf
+from typing import List, Optional
+
+from .pipeline import _is_ov_url, BuildOptions, ItemResult, plan_output_dirs, create_output_dirs
+from .pipeline import SYNC_OFF, SYNC_MTIME, SYNC_CHECKSUM, ENCODING_USDA, ENCODING_USDC, ARCS, ARC_REFERENCE
+from .scanner import Scanner, ScanFeed, DEFAULT_PRUNE, _filter_text, _list_local, _list_nucleus, _scan_indexed
+from .manifest import BuildManifest
+from .engine import BuildEngine, MODE_THREADS, MODE_PROCESSES, _default_workers
+from .planner import plan_build
+from .templates import register_template, registered_templates, template_layer
+from .journal import BuildJournal
+from .report import BuildReport
+from .jobqueue import JobQueue, EngineGroup, BuildJob, make_job, DONE, FAILED, JOB_STATES
+
+
+def _emit(event: str, **fields) -> None:
+    sys.stdout.write(json.dumps({"event": event, **fields}, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _add_filter_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--pattern", default="max_*.usd",
+                   help="';'-separated globs or re:<regex>; '!' excludes, a trailing '/' prunes a folder "
+                        "(default: max_*.usd)")
+    p.add_argument("--prune", action="append", default=None, metavar="NAME",
+                   help=f"Folder name (glob or re:) never listed (repeatable; default: {', '.join(DEFAULT_PRUNE)})")
+    p.add_argument("--no-prune", action="store_true", help="Do not prune the default folders")
+    p.add_argument("--no-recurse", dest="recurse", action="store_false", help="Do not search sub-folders")
+
+
+def _scan_filter(args: argparse.Namespace) -> str:
+    """Normalized filter text from --pattern/--prune; raises ValueError on a bad regex."""
+    prune = list(args.prune or [])
+    if not args.no_prune:
+        prune += [d for d in DEFAULT_PRUNE if d not in prune]
+    return _filter_text(args.pattern.strip(), prune)
+
+
+def _add_build_args(p: argparse.ArgumentParser) -> None:
+    """Source/output/options shared by `build` and `plan`."""
+    p.add_argument("source", help="Source folder (local path or omniverse:// URL)")
+    p.add_argument("output", help="Output root (local path or omniverse:// URL)")
+    _add_filter_args(p)
+    p.add_argument("--suffix", default="", help="ID suffix (default: TEMP00000001)")
+    p.add_argument("--material", default="", help="Material overlay layer added on top of each asset")
+    p.add_argument("--overwrite", action="store_true", help="Rebuild and recopy existing outputs")
+    p.add_argument("--sync", choices=("off", SYNC_MTIME, SYNC_CHECKSUM), default="off",
+                   help="With --overwrite, keep outputs that already match the source (default: off)")
+    p.add_argument("--incremental", action="store_true", help="Only rebuild sources whose inputs changed")
+    p.add_argument("--dedup-materials", action="store_true",
+                   help="Store byte-identical Materials files once (hardlinks locally, shared folder on Nucleus)")
+    p.add_argument("--copy-deps", action="store_true",
+                   help="Copy only the files each max layer depends on instead of its whole Materials folder")
+    p.add_argument("--template", action="append", default=[], metavar="ROLE=LAYER",
+                   help="Custom skeleton layer for the asset, main or id layer (repeatable)")
+    for role in ("asset", "main", "id"):
+        p.add_argument(f"--{role}-encoding", choices=("default", ENCODING_USDA, ENCODING_USDC), default="default",
+                       help=f"Encoding of the {role} layers (file names stay .usd; default: crate)")
+    p.add_argument("--usdz", action="store_true", help="Also package each asset as <CORE>/<core>.usdz")
+    p.add_argument("--arc", choices=ARCS, default=ARC_REFERENCE,
+                   help="Arc type of main -> asset and id -> main (payloads let layouts open unloaded)")
+    p.add_argument("--bounds", action="store_true",
+                   help="Author extentsHint on the id and asset roots and record world bounds in the report")
+    p.add_argument("--inplace", action="store_true", help="Allow output root == source <CORE> folder")
+    p.add_argument("--workers", type=int, default=0, help="Worker count (default: CPU count, max 8)")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="smart_assets_builder",
+                                     description="SimReady asset builder (headless).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Scan a source root and build the asset/main/id trio for each match.")
+    _add_build_args(b)
+    b.add_argument("--pool", choices=(MODE_THREADS, MODE_PROCESSES), default=MODE_THREADS,
+                   help="Worker pool type (default: threads)")
+    b.add_argument("--pipelined", action="store_true",
+                   help="Start building each source as soon as the scanner finds it")
+    b.add_argument("--queue-size", type=int, default=256,
+                   help="Max scanned-but-unbuilt items in pipelined mode (default: 256)")
+    b.set_defaults(func=_cmd_build)
+
+    pl = sub.add_parser("plan", help="Dry run: what build would copy, create and author (writes nothing).")
+    _add_build_args(pl)
+    pl.add_argument("--throughput", type=float, default=0.0,
+                    help="Copy throughput in MB/s for the estimate (default: measured)")
+    pl.add_argument("--items", action="store_true", help="Also emit one plan line per item")
+    pl.set_defaults(func=_cmd_plan)
+
+    sc = sub.add_parser("scan", help="Rescan a source root through its persistent index and report changes.")
+    sc.add_argument("source", help="Source folder (local path or omniverse:// URL)")
+    _add_filter_args(sc)
+    sc.add_argument("--full", action="store_true", help="List every folder again instead of trusting folder mtimes")
+    sc.add_argument("--list", action="store_true", help="Also emit every match")
+    sc.set_defaults(func=_cmd_scan)
+
+    r = sub.add_parser("resume", help="Continue the interrupted run journaled under an output root.")
+    r.add_argument("output", help="Output root of the interrupted run")
+    r.add_argument("--workers", type=int, default=0, help="Worker count (default: CPU count, max 8)")
+    r.add_argument("--pool", choices=(MODE_THREADS, MODE_PROCESSES), default=MODE_THREADS,
+                   help="Worker pool type (default: threads)")
+    r.set_defaults(func=_cmd_resume)
+
+    q = sub.add_parser("queue", help="Persistent job queue: several source/output pairs built in one go.")
+    qs = q.add_subparsers(dest="action", required=True)
+    qa = qs.add_parser("add", help="Queue a build job (same arguments as build).")
+    _add_build_args(qa)
+    qa.set_defaults(func=_cmd_queue_add)
+    ql = qs.add_parser("list", help="Show the queued, running and finished jobs.")
+    ql.set_defaults(func=_cmd_queue_list)
+    qr = qs.add_parser("remove", help="Drop a job that is not running.")
+    qr.add_argument("job", help="Job id (see queue list)")
+    qr.set_defaults(func=_cmd_queue_remove)
+    qt = qs.add_parser("retry", help="Queue a finished or failed job again.")
+    qt.add_argument("job", help="Job id (see queue list)")
+    qt.set_defaults(func=_cmd_queue_retry)
+    qc = qs.add_parser("clear", help="Drop finished jobs (default: done and failed).")
+    qc.add_argument("--state", action="append", choices=JOB_STATES, default=None,
+                    help="Only drop jobs in this state (repeatable; running jobs always stay)")
+    qc.set_defaults(func=_cmd_queue_clear)
+    qn = qs.add_parser("run", help="Run the queued jobs until the queue is empty.")
+    qn.add_argument("--concurrency", type=int, default=1,
+                    help="Jobs running at once (default: 1; more than one uses process pools)")
+    qn.add_argument("--io-cap", type=int, default=0,
+                    help="Items in flight across all running jobs (default: 0 = each job's own bound)")
+    qn.add_argument("--workers", type=int, default=0, help="Workers per job (default: CPU count, max 8)")
+    qn.add_argument("--pool", choices=(MODE_THREADS, MODE_PROCESSES), default=MODE_THREADS,
+                    help="Worker pool type of every job (default: threads)")
+    qn.set_defaults(func=_cmd_queue_run)
+
+    ba = sub.add_parser("bench-authoring",
+                        help="Time asset/main/id authoring: composed stages vs. Sdf-only layers.")
+    ba.add_argument("--count", type=int, default=100, help="Assets per round (default: 100)")
+    ba.add_argument("--repeat", type=int, default=3, help="Rounds per method (default: 3)")
+    ba.add_argument("--dir", default=None, help="Scratch folder parent (default: system temp)")
+    ba.set_defaults(func=_cmd_bench_authoring)
+
+    bl = sub.add_parser("bench-load", help="Open time and memory of built assets per output encoding.")
+    bl.add_argument("--count", type=int, default=200, help="Assets per encoding (default: 200)")
+    bl.add_argument("--encodings", default="usda,usdc,usdz", help="Comma-separated (default: usda,usdc,usdz)")
+    bl.add_argument("--points", type=int, default=2048, help="Mesh points per source asset (default: 2048)")
+    bl.add_argument("--dir", default=None, help="Scratch folder parent (default: system temp)")
+    bl.set_defaults(func=_cmd_bench_load)
+
+    bi = sub.add_parser("bench-io", help="Async I/O throughput against an in-process stand-in server.")
+    bi.add_argument("--files", type=int, default=400, help="Files to copy (default: 400)")
+    bi.add_argument("--size-kb", type=int, default=64, help="Size of each file in KiB (default: 64)")
+    bi.add_argument("--latency-ms", type=float, default=20.0, help="Simulated round trip per request (default: 20)")
+    bi.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per request (default: 0)")
+    bi.add_argument("--bandwidth", type=float, default=0.0, help="Simulated MB/s per transfer (default: unlimited)")
+    bi.add_argument("--in-flight", default="1,4,16,64", help="Comma-separated request bounds (default: 1,4,16,64)")
+    bi.add_argument("--dir", default=None, help="Scratch folder parent (default: system temp)")
+    bi.set_defaults(func=_cmd_bench_io)
+
+    bc = sub.add_parser("bench-arcs", help="Open time and memory of a layout of id files: references vs. payloads.")
+    bc.add_argument("--count", type=int, default=500, help="Id files in the layout (default: 500)")
+    bc.add_argument("--points", type=int, default=2048, help="Mesh points per source asset (default: 2048)")
+    bc.add_argument("--region", type=int, default=0, help="Items loaded on demand afterwards (default: count/10)")
+    bc.add_argument("--dir", default=None, help="Scratch folder parent (default: system temp)")
+    bc.set_defaults(func=_cmd_bench_arcs)
+    return parser
+
+
+def _encoding(choice: str) -> str:
+    return "" if choice == "default" else choice
+
+
+def _register_templates(specs: List[str]) -> Optional[str]:
+    """Register `ROLE=LAYER` specs; returns an error message or None."""
+    for spec in specs:
+        role, sep, path = spec.partition("=")
+        try:
+            if not sep or not path.strip():
+                raise ValueError(f"Expected ROLE=LAYER, got {spec!r}")
+            register_template(role.strip().lower(), path.strip())
+            template_layer(role.strip().lower())  # fail fast on unreadable layers
+        except ValueError as e:
+            return str(e)
+    return None
+
+
+def _options(args: argparse.Namespace, out_root: str) -> BuildOptions:
+    return BuildOptions(out_root=out_root, id_suffix=args.suffix.strip() or "TEMP00000001",
+                        overwrite=args.overwrite, mat_path_override=args.material.strip(),
+                        inplace_ok=args.inplace, incremental=args.incremental,
+                        dedup_materials=args.dedup_materials, dependency_copy=args.copy_deps,
+                        sync=SYNC_OFF if args.sync == "off" else args.sync,
+                        asset_encoding=_encoding(args.asset_encoding), main_encoding=_encoding(args.main_encoding),
+                        id_encoding=_encoding(args.id_encoding), usdz=args.usdz, bounds=args.bounds,
+                        arc=args.arc)
+
+
+def _cmd_build(args: argparse.Namespace) -> int:
+    src_root = args.source.strip()
+    out_root = args.output.strip()
+    try:
+        pattern = _scan_filter(args)
+    except ValueError as e:
+        _emit("error", message=str(e))
+        return 2
+
+    err = _register_templates(args.template)
+    if err:
+        _emit("error", message=err)
+        return 2
+
+    opts = _options(args, out_root)
+    return _run_build(args, src_root, pattern, args.recurse, opts, BuildJournal(out_root),
+                      pipelined=args.pipelined)
+
+
+def _cmd_plan(args: argparse.Namespace) -> int:
+    src_root = args.source.strip()
+    out_root = args.output.strip()
+    try:
+        pattern = _scan_filter(args)
+    except ValueError as e:
+        _emit("error", message=str(e))
+        return 2
+    err = _register_templates(args.template)
+    if err:
+        _emit("error", message=err)
+        return 2
+    opts = _options(args, out_root)
+
+    t0 = time.perf_counter()
+    files = _list_nucleus(src_root, pattern, args.recurse) if _is_ov_url(src_root) else _list_local(src_root, pattern, args.recurse)
+    _emit("scan", source=src_root, pattern=pattern, found=len(files), seconds=round(time.perf_counter() - t0, 3))
+    manifest = BuildManifest.load(out_root) if opts.incremental else None
+    plan = plan_build(files, opts, workers=args.workers or _default_workers(), manifest=manifest,
+                      throughput_mbps=args.throughput)
+    if args.items:
+        for ip in plan.items:
+            _emit("plan-item", src=ip.src, action=ip.action, reason=ip.reason, files=ip.files,
+                  bytes=ip.bytes, kept=ip.kept, layers=ip.layers, missing=ip.missing)
+    _emit("plan", output=out_root, **plan.summary())
+    return 1 if plan.count("failed") else 0
+
+
+def _cmd_scan(args: argparse.Namespace) -> int:
+    src_root = args.source.strip()
+    try:
+        pattern = _scan_filter(args)
+    except ValueError as e:
+        _emit("error", message=str(e))
+        return 2
+    t0 = time.perf_counter()
+    files, delta = _scan_indexed(src_root, pattern, args.recurse, reuse=not args.full)
+    _emit("scan", source=src_root, pattern=pattern, found=len(files), seconds=round(time.perf_counter() - t0, 3),
+          dirs_listed=delta.dirs_listed, dirs_reused=delta.dirs_reused)
+    if args.list:
+        for f in files:
+            _emit("match", src=f)
+    _emit("delta", first_scan=delta.first_scan, added=delta.added, removed=delta.removed, modified=delta.modified)
+    return 0
+
+
+def _cmd_resume(args: argparse.Namespace) -> int:
+    out_root = args.output.strip()
+    journal = BuildJournal.load(out_root)
+    if not journal.resumable:
+        _emit("error", message=f"No interrupted run to resume for {out_root} ({journal.path})")
+        return 2
+    err = _register_templates([f"{r}={p}" for r, p in (journal.header.get("templates") or {}).items()])
+    if err:
+        _emit("error", message=err)
+        return 2
+    h = journal.header
+    return _run_build(args, h.get("source", ""), h.get("pattern", "max_*.usd"), h.get("recurse", True),
+                      dataclasses.replace(journal.options(), resumed=True), journal, resumed=True)
+
+
+def _run_build(args: argparse.Namespace, src_root: str, pattern: str, recurse: bool, opts: BuildOptions,
+               journal: BuildJournal, pipelined: bool = False, resumed: bool = False,
+               engine: Optional[BuildEngine] = None, emit=_emit) -> int:
+    out_root = opts.out_root
+    manifest = BuildManifest.load(out_root) if opts.incremental else None
+    engine = engine or BuildEngine(workers=args.workers, mode=args.pool)
+
+    t0 = time.perf_counter()
+    report = BuildReport(out_root, engine.workers, engine.mode)
+    feed = None
+    if pipelined:
+        feed = ScanFeed(Scanner(src_root, pattern, recurse), maxsize=args.queue_size).start()
+        items = feed
+        journal.begin(opts, src_root, pattern, recurse, None, engine.run_templates())
+        emit("start", total=None, output=out_root, workers=engine.workers, pool=engine.mode, pipelined=True)
+    else:
+        files = journal.items() if resumed else None
+        if files is None:
+            files = _list_nucleus(src_root, pattern, recurse) if _is_ov_url(src_root) else _list_local(src_root, pattern, recurse)
+            report.set_scan(time.perf_counter() - t0, len(files))
+            emit("scan", source=src_root, pattern=pattern, found=len(files), seconds=round(time.perf_counter() - t0, 3))
+        if resumed:
+            files = journal.pending(files)
+            journal.resume()
+            emit("resume", journal=journal.path, finished=journal.finished_count, remaining=len(files))
+        elif files:
+            journal.begin(opts, src_root, pattern, recurse, files, engine.run_templates())
+        if not files:
+            journal.close(completed=True)
+            emit("done", total=0, done=0, skipped=0, failed=0, seconds=round(time.perf_counter() - t0, 3))
+            return 0
+        items = files
+        create_output_dirs(plan_output_dirs(files, opts), engine.io_cache)
+        emit("start", total=len(files), output=out_root, workers=engine.workers, pool=engine.mode)
+
+    counts = {"finished": 0, "done": 0, "skipped": 0, "failed": 0, "cancelled": 0}
+    totals = {}
+
+    def _total() -> int:
+        return feed.discovered if feed is not None else len(items)
+
+    def _on_sigint(_signum, _frame):
+        # First Ctrl+C cancels cleanly (running items stop at their next stage), a second one aborts.
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        engine.cancel()
+        emit("cancel", message="Cancelling: finishing the current stage of running items (Ctrl+C again to abort)")
+
+    def _on_result(res: ItemResult):
+        counts["finished"] += 1
+        counts[res.status if res.status in counts else "failed"] += 1
+        for k, v in res.stats.items():
+            totals[k] = totals.get(k, 0) + v
+        journal.record(res)
+        report.add(res)
+        if manifest is not None and res.manifest_entry:
+            manifest.update(res.src, res.manifest_entry)
+            if counts["finished"] % 100 == 0:
+                manifest.save()
+        emit("item", index=counts["finished"], total=_total(), src=res.src, status=res.status,
+              timings={k: round(v, 4) for k, v in res.timings.items()},
+              logs=[[lvl, txt] for lvl, txt in res.logs])
+
+    completed = False
+    try:
+        prev_sigint = signal.signal(signal.SIGINT, _on_sigint)
+    except ValueError:  # not the main thread
+        prev_sigint = None
+    try:
+        engine.run(items, opts, _on_result, manifest=manifest, journal=journal)
+        completed = (feed is None or feed.error is None) and not engine.cancelled
+    finally:
+        if prev_sigint is not None:
+            signal.signal(signal.SIGINT, prev_sigint)
+        if feed is not None:
+            feed.close()
+        if manifest is not None and manifest.dirty and not manifest.save():
+            emit("error", message=f"Could not write build manifest: {manifest.path}")
+        # Failed items keep the run resumable; `resume` retries them from their last stage.
+        journal.close(completed=completed and not counts["failed"])
+
+    if feed is not None:
+        emit("scan", source=src_root, pattern=pattern, found=feed.discovered,
+              seconds=round(time.perf_counter() - t0, 3))
+        if feed.seconds is not None:
+            report.set_scan(feed.seconds, feed.discovered)
+        if feed.error is not None:
+            emit("error", message=f"Scan failed: {feed.error}")
+            counts["failed"] += 1
+    report.finish()
+    path = report.write()
+    if path is None:
+        emit("error", message=f"Could not write build report under {out_root}")
+    emit("report", path=path, **report.to_dict())
+    # The JSON lines stay on stdout; the human-readable table goes to stderr.
+    sys.stderr.write("\n".join(report.table()) + "\n")
+    n = _total()
+    emit("done", total=n, done=counts["done"], skipped=counts["skipped"], failed=counts["failed"],
+          cancelled=engine.cancelled, seconds=round(time.perf_counter() - t0, 3), stats=totals)
+    return 1 if counts["failed"] or engine.cancelled else 0
+
+
+def _job_event(job: BuildJob) -> dict:
+    return {"id": job.id, "state": job.state, "source": job.source, "pattern": job.pattern,
+            "output": job.out_root, "counts": job.counts, "message": job.message}
+
+
+def _cmd_queue_add(args: argparse.Namespace) -> int:
+    try:
+        pattern = _scan_filter(args)
+    except ValueError as e:
+        _emit("error", message=str(e))
+        return 2
+    err = _register_templates(args.template)
+    if err:
+        _emit("error", message=err)
+        return 2
+    out_root = args.output.strip()
+    q = JobQueue.load()
+    job = q.add(make_job(args.source.strip(), pattern, args.recurse, _options(args, out_root), registered_templates()))
+    _emit("queued", position=len(q.queued()), **_job_event(job))
+    return 0
+
+
+def _cmd_queue_list(args: argparse.Namespace) -> int:
+    for job in JobQueue.load().jobs:
+        _emit("job", **_job_event(job))
+    return 0
+
+
+def _cmd_queue_remove(args: argparse.Namespace) -> int:
+    if not JobQueue.load().remove(args.job):
+        _emit("error", message=f"No such job, or it is running: {args.job}")
+        return 2
+    _emit("removed", id=args.job)
+    return 0
+
+
+def _cmd_queue_retry(args: argparse.Namespace) -> int:
+    q = JobQueue.load()
+    if not q.requeue(args.job):
+        _emit("error", message=f"No such job, or it is running: {args.job}")
+        return 2
+    _emit("queued", **_job_event(q.get(args.job)))
+    return 0
+
+
+def _cmd_queue_clear(args: argparse.Namespace) -> int:
+    _emit("cleared", jobs=JobQueue.load().clear(args.state or (DONE, FAILED)))
+    return 0
+
+
+def _cmd_queue_run(args: argparse.Namespace) -> int:
+    q = JobQueue.load()
+    concurrency = max(1, args.concurrency)
+    mode = args.pool
+    slots = threading.BoundedSemaphore(args.io_cap) if args.io_cap > 0 else None
+    group = EngineGroup()
+    emit_lock = threading.Lock()
+    failed = []
+
+    def _run_job(job: BuildJob) -> None:
+        ended = {}
+
+        def _job_emit(event: str, **fields) -> None:
+            if event == "done":
+                ended.update(fields)
+            with emit_lock:
+                _emit(event, job=job.id, **fields)
+
+        engine = BuildEngine(workers=args.workers, mode=mode, slots=slots, templates=job.templates)
+        group.add(engine)
+        try:
+            journal, resumed = job.journal()
+            opts = dataclasses.replace(job.options(), resumed=resumed)
+            if resumed:
+                _job_emit("resume-job", journal=journal.path)
+            _run_build(args, job.source, job.pattern, job.recurse, opts, journal if resumed else BuildJournal(job.out_root),
+                       resumed=resumed, engine=engine, emit=_job_emit)
+            q.finish(job, ended, cancelled=engine.cancelled)
+        except Exception as e:
+            q.finish(job, ended, error=str(e))
+        finally:
+            group.discard(engine)
+        if job.state == FAILED:
+            failed.append(job.id)
+        with emit_lock:
+            _emit("job", **_job_event(job))
+
+    def _on_sigint(_signum, _frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        group.cancel()
+        _emit("cancel", message="Cancelling the queue: running jobs stop and stay queued (Ctrl+C again to abort)")
+
+    _emit("queue", queued=len(q.queued()), concurrency=concurrency, pool=mode, io_cap=args.io_cap)
+    prev_sigint = signal.signal(signal.SIGINT, _on_sigint)
+    running = {}
+    try:
+        with cf.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="SmartAssetsJob") as ex:
+            while True:
+                while len(running) < concurrency and not group.cancelled:
+                    job = q.take()
+                    if job is None:
+                        break
+                    with emit_lock:
+                        _emit("job", **_job_event(job))
+                    running[ex.submit(_run_job, job)] = job
+                if not running:
+                    break
+                finished, _ = cf.wait(running, timeout=0.25, return_when=cf.FIRST_COMPLETED)
+                for fut in finished:
+                    running.pop(fut)
+    finally:
+        signal.signal(signal.SIGINT, prev_sigint)
+    q.refresh()
+    states = [j.state for j in q.jobs]
+    _emit("queue-done", done=states.count(DONE), failed=states.count(FAILED), queued=len(q.queued()),
+          cancelled=group.cancelled)
+    return 1 if group.cancelled or failed else 0
+
+
+def _cmd_bench_authoring(args: argparse.Namespace) -> int:
+    from .benchmarks import bench_authoring
+    _emit("bench", name="authoring", **bench_authoring(args.count, args.repeat, args.dir))
+    return 0
+
+
+def _cmd_bench_load(args: argparse.Namespace) -> int:
+    from .benchmarks import bench_load
+    encodings = [e.strip().lower() for e in args.encodings.split(",") if e.strip()]
+    bad = [e for e in encodings if e not in (ENCODING_USDA, ENCODING_USDC, "usdz")]
+    if bad:
+        _emit("error", message=f"Unknown encoding(s): {', '.join(bad)}")
+        return 2
+    _emit("bench", name="load", **bench_load(args.count, encodings, args.points, args.dir))
+    return 0
+
+
+def _cmd_bench_arcs(args: argparse.Namespace) -> int:
+    from .benchmarks import bench_arcs
+    _emit("bench", name="arcs", **bench_arcs(args.count, args.points, args.region, args.dir))
+    return 0
+
+
+def _cmd_bench_io(args: argparse.Namespace) -> int:
+    from .benchmarks import bench_io
+    try:
+        levels = [int(n) for n in args.in_flight.split(",") if n.strip()]
+    except ValueError:
+        levels = []
+    if not levels or min(levels) < 1:
+        _emit("error", message=f"Bad --in-flight list: {args.in_flight}")
+        return 2
+    _emit("bench", name="io", **bench_io(args.files, args.size_kb, args.latency_ms, args.jitter_ms,
+                                         args.bandwidth, levels, args.dir))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,254 @@
+# SmartAssetsBuilder — dedup.py
+# Content-addressed Materials copy: byte-identical files are stored once per output root.
+#
+# Local output  : blobs live in <out_root>/.cas/<aa>/<sha1><ext>; each asset's
+#                 Materials/ entry is a hardlink (or reflink, or copy) of its blob,
+#                 so the folder layout and every relative path stay unchanged.
+# Nucleus output: Nucleus has no links, so textures go to
+#                 <out_root>/_SharedMaterials/<aa>/<sha1><ext> and the asset paths in
+#                 the copied max layer (and USD layers under Materials/) are rewritten
+#                 to point there. Trees containing .mdl files keep their textures in
+#                 place, because MDL texture references cannot be rewritten here.
+
+import os
+import shutil
+import hashlib
+import posixpath
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pxr import Sdf, UsdUtils
+
+from .pipeline import (
+    omni, _is_ov_url, _join, _dirname, _exists, _kind, _norm_local, _norm_ov, _relref, _dotify_rel,
+    _hash_local, _read_bytes, _stream_copy, _client_copy, _copy_file_any_scheme, _iter_tree_files,
+    _ensure_dir_local, _ensure_dir_ov, _mark_written, _mark_deleted, _stat_any, _is_same_path,
+    _is_inside, _io, KIND_DIR, SYNC_OFF, SYNC_CHECKSUM,
+)
+
+CAS_DIR = ".cas"
+SHARED_DIR = "_SharedMaterials"
+
+# Files worth deduplicating: large, opaque, referenced by path.
+_BLOB_EXTS = {".png", ".jpg", ".jpeg", ".tga", ".exr", ".hdr", ".tif", ".tiff", ".bmp",
+              ".dds", ".ktx", ".ktx2", ".psd", ".webp"}
+_LAYER_EXTS = {".usd", ".usda", ".usdc"}
+
+_FICLONE = 0x40049409  # Linux ioctl: share extents between two files (btrfs/xfs/...)
+
+_INMEM_LIMIT = 256 << 20  # largest Nucleus file read whole to hash it; bigger ones are not deduplicated
+# Workers storing the same blob take turns, so the later ones count a hit instead of copying again.
+_BLOB_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _digest(path: str) -> Optional[str]:
+    if _is_ov_url(path):
+        st = _stat_any(path)
+        if st is None or st[0] > _INMEM_LIMIT:
+            return None
+        data = _read_bytes(path)
+        return hashlib.sha1(data).hexdigest() if data is not None else None
+    try:
+        return _hash_local(path)[1]
+    except (OSError, ValueError):
+        return None
+
+
+def _blob_path(out_root: str, digest: str, ext: str) -> str:
+    if _is_ov_url(out_root):
+        return _join(out_root, SHARED_DIR, digest[:2], digest + ext)
+    return os.path.join(out_root, CAS_DIR, digest[:2], digest + ext)
+
+
+def _reflink(src: str, dst: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+
+
+def _link_local(blob: str, dst: str) -> str:
+    """Materialize `blob` at `dst`; returns 'hardlink', 'reflink' or 'copy'."""
+    _ensure_dir_local(os.path.dirname(dst))
+    if os.path.lexists(dst):
+        os.remove(dst)
+        _mark_deleted(dst)
+    try:
+        os.link(blob, dst)  # EXDEV/EPERM/EMLINK/... -> fall through
+        how = "hardlink"
+        _io("link")
+    except OSError:
+        if _reflink(blob, dst):
+            how = "reflink"
+            _io("link")
+        else:
+            shutil.copy2(blob, dst)
+            how = "copy"
+            _io("copy", os.path.getsize(dst))
+    _mark_written(dst)
+    return how
+
+
+def _link_current(blob: str, dst: str, digest: str, sync: str) -> bool:
+    """True when an existing local `dst` already holds the blob's content (sync modes only)."""
+    if not sync:
+        return False
+    try:
+        if os.path.samefile(blob, dst):
+            return True
+        return sync == SYNC_CHECKSUM and _hash_local(dst)[1] == digest
+    except (OSError, ValueError):
+        return False
+
+
+def _store_blob(src: str, blob: str, stats: Dict[str, int]) -> bool:
+    """Ensure the blob exists; count a hit (bytes saved) when it already did."""
+    size = (_stat_any(src) or (0, 0.0))[0]
+    with _BLOB_LOCKS[hash(blob) % len(_BLOB_LOCKS)]:
+        if _exists(blob):
+            stats["dedup_hits"] = stats.get("dedup_hits", 0) + 1
+            stats["dedup_bytes_saved"] = stats.get("dedup_bytes_saved", 0) + size
+            return True
+        if _is_ov_url(src) and _is_ov_url(blob):
+            _ensure_dir_ov(_dirname(blob))
+            ok = _client_copy(src, blob)
+            if ok:
+                _mark_written(blob)
+                _io("", size)
+        else:
+            ok, size = _stream_copy(src, blob)
+    if ok:
+        stats["bytes_copied"] = stats.get("bytes_copied", 0) + size
+    return ok
+
+
+def _anchor_key(anchor_dir: str, asset_path: str) -> Optional[str]:
+    """Normalized absolute key of an authored asset path, resolved against `anchor_dir`."""
+    if not asset_path or "<UDIM>" in asset_path:
+        return None
+    if _is_ov_url(asset_path):
+        s, n, p = _norm_ov(asset_path)
+        return f"{s}://{n}{p}"
+    if _is_ov_url(anchor_dir):
+        if asset_path.startswith("/"):
+            s, n, _p = _norm_ov(anchor_dir)
+            return f"{s}://{n}{posixpath.normpath(asset_path)}"
+        s, n, p = _norm_ov(anchor_dir)
+        return f"{s}://{n}{posixpath.normpath(posixpath.join(p, asset_path))}"
+    if os.path.isabs(asset_path):
+        return _norm_local(asset_path)
+    return _norm_local(os.path.join(anchor_dir, asset_path))
+
+
+def _source_key(path: str) -> str:
+    if _is_ov_url(path):
+        s, n, p = _norm_ov(path)
+        return f"{s}://{n}{p}"
+    return _norm_local(path)
+
+
+def rewrite_asset_paths(layer_path: str, anchor_dir: str, redirects: Dict[str, str]) -> int:
+    """Point asset paths of `layer_path` (authored relative to `anchor_dir`) at their blobs."""
+    if not redirects:
+        return 0
+    layer = Sdf.Layer.FindOrOpen(layer_path)
+    if layer is None:
+        return 0
+    changed = [0]
+
+    def _remap(asset_path: str) -> str:
+        key = _anchor_key(anchor_dir, asset_path)
+        blob = redirects.get(key) if key else None
+        if blob is None:
+            return asset_path
+        changed[0] += 1
+        if _is_ov_url(blob):
+            # A local layer can only reach a Nucleus blob by its URL (_relref would relpath it as a file).
+            return _dotify_rel(_relref(layer_path, blob)) if _is_ov_url(layer_path) else blob
+        # _relref forces '.usd' on local targets, so textures take plain relpath.
+        rel = os.path.relpath(blob, os.path.dirname(os.path.abspath(layer_path)))
+        return _dotify_rel(rel.replace("\\", "/"))
+
+    UsdUtils.ModifyAssetPaths(layer, _remap)
+    if changed[0]:
+        layer.Save()
+        _mark_written(layer_path)
+    return changed[0]
+
+
+def copy_materials_dedup(src_core_dir: str, out_core_dir: str, out_root: str, max_dst: str,
+                         overwrite: bool, log_fn: Callable[[str], None], stats: Dict[str, int],
+                         sync: str = SYNC_OFF, pairs: Optional[List[Tuple[str, str]]] = None) -> bool:
+    """Content-addressed variant of `_copy_materials_any_scheme` (same return contract).
+
+    `pairs` ((source, destination), see deps.py) replaces the Materials tree
+    when only the max layer's dependencies are copied.
+    """
+    if _is_same_path(out_core_dir, src_core_dir) or _is_inside(out_core_dir, src_core_dir) or _is_inside(src_core_dir, out_core_dir):
+        log_fn("[WARN] Loop risk; skip Materials copy.")
+        return False
+    if pairs is None:
+        src_mat = _join(src_core_dir, "Materials")
+        dst_mat = _join(out_core_dir, "Materials")
+        if _is_ov_url(src_mat) and omni is None:
+            return False
+        if _kind(src_mat) != KIND_DIR:
+            return False
+        pairs = [(src, _join(dst_mat, *rel.split("/"))) for rel, src in _iter_tree_files(src_mat)]
+
+    to_nucleus = _is_ov_url(out_root)
+    has_mdl = any(src.lower().endswith(".mdl") for src, _dst in pairs)
+    if to_nucleus and has_mdl:
+        log_fn("[INFO] Materials contain .mdl files; textures kept in place (MDL paths are not rewritten).")
+
+    redirects: Dict[str, str] = {}
+    layers_out = []
+    for src, dst in pairs:
+        ext = os.path.splitext(src)[1].lower()
+        stats["materials_files"] = stats.get("materials_files", 0) + 1
+
+        dedup_this = ext in _BLOB_EXTS and not (to_nucleus and has_mdl)
+        digest = _digest(src) if dedup_this else None
+        if digest is None:
+            if _exists(dst) and not overwrite:
+                continue
+            skipped_before = stats.get("sync_skipped", 0)
+            if not _copy_file_any_scheme(src, dst, True, log_fn, sync, stats):
+                log_fn(f"[ERROR] Copy failed: {src} → {dst}")
+                continue
+            if stats.get("sync_skipped", 0) == skipped_before:
+                stats["bytes_copied"] = stats.get("bytes_copied", 0) + (_stat_any(src) or (0, 0.0))[0]
+            if ext in _LAYER_EXTS:
+                layers_out.append((dst, _dirname(src)))
+            continue
+
+        blob = _blob_path(out_root, digest, ext)
+        if not _store_blob(src, blob, stats):
+            log_fn(f"[ERROR] Blob store failed: {src} → {blob}")
+            continue
+        if to_nucleus:
+            redirects[_source_key(src)] = blob
+        elif not _exists(dst) or (overwrite and not _link_current(blob, dst, digest, sync)):
+            try:
+                _link_local(blob, dst)
+            except OSError as e:
+                log_fn(f"[ERROR] Link failed: {blob} → {dst} ({e})")
+
+    if redirects:
+        n = 0
+        if max_dst:
+            n += rewrite_asset_paths(max_dst, src_core_dir, redirects)
+        for layer_out, src_dir in layers_out:
+            n += rewrite_asset_paths(layer_out, src_dir, redirects)
+        log_fn(f"[INFO] Rewrote {n} texture paths to {SHARED_DIR}/")
+    return True
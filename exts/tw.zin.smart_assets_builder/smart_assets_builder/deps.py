@@ -0,0 +1,134 @@
+# SmartAssetsBuilder — deps.py
+# Dependency-driven copy: instead of the whole `Materials/` folder, copy exactly
+# what a max layer needs — sublayers, references, payloads and asset paths
+# (textures, MDL, ...), recursively — as found by UsdUtils.ComputeAllDependencies.
+#
+# Every dependency keeps its path relative to the source <CORE> folder, so the
+# relative asset paths in the copied max layer resolve the same way in the output.
+# A dependency in another folder (e.g. '../Shared/wood.png') lands at the same
+# relative place under the output root. One that would leave the output root,
+# or lives on another drive / Nucleus server, is referenced in place.
+# Asset paths that do not resolve are reported as missing.
+
+import os
+import hashlib
+import posixpath
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pxr import Sdf, UsdUtils
+
+from .pipeline import (
+    _is_ov_url, _dirname, _split_ov, _norm_ov, _norm_local, _is_inside, _stat_any, _copy_verdict,
+    _count_sync_skip, _copy_file_any_scheme, _run_ov_copies, _ensure_dir_local, _ensure_dir_ov, _io,
+    COPY, SYNCED, SYNC_OFF,
+)
+
+
+@dataclass
+class DepClosure:
+    """Everything one max layer depends on, relative to its <CORE> folder."""
+    src: str
+    files: List[Tuple[str, str]] = field(default_factory=list)   # (posix relpath, source path/URL)
+    elsewhere: List[str] = field(default_factory=list)           # other drive / server: used in place
+    missing: List[str] = field(default_factory=list)             # asset paths that did not resolve
+
+    def fingerprint(self) -> str:
+        """Hash of the (relpath, size, mtime) of every dependency plus the missing paths."""
+        rows = []
+        for rel, path in self.files:
+            st = _stat_any(path)
+            rows.append(f"{rel}\t{st[0]}\t{st[1]}" if st else f"{rel}\t-")
+        rows.sort()
+        rows.extend(f"missing\t{m}" for m in sorted(self.missing))
+        return "deps:" + hashlib.sha1("\n".join(rows).encode("utf-8")).hexdigest()
+
+
+def _key(path: str) -> str:
+    if _is_ov_url(path):
+        s, n, p = _norm_ov(path)
+        return f"{s}://{n}{p}"
+    return _norm_local(path)
+
+
+def _rel_to(core_dir: str, path: str) -> Optional[str]:
+    """Posix path of `path` relative to `core_dir`; None across schemes, servers or drives."""
+    if _is_ov_url(core_dir) != _is_ov_url(path):
+        return None
+    if _is_ov_url(path):
+        sc, nc, pc = _norm_ov(core_dir)
+        sp, np_, pp = _norm_ov(path)
+        if (sc, nc) != (sp, np_):
+            return None
+        return posixpath.relpath(pp, pc)
+    try:
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(core_dir)).replace("\\", "/")
+    except ValueError:  # another Windows drive
+        return None
+
+
+def compute_dependencies(max_src: str) -> DepClosure:
+    """Resolve the full dependency closure of `max_src` (the layer itself excluded)."""
+    layers, assets, unresolved = UsdUtils.ComputeAllDependencies(Sdf.AssetPath(max_src))
+    core_dir = _dirname(max_src)
+    root = _key(max_src)
+    closure = DepClosure(max_src, missing=sorted(set(unresolved)))
+    seen = {root}
+    for path in [layer.realPath or layer.identifier for layer in layers] + list(assets):
+        _io("read")
+        if not path or _key(path) in seen:
+            continue
+        seen.add(_key(path))
+        rel = _rel_to(core_dir, path)
+        if rel is None:
+            closure.elsewhere.append(path)
+        else:
+            closure.files.append((rel, path))
+    closure.files.sort()
+    return closure
+
+
+def dep_target(out_core_dir: str, rel: str) -> str:
+    """Output location of a dependency `rel` (relative to the <CORE> folder), normalized."""
+    if _is_ov_url(out_core_dir):
+        s, n, p = _split_ov(out_core_dir)
+        return f"{s}://{n}{posixpath.normpath(posixpath.join(p, rel))}"
+    return os.path.normpath(os.path.join(out_core_dir, *rel.split("/")))
+
+
+def dep_pairs(closure: DepClosure, out_core_dir: str, out_root: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """(source, destination) of every dependency that stays under `out_root`, and the ones that do not."""
+    pairs, outside = [], []
+    for rel, src in closure.files:
+        dst = dep_target(out_core_dir, rel)
+        if _is_inside(dst, out_root):
+            pairs.append((src, dst))
+        else:
+            outside.append(src)
+    return pairs, outside
+
+
+def copy_dependencies(pairs: List[Tuple[str, str]], overwrite: bool, log_fn: Callable[[str], None],
+                      sync: str = SYNC_OFF, stats: Optional[Dict[str, int]] = None) -> bool:
+    """Copy each (source, destination) across local/Nucleus; False if any copy failed."""
+    todo: List[Tuple[str, str]] = []
+    sizes: Dict[str, int] = {}
+    ok = True
+    for src, dst in pairs:
+        (_ensure_dir_ov if _is_ov_url(dst) else _ensure_dir_local)(_dirname(dst))
+        verdict, size = _copy_verdict(src, dst, overwrite, sync)
+        if verdict == SYNCED:
+            _count_sync_skip(stats, size)
+        if verdict != COPY:
+            continue
+        if stats is not None:
+            stats["deps_copied"] = stats.get("deps_copied", 0) + 1
+        if _is_ov_url(src) and _is_ov_url(dst):
+            todo.append((src, dst))
+            sizes[src] = size if size is not None else (_stat_any(src) or (0, 0.0))[0]
+        elif not _copy_file_any_scheme(src, dst, True, log_fn):
+            log_fn(f"[ERROR] Copy failed: {src} → {dst}")
+            ok = False
+    if todo:
+        ok = all(_run_ov_copies(todo, sizes, log_fn)) and ok
+    return ok
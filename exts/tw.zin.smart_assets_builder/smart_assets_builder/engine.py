@@ -0,0 +1,299 @@
+# SmartAssetsBuilder — engine.py
+# Bounded worker pool that runs `pipeline.build_item` for many sources at once.
+
+import time
+import queue
+import signal
+import asyncio
+import threading
+import multiprocessing
+import concurrent.futures as cf
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from .pipeline import (BuildOptions, ItemResult, build_item, run_context, set_io_cache, set_run_control,
+                       set_stage_log, omni)
+from .nucleus_io import AsyncIO, IOLoop, OmniClientBackend
+from .iocache import IOCache
+from .templates import TemplateSet, registered_templates, use_templates
+from .manifest import BuildManifest
+from .journal import BuildJournal, StageLog
+
+
+MODE_THREADS = "threads"      # I/O-bound work (Nucleus copies, stats)
+MODE_PROCESSES = "processes"  # CPU-bound work (USD authoring), sidesteps the GIL
+
+
+def _default_workers() -> int:
+    return max(1, min(8, (multiprocessing.cpu_count() or 1)))
+
+
+def _init_process_worker(known_dirs, templates, cancel_event, run_gate, journal_path):
+    """Process-pool initializer: each worker process gets its own run cache, templates and journal handle."""
+    # Ctrl+C reaches the whole process group: only the parent decides, workers follow the cancel event.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    set_io_cache(IOCache(known_dirs))
+    use_templates(TemplateSet(templates))
+    set_run_control(cancel_event, run_gate)
+    set_stage_log(StageLog(journal_path) if journal_path else None)
+
+
+class BuildEngine:
+    """Runs one build item per worker with a bounded number of items in flight.
+
+    With a `manifest`, each item receives its previous entry so unchanged
+    sources can be skipped (incremental builds). With a `journal` being written,
+    workers journal every stage they complete (`journal.StageLog`); with one
+    loaded from an interrupted run, each item skips the stages it already finished.
+    `items` may be a plain list or a live feed (`scanner.ScanFeed`) that keeps
+    producing sources while earlier ones build; `None` items are heartbeats
+    that only give the engine a chance to deliver finished results.
+    Results are delivered to `on_result` on the caller's thread (the Kit UI loop
+    for `run_async`, in per-frame time slices; the calling thread for `run`),
+    in completion order.
+    Per-item failures are already isolated by `build_item`; a crashed worker is
+    turned into a failed `ItemResult` so the batch keeps going.
+    `pause()` / `resume()` / `cancel()` may be called from any thread: workers
+    honour them at the next stage boundary of their item, a cancelled item
+    rolls back a half-authored trio and comes back as 'cancelled', and queued
+    items that never started are dropped (left pending in the journal).
+    `slots`, a semaphore shared by engines running side by side (job queue),
+    caps the items in flight across all of them. `templates` overrides the
+    registered layer templates for this run only.
+    The run state the workers see (I/O cache, run control, async I/O loop, layer
+    templates) belongs to this engine: thread workers run each item in a copy of
+    the engine's context (`pipeline.run_context`), process workers get their own
+    in the pool initializer. Engines of either mode may run side by side.
+    """
+
+    def __init__(self, workers: int = 0, mode: str = MODE_THREADS, max_in_flight: int = 0,
+                 io_cache: Optional[IOCache] = None, io_requests: int = 32,
+                 slots: Optional[threading.Semaphore] = None, templates: Optional[Dict[str, str]] = None):
+        self.workers = workers if workers and workers > 0 else _default_workers()
+        self.mode = mode if mode in (MODE_THREADS, MODE_PROCESSES) else MODE_THREADS
+        # Keep the queue short so memory stays flat on 10k-item runs.
+        self.max_in_flight = max_in_flight if max_in_flight > 0 else self.workers * 2
+        self._executor: Optional[cf.Executor] = None
+        # Run-scoped stat/dir cache shared by the thread workers (seeded by the dir planner).
+        self.io_cache = io_cache if io_cache is not None else IOCache()
+        # Nucleus requests the thread workers may keep in flight together (0 = blocking calls only).
+        self.io_requests = io_requests
+        self._io_loop: Optional[IOLoop] = None
+        # Thread mode: the context every item of this run is built in.
+        self._context = None
+        self._stage_log: Optional[StageLog] = None
+        # Run control: cancel = stop at the next stage boundary, gate = cleared while paused.
+        self._cancel = threading.Event()
+        self._gate = threading.Event()
+        self._gate.set()
+        self.slots = slots
+        self.templates = templates
+
+    # ---------- Run control (any thread) ----------
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._gate.is_set() and not self._cancel.is_set()
+
+    def pause(self) -> None:
+        self._gate.clear()
+
+    def resume(self) -> None:
+        self._gate.set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self._gate.set()  # paused workers wake up and see the cancel
+
+    # ---------- Pool lifecycle ----------
+    def _make_executor(self, journal: Optional[BuildJournal] = None) -> cf.Executor:
+        journal_path = journal.path if journal is not None and journal.writing else None
+        if self.mode == MODE_PROCESSES:
+            ctx = multiprocessing.get_context("spawn")
+            # Worker processes need events they can share; carry over a pause/cancel made before the run.
+            cancel, gate = ctx.Event(), ctx.Event()
+            if self._cancel.is_set():
+                cancel.set()
+            if self._gate.is_set():
+                gate.set()
+            self._cancel, self._gate = cancel, gate
+            return cf.ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                          initializer=_init_process_worker,
+                                          initargs=(self.io_cache.known_dirs(),
+                                                    self.run_templates(), cancel, gate, journal_path))
+        if omni is not None and self.io_requests > 0:
+            self._io_loop = IOLoop(AsyncIO(OmniClientBackend(), self.io_requests)).start()
+        self._stage_log = StageLog(journal_path) if journal_path else None
+        # Layer skeletons are prepared once per run, from this run's own template set.
+        self._context = run_context(self.io_cache, self._cancel, self._gate, self._io_loop,
+                                    TemplateSet(self.run_templates()), self._stage_log)
+        return cf.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="SmartAssetsBuilder")
+
+    def _release_cache(self):
+        self._context = None
+        if self._stage_log is not None:
+            self._stage_log.close()
+            self._stage_log = None
+        if self._io_loop is not None:
+            self._io_loop.stop()  # a cancelled run's pending copies fail their items
+            self._io_loop = None
+
+    def run_templates(self) -> Dict[str, str]:
+        """Layer templates this run authors with (journaled so a resume uses the same)."""
+        return dict(self.templates) if self.templates is not None else registered_templates()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._release_cache()
+
+    def _submit(self, src: str, opts: BuildOptions, manifest: Optional[BuildManifest],
+                journal: Optional[BuildJournal] = None) -> cf.Future:
+        prev = manifest.get(src) if (manifest is not None and opts.incremental) else None
+        done_stages = journal.stages_of(src) if journal is not None else ()
+        if self._context is not None:
+            return self._executor.submit(self._context.copy().run, build_item, src, opts, prev, done_stages)
+        return self._executor.submit(build_item, src, opts, prev, done_stages)
+
+    def _hold(self, pending: dict, on_result: Callable[[ItemResult], None]) -> bool:
+        """While paused, keep delivering finished results; False once the run is cancelled."""
+        while not self._gate.is_set() and not self._cancel.is_set():
+            if not pending:
+                self._gate.wait(0.1)
+                continue
+            finished, _ = cf.wait(pending, timeout=0.1, return_when=cf.FIRST_COMPLETED)
+            for fut in finished:
+                self._deliver(fut, pending, on_result)
+        return not self._cancel.is_set()
+
+    def _take_slot(self, pending: dict, on_result: Callable[[ItemResult], None]) -> bool:
+        """Wait for a free shared slot, delivering results meanwhile; False once the run is cancelled."""
+        if self.slots is None:
+            return True
+        while not self.slots.acquire(timeout=0.1):
+            if self._cancel.is_set():
+                return False
+            for fut in [f for f in pending if f.done()]:
+                self._deliver(fut, pending, on_result)
+        return True
+
+    def _deliver(self, fut: cf.Future, pending: dict, on_result: Optional[Callable[[ItemResult], None]]) -> None:
+        src = pending.pop(fut)
+        if on_result is not None:
+            on_result(self._result_of(fut, src))
+
+    @staticmethod
+    def _result_of(fut: cf.Future, src: str) -> ItemResult:
+        try:
+            return fut.result()
+        except Exception as e:  # worker died / pickling error
+            return ItemResult(src, "failed", [("ERROR", f"Worker failed: {src} -> {e}")])
+
+    # ---------- Blocking (CLI / headless) ----------
+    def run(self, items: Iterable[str], opts: BuildOptions,
+            on_result: Callable[[ItemResult], None],
+            manifest: Optional[BuildManifest] = None,
+            journal: Optional[BuildJournal] = None) -> None:
+        self._executor = self._make_executor(journal)
+        pending = {}
+        try:
+            for src in items:
+                if not self._hold(pending, on_result):
+                    break
+                if len(pending) >= self.max_in_flight:
+                    finished, _ = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+                    for fut in finished:
+                        self._deliver(fut, pending, on_result)
+                for fut in [f for f in pending if f.done()]:
+                    self._deliver(fut, pending, on_result)
+                if src is None:
+                    continue
+                if not self._take_slot(pending, on_result):
+                    break
+                try:
+                    fut = self._submit(src, opts, manifest, journal)
+                except BaseException:
+                    if self.slots is not None:
+                        self.slots.release()
+                    raise
+                if self.slots is not None:
+                    # Free the shared slot as soon as the item ends (or is dropped), not when
+                    # this engine gets round to delivering it: other jobs may be waiting for it.
+                    fut.add_done_callback(lambda _f: self.slots.release())
+                pending[fut] = src
+            while pending:
+                if self._cancel.is_set():
+                    # Queued items that have not started are dropped; running ones stop at their next stage.
+                    for fut in [f for f in pending if f.cancel()]:
+                        self._deliver(fut, pending, None)
+                    if not pending:
+                        break
+                finished, _ = cf.wait(pending, timeout=0.25, return_when=cf.FIRST_COMPLETED)
+                for fut in finished:
+                    self._deliver(fut, pending, on_result)
+        finally:
+            self.shutdown()  # queued futures are cancelled, which frees their slots
+
+    # ---------- Async (Kit UI loop) ----------
+    async def run_async(self, items: Iterable[str], opts: BuildOptions,
+                        on_result: Callable[[ItemResult], None],
+                        manifest: Optional[BuildManifest] = None,
+                        journal: Optional[BuildJournal] = None,
+                        on_progress: Optional[Callable[[], None]] = None,
+                        frame_budget_ms: float = 8.0, progress_ms: float = 100.0,
+                        next_frame: Optional[Callable[[], Awaitable]] = None) -> None:
+        """`run` on a dispatcher thread, with results handed to the UI loop in time slices.
+
+        Submitting work never waits for a rendered frame, so a heavy viewport
+        does not cap throughput. Each frame, finished results are passed to
+        `on_result` until `frame_budget_ms` is spent (the rest wait for the next
+        frame), and `on_progress` runs at most every `progress_ms` plus once at
+        the end. `next_frame` awaits the next UI update (Kit:
+        `omni.kit.app.get_app().next_update_async`; default: ~60 Hz sleep).
+        Cancelling the awaiting task cancels the run as well.
+        """
+        results: "queue.SimpleQueue[ItemResult]" = queue.SimpleQueue()
+        finished = threading.Event()
+        errors = []
+
+        def _dispatch():
+            try:
+                self.run(items, opts, results.put, manifest=manifest, journal=journal)
+            except BaseException as e:  # re-raised on the UI loop below
+                errors.append(e)
+            finally:
+                finished.set()
+
+        next_frame = next_frame or (lambda: asyncio.sleep(1.0 / 60.0))
+        budget, interval = frame_budget_ms / 1000.0, progress_ms / 1000.0
+        threading.Thread(target=_dispatch, name="SmartAssetsDispatch", daemon=True).start()
+        last_progress = time.perf_counter()
+        while True:
+            ended = finished.is_set()  # read first: every result of a finished run is already queued
+            t0 = time.perf_counter()
+            while True:
+                try:
+                    res = results.get_nowait()
+                except queue.Empty:
+                    break
+                on_result(res)
+                if time.perf_counter() - t0 >= budget:
+                    break
+            now = time.perf_counter()
+            if on_progress is not None and now - last_progress >= interval:
+                on_progress()
+                last_progress = now
+            if ended and results.empty():
+                break
+            try:
+                await next_frame()
+            except asyncio.CancelledError:
+                self.cancel()  # the task was cancelled: stop the workers too
+                raise
+        if on_progress is not None:
+            on_progress()
+        if errors:
+            raise errors[0]
@@ -1,19 +1,17 @@
 # SmartAssetsBuilder — extension.py (USD Composer / Create 2023.2.5)
 # Version: v1.10.5 (UI Cleaned: Removed Headers, Light Gray Lines, Compact, Async)
 
-import os
-import fnmatch
+import time
 import traceback
-import posixpath
-import shutil
 import asyncio
-from typing import List, Tuple
+import threading
+import dataclasses
+from typing import List, Optional
 
 import omni.ext
 import omni.ui as ui
 import omni.kit.ui 
 import omni.kit.app
-from pxr import Usd, UsdGeom, Sdf, Gf, Kind
 
 # Optional Nucleus support
 try:
@@ -21,480 +19,18 @@ try:
 except Exception:
     omni = None
 
-
-# ============================== Path / IO Utilities ============================
-
-def _is_ov_url(url: str) -> bool:
-    return url.startswith("omniverse://") or url.startswith("omni://")
-
-
-def _dirname(p: str) -> str:
-    if _is_ov_url(p):
-        return p.rsplit("/", 1)[0] if "/" in p else p
-    return os.path.dirname(p)
-
-
-def _join(base: str, *more: str) -> str:
-    if _is_ov_url(base):
-        return "/".join([base.rstrip("/")] + [m.strip("/") for m in more])
-    return os.path.join(base, *more)
-
-
-def _abs(path_or_url: str) -> str:
-    return path_or_url if _is_ov_url(path_or_url) else os.path.abspath(path_or_url)
-
-
-def _ensure_usd_ext(p: str) -> str:
-    if "." not in p:
-        return p + ".usd"
-    root, ext = p.rsplit(".", 1)
-    return p if ext.lower() == "usd" else root + ".usd"
-
-
-def _ensure_dir_local(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
-
-def _ensure_dir_ov(url: str) -> None:
-    if omni is None:
-        return
-    u = url.rstrip("/")
-    if "://" in u:
-        scheme, rest = u.split("://", 1)
-        netloc, *segs = rest.split("/")
-        cur = f"{scheme}://{netloc}"
-        for s in segs:
-            if not s:
-                continue
-            cur = f"{cur}/{s}"
-            rc, _ = omni.client.stat(cur)
-            if rc != omni.client.Result.OK:
-                omni.client.create_folder(cur)
-    else:
-        rc, _ = omni.client.stat(u)
-        if rc != omni.client.Result.OK:
-            omni.client.create_folder(u)
-
-
-def _exists(p: str) -> bool:
-    if _is_ov_url(p):
-        if omni is None:
-            return False
-        rc, info = omni.client.stat(p)
-        return rc == omni.client.Result.OK and not (info.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
-    return os.path.isfile(p)
-
-
-def _split_ov(url: str):
-    scheme, rest = url.split("://", 1)
-    netloc, *path_parts = rest.split("/")
-    return scheme, netloc, "/" + "/".join(path_parts)
-
-
-def _norm_local(p: str) -> str:
-    return os.path.normcase(os.path.abspath(p))
-
-
-def _norm_ov(p: str) -> Tuple[str, str, str]:
-    s, n, path = _split_ov(p)
-    return s, n, posixpath.normpath(path)
-
-
-def _is_same_path(a: str, b: str) -> bool:
-    if _is_ov_url(a) and _is_ov_url(b):
-        return _norm_ov(a) == _norm_ov(b)
-    if (not _is_ov_url(a)) and (not _is_ov_url(b)):
-        return _norm_local(a) == _norm_local(b)
-    return False
-
-
-def _is_inside(child: str, parent: str) -> bool:
-    """True if `child` is strictly inside `parent` (not equal)."""
-    if _is_ov_url(child) and _is_ov_url(parent):
-        sc, nc, pc = _norm_ov(child)
-        sp, np, pp = _norm_ov(parent)
-        if sc != sp or nc != np:
-            return False
-        if pc == pp:
-            return False
-        return pc.startswith(pp + "/")
-    if (not _is_ov_url(child)) and (not _is_ov_url(parent)):
-        c = _norm_local(child)
-        p = _norm_local(parent)
-        if c == p:
-            return False
-        try:
-            rel = os.path.relpath(c, start=p)
-            return rel != "." and not rel.startswith("..")
-        except Exception:
-            return False
-    return False
-
-
-def _relref(from_file: str, to_file: str) -> str:
-    """Relative reference if same Nucleus host; otherwise absolute. Local uses os.path.relpath."""
-    if _is_ov_url(from_file) and _is_ov_url(to_file):
-        try:
-            sf, sfn, sp = _split_ov(from_file)
-            st, stn, tp = _split_ov(to_file)
-            if sf == st and sfn == stn:
-                from_dir = posixpath.dirname(sp)
-                return posixpath.relpath(tp, start=from_dir)
-        except Exception:
-            pass
-        return to_file
-    from_dir = os.path.dirname(_abs(from_file))
-    tgt_abs = _abs(_ensure_usd_ext(to_file))
-    try:
-        rel = os.path.relpath(tgt_abs, start=from_dir)
-    except Exception:
-        return tgt_abs
-    return rel.replace("\\", "/")
-
-
-def _dotify_rel(rel_path: str) -> str:
-    """Make 'name.usd' -> './name.usd' for subLayers to match sample."""
-    if not rel_path:
-        return rel_path
-    if rel_path.startswith(("omniverse://", "omni://", "/", "../", "./")):
-        return rel_path
-    return f"./{rel_path}"
-
-
-# ======================= File IO (supports cross-scheme) =======================
-
-def _read_bytes(path_or_url: str):
-    if _is_ov_url(path_or_url):
-        if omni is None:
-            return None
-        rc, content = omni.client.read_file(path_or_url)
-        return bytes(content) if rc == omni.client.Result.OK else None
-    else:
-        try:
-            with open(path_or_url, "rb") as f:
-                return f.read()
-        except Exception:
-            return None
-
-
-def _write_bytes(path_or_url: str, data: bytes) -> bool:
-    if _is_ov_url(path_or_url):
-        if omni is None:
-            return False
-        _ensure_dir_ov(_dirname(path_or_url))
-        rc = omni.client.write_file(path_or_url, data)
-        return rc == omni.client.Result.OK
-    else:
-        _ensure_dir_local(os.path.dirname(path_or_url))
-        with open(path_or_url, "wb") as f:
-            f.write(data)
-        return True
-
-
-def _copy_file_any_scheme(src: str, dst: str, overwrite: bool, log_fn) -> bool:
-    """Copy src->dst even across local/Nucleus. Returns True if present at dst (copied or already there)."""
-    if _is_same_path(src, dst):
-        return True
-
-    if _exists(dst):
-        if not overwrite:
-            log_fn("[INFO] Exists, skip copy.")
-            return True
-        if _is_ov_url(dst):
-            try:
-                omni.client.delete(dst)
-            except Exception:
-                pass
-
-    # Same-scheme fast path
-    if _is_ov_url(src) == _is_ov_url(dst):
-        if _is_ov_url(src):
-            rc = omni.client.copy(src, dst)[0] if hasattr(omni.client, "copy") else omni.client.Result.ERROR
-            if rc != omni.client.Result.OK:
-                log_fn(f"[ERROR] Nucleus copy failed ({rc})")
-                return False
-            return True
-        else:
-            _ensure_dir_local(os.path.dirname(dst))
-            shutil.copy2(src, dst)
-            return True
-
-    # Cross-scheme: read then write
-    data = _read_bytes(src)
-    if data is None:
-        log_fn("[ERROR] Read failed (cross-scheme).")
-        return False
-    ok = _write_bytes(dst, data)
-    if not ok:
-        log_fn("[ERROR] Write failed (cross-scheme).")
-    return ok
-
-
-def _copy_materials_any_scheme(src_core_dir: str, out_core_dir: str, overwrite: bool, log_fn) -> bool:
-    """Recursively copy 'Materials' from src_core_dir to out_core_dir across local/Nucleus, loop-safe."""
-    src_mat = _join(src_core_dir, "Materials") if _is_ov_url(src_core_dir) else os.path.join(src_core_dir, "Materials")
-    dst_mat = _join(out_core_dir, "Materials") if _is_ov_url(out_core_dir) else os.path.join(out_core_dir, "Materials")
-
-    # Existence check
-    if _is_ov_url(src_mat):
-        if omni is None:
-            return False
-        rc, info = omni.client.stat(src_mat)
-        if rc != omni.client.Result.OK or not (info.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN)):
-            return False
-    else:
-        if not os.path.isdir(src_mat):
-            return False
-
-    # Loop-safety (defensive; on_start already guards)
-    if _is_same_path(out_core_dir, src_core_dir) or _is_inside(out_core_dir, src_core_dir) or _is_inside(src_core_dir, out_core_dir):
-        log_fn("[WARN] Loop risk; skip Materials copy.")
-        return False
-
-    def _ensure_dir_any(d):
-        (_ensure_dir_ov if _is_ov_url(d) else _ensure_dir_local)(d)
-
-    # Nucleus -> Nucleus: per-file copy
-    if _is_ov_url(src_mat) and _is_ov_url(dst_mat):
-        def walk(u_src: str, u_dst: str):
-            rc, entries = omni.client.list(u_src.rstrip("/"))
-            if int(rc) != int(omni.client.Result.OK):
-                return
-            _ensure_dir_ov(u_dst)
-            for e in entries:
-                name = e.relative_path
-                if not name or name in (".", ".."):
-                    continue
-                c_src = u_src.rstrip("/") + "/" + name
-                c_dst = u_dst.rstrip("/") + "/" + name
-                is_dir = bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
-                if is_dir:
-                    walk(c_src, c_dst)
-                else:
-                    if _exists(c_dst) and not overwrite:
-                        continue
-                    if _exists(c_dst) and overwrite:
-                        try: omni.client.delete(c_dst)
-                        except Exception: pass
-                    rc2 = omni.client.copy(c_src, c_dst)[0] if hasattr(omni.client, "copy") else omni.client.Result.ERROR
-                    if rc2 != omni.client.Result.OK:
-                        log_fn(f"[ERROR] Copy failed: {c_src} → {c_dst} ({rc2})")
-        walk(src_mat, dst_mat)
-        return True
-
-    # General cases (local<->local / cross-scheme): iterate and read->write
-    def _iter_local_files(root_dir: str):
-        for r, _dirs, files in os.walk(root_dir, topdown=True):
-            yield r, files
-
-    def _iter_ov_files(root_url: str):
-        rc, entries = omni.client.list(root_url.rstrip("/"))
-        if int(rc) != int(omni.client.Result.OK):
-            return
-        files_here = []
-        dirs_here = []
-        for e in entries:
-            name = e.relative_path
-            if not name or name in (".", ".."):
-                continue
-            is_dir = bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
-            (dirs_here if is_dir else files_here).append(name)
-        yield root_url, files_here
-        for d in dirs_here:
-            yield from _iter_ov_files(root_url.rstrip("/") + "/" + d)
-
-    if _is_ov_url(src_mat):
-        for parent, files in _iter_ov_files(src_mat):
-            rel = posixpath.relpath(parent, start=src_mat)
-            target_parent = dst_mat if rel == "." else (_join(dst_mat, rel) if _is_ov_url(dst_mat) else os.path.join(dst_mat, rel))
-            _ensure_dir_any(target_parent)
-            for f in files:
-                s = parent.rstrip("/") + "/" + f
-                d = (target_parent.rstrip("/") + "/" + f) if _is_ov_url(target_parent) else os.path.join(target_parent, f)
-                if _exists(d) and not overwrite:
-                    continue
-                data = _read_bytes(s)
-                if data is None:
-                    log_fn(f"[ERROR] Read failed: {s}")
-                    continue
-                if not _write_bytes(d, data):
-                    log_fn(f"[ERROR] Write failed: {d}")
-        return True
-    else:
-        for parent, files in _iter_local_files(src_mat):
-            rel = os.path.relpath(parent, start=src_mat)
-            target_parent = dst_mat if rel == "." else (_join(dst_mat, rel) if _is_ov_url(dst_mat) else os.path.join(dst_mat, rel))
-            _ensure_dir_any(target_parent)
-            for f in files:
-                s = os.path.join(parent, f)
-                d = (target_parent.rstrip("/") + "/" + f) if _is_ov_url(target_parent) else os.path.join(target_parent, f)
-                if _exists(d) and not overwrite:
-                    continue
-                data = _read_bytes(s)
-                if data is None:
-                    log_fn(f"[ERROR] Read failed: {s}")
-                    continue
-                if not _write_bytes(d, data):
-                    log_fn(f"[ERROR] Write failed: {d}")
-        return True
-
-
-# ============================== USD Stage Helpers ==============================
-
-def _create_file_backed_stage(out_path: str) -> Usd.Stage:
-    out_path = _ensure_usd_ext(out_path)
-    (_ensure_dir_ov if _is_ov_url(out_path) else _ensure_dir_local)(_dirname(out_path))
-    root = Sdf.Layer.CreateNew(out_path)  # overwrite-friendly
-    return Usd.Stage.Open(root)
-
-
-def _save(stage: Usd.Stage) -> str:
-    root = stage.GetRootLayer()
-    root.Save()
-    return root.identifier
-
-
-def _set_stage_defaults(stage: Usd.Stage) -> None:
-    UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
-    UsdGeom.SetStageMetersPerUnit(stage, 0.01)
-    stage.SetTimeCodesPerSecond(60)
-    stage.SetStartTimeCode(0)
-    stage.SetEndTimeCode(100)
-
-
-# --------------------------- customLayerData presets ---------------------------
-
-_RENDER_SETTINGS = {
-    "rtx:debugView:pixelDebug:textColor":                  Gf.Vec3f(0.0, 1.0e18, 0.0),
-    "rtx:fog:fogColor":                                    Gf.Vec3f(0.75, 0.75, 0.75),
-    "rtx:index:regionOfInterestMax":                       Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:index:regionOfInterestMin":                       Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:iray:environment_dome_ground_position":           Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:iray:environment_dome_ground_reflectivity":       Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:iray:environment_dome_rotation_axis":             Gf.Vec3f(3.4028235e38, 3.4028235e38, 3.4028235e38),
-    "rtx:post:backgroundZeroAlpha:backgroundDefaultColor": Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:post:colorcorr:contrast":                         Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorcorr:gain":                             Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorcorr:gamma":                            Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorcorr:offset":                           Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:post:colorcorr:saturation":                       Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorgrad:blackpoint":                       Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:post:colorgrad:contrast":                         Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorgrad:gain":                             Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorgrad:gamma":                            Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorgrad:lift":                             Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:post:colorgrad:multiply":                         Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:colorgrad:offset":                           Gf.Vec3f(0.0, 0.0, 0.0),
-    "rtx:post:colorgrad:whitepoint":                       Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:post:lensDistortion:lensFocalLengthArray":        Gf.Vec3f(10.0, 30.0, 50.0),
-    "rtx:post:lensFlares:anisoFlareFalloffX":              Gf.Vec3f(450.0, 475.0, 500.0),
-    "rtx:post:lensFlares:anisoFlareFalloffY":              Gf.Vec3f(10.0, 10.0, 10.0),
-    "rtx:post:tonemap:whitepoint":                         Gf.Vec3f(1.0, 1.0, 1.0),
-    "rtx:raytracing:inscattering:singleScatteringAlbedo":  Gf.Vec3f(0.9, 0.9, 0.9),
-    "rtx:raytracing:inscattering:transmittanceColor":      Gf.Vec3f(0.5, 0.5, 0.5),
-    "rtx:sceneDb:ambientLightColor":                       Gf.Vec3f(0.1, 0.1, 0.1),
-}
-
-def _make_custom_layer_data(persp_pos: Gf.Vec3d, persp_tgt: Gf.Vec3d) -> dict:
-    return {
-        "cameraSettings": {
-            "Front": {"position": Gf.Vec3d(50000.0, 0.0, 0.0), "radius": 500.0},
-            "Perspective": {"position": persp_pos, "target": persp_tgt},
-            "Right": {"position": Gf.Vec3d(0.0, -50000.0, 0.0), "radius": 500.0},
-            "Top":   {"position": Gf.Vec3d(0.0, 0.0, 50000.0), "radius": 500.0},
-            "boundCamera": "/OmniverseKit_Persp",
-        },
-        "navmeshSettings": {"agentHeight": 180.0, "agentRadius": 20.0, "excludeRigidBodies": True, "ver": 1, "voxelCeiling": 460.0},
-        "omni_layer": {"locked": {}, "muteness": {}},
-        "renderSettings": dict(_RENDER_SETTINGS),
-        "xrSettings": {},
-    }
-
-_ASSET_CAM = (Gf.Vec3d(468.23583907821103, 207.3167254218987, 136.30348999707007),
-              Gf.Vec3d(1.8999877335081692, 0.000004266803131258712, 111.00506298576693))
-
-_MAIN_CAM  = (Gf.Vec3d(438.24681779843604, 222.6747569439535, 257.21875304644374),
-              Gf.Vec3d(10.307273578659249, -7.256348633949841, 98.82433171214586))
-
-_ID_CAM    = (Gf.Vec3d(563.6285775303645, 274.16293093872434, 178.3208850340164),
-              Gf.Vec3d(1.8999929336483774, 0.00003321702774883306, 111.00497360562268))
-
-
-# =============================== Builders / USD ================================
-
-def _derive_names(src_path: str, id_suffix: str) -> Tuple[str, str, str, str]:
-    base = src_path.rsplit("/", 1)[-1] if _is_ov_url(src_path) else os.path.basename(src_path)
-    name, _, _ = base.partition(".")
-    core = name[4:] if name.lower().startswith("max_") else name
-    
-    # [Logic Change] Handle empty suffix
-    if id_suffix:
-        id_filename = f"id_{core}_{id_suffix}.usd"
-    else:
-        id_filename = f"id_{core}.usd"
-
-    return core, f"asset_{core}.usd", f"{core}.usd", id_filename
-
-
-def _build_asset(out_path: str, sublayer_target: str, mat_path_override: str = "") -> str:
-    stage = _create_file_backed_stage(out_path)
-    _set_stage_defaults(stage)
-    stage.SetDefaultPrim(UsdGeom.Xform.Define(stage, "/World").GetPrim())
-    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_ASSET_CAM)
-    
-    # 1. Process max_{name}.usd (Base layer)
-    rel_max = _dotify_rel(_relref(out_path, sublayer_target))
-    
-    # Prepare subLayer list
-    layers = [rel_max]
-
-    # 2. If material override path is specified, add it to the top (Index 0)
-    if mat_path_override:
-        raw_mat_path = _relref(out_path, mat_path_override)
-        if ":" in raw_mat_path or raw_mat_path.startswith(("/", "\\")):
-            rel_mat = raw_mat_path
-        else:
-            rel_mat = _dotify_rel(raw_mat_path)
-        
-        # Insert at the first position to ensure override
-        layers.insert(0, rel_mat)
-
-    # 3. Set subLayerPaths
-    stage.GetRootLayer().subLayerPaths = layers
-    
-    _save(stage)
-    return out_path
-
-
-def _build_main(out_path: str, asset_path: str, core: str) -> str:
-    stage = _create_file_backed_stage(out_path)
-    _set_stage_defaults(stage)
-    stage.SetDefaultPrim(UsdGeom.Xform.Define(stage, "/World").GetPrim())
-    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_MAIN_CAM)
-    UsdGeom.Scope.Define(stage, "/World/ASSET")
-    prim = stage.DefinePrim(f"/World/ASSET/asset_{core}")
-    prim.GetReferences().ClearReferences()
-    prim.GetReferences().AddReference(_relref(out_path, asset_path))
-    _save(stage)
-    return out_path
-
-
-def _build_id(out_path: str, main_path: str, core: str) -> str:
-    stage = _create_file_backed_stage(out_path)
-    _set_stage_defaults(stage)
-    stage.SetDefaultPrim(UsdGeom.Xform.Define(stage, "/World").GetPrim())
-    stage.GetRootLayer().customLayerData = _make_custom_layer_data(*_ID_CAM)
-    
-    # Create Prim
-    prim = stage.DefinePrim(f"/World/{core}")
-    
-    # [Logic] Set Kind = component
-    Usd.ModelAPI(prim).SetKind(Kind.Tokens.component)
-    
-    prim.GetReferences().ClearReferences()
-    prim.GetReferences().AddReference(_relref(out_path, main_path))
-    _save(stage)
-    return out_path
+from .pipeline import BuildOptions, ItemResult, plan_output_dirs, create_output_dirs
+from .pipeline import SYNC_OFF, SYNC_MTIME, SYNC_CHECKSUM, ENCODINGS, ARCS
+from .scanner import Scanner, ScanFeed, DEFAULT_PRUNE, _filter_text, _list_local, _list_nucleus
+from .scanindex import ScanIndex
+from .report import BuildReport, RateMeter, format_eta
+from .manifest import BuildManifest
+from .engine import BuildEngine, MODE_THREADS, MODE_PROCESSES, _default_workers
+from .journal import BuildJournal
+from .planner import plan_build
+from .templates import register_template, registered_templates
+from .logsink import LogSink, LEVELS, log_path
+from .jobqueue import JobQueue, EngineGroup, BuildJob, make_job, DONE, FAILED
 
 
 # ================================== UI / Ext ==================================
@@ -506,6 +42,11 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
         # [Safe Init] Ensure these are initialized here for standalone mode
         self._init_data()
 
+        # A queue that was running when Kit closed picks up where it stopped.
+        if self._queue.autorun and self._queue.queued():
+            self._info(f"Resuming the build queue: {len(self._queue.queued())} jobs left")
+            self._start_build_task(self._run_queue_async())
+
         # Styles for log lines
         self._STYLE_HEAD  = {"font_size": 18, "color": 0xFFDDDDDD}
         self._STYLE_LABEL = {"color": 0xFFAAAAAA}   # Dimmed labels
@@ -528,6 +69,13 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             pass
 
     def on_shutdown(self):
+        # A running build stops at the next stage boundary of its items.
+        self._shutting_down = True   # a running queue stays armed for the next session
+        if getattr(self, "_engine", None) is not None:
+            self._engine.cancel()
+        if getattr(self, "_log", None) is not None:
+            self._log.close()   # results still arriving from the cancelled run are written directly
+
         if self._menu:
             try:
                 omni.kit.ui.get_editor_menu().remove_item(self._menu)
@@ -545,50 +93,40 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             self._found: List[str] = []
         if not hasattr(self, '_scan_root'):
             self._scan_root: str = ""
+        if not hasattr(self, '_scan_pattern'):
+            self._scan_pattern: str = ""
+        if not hasattr(self, '_scan_seconds'):
+            self._scan_seconds: Optional[float] = None
         if not hasattr(self, '_progress_bar'):
             self._progress_bar = None
         if not hasattr(self, '_progress_label'):
             self._progress_label = None
         if not hasattr(self, '_count_label'):
             self._count_label = None
+        if not hasattr(self, '_scanner'):
+            self._scanner = None
+        if not hasattr(self, '_build_task'):
+            self._build_task = None   # the Start / Resume task, so it can be paused or cancelled
+        if not hasattr(self, '_engine'):
+            self._engine = None
+        if not hasattr(self, '_pause_btn'):
+            self._pause_btn = None
+        if getattr(self, '_log', None) is None:
+            self._log = LogSink()     # session log until a build opens the run's log file
+        if not hasattr(self, '_log_view'):
+            self._log_view = None
+            self._log_view_due = False
+        if not hasattr(self, '_queue'):
+            self._queue = JobQueue.load()   # build jobs persisted across sessions
+            self._queue_label = None
+            self._shutting_down = False
 
     # ---------- Internal Listing Methods (Fix for NameError) ----------
     def _list_local(self, folder: str, pattern: str, recursive: bool) -> List[str]:
-        if not os.path.isdir(folder):
-            return []
-        if not recursive:
-            return sorted([os.path.join(folder, f) for f in os.listdir(folder) if fnmatch.fnmatch(f.lower(), pattern.lower())])
-        out = []
-        for root, _dirs, files in os.walk(folder):
-            for f in files:
-                if fnmatch.fnmatch(f.lower(), pattern.lower()):
-                    out.append(os.path.join(root, f))
-        return sorted(out)
+        return _list_local(folder, pattern, recursive)
 
     def _list_nucleus(self, url: str, pattern: str, recursive: bool) -> List[str]:
-        if omni is None:
-            return []
-        result: List[str] = []
-
-        def walk(u: str):
-            rc, entries = omni.client.list(u.rstrip("/"))
-            if int(rc) != int(omni.client.Result.OK):
-                return
-            for e in entries:
-                name = e.relative_path
-                if not name or name in (".", ".."):
-                    continue
-                child = u.rstrip("/") + "/" + name
-                is_dir = bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
-                if is_dir:
-                    if recursive:
-                        walk(child)
-                else:
-                    if fnmatch.fnmatch(name.lower(), pattern.lower()):
-                        result.append(child)
-
-        walk(url)
-        return sorted(result)
+        return _list_nucleus(url, pattern, recursive)
 
     # ---------- UI Architecture ----------
     
@@ -642,6 +180,13 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
                     ui.Label("Filename filter", width=0, style=self._STYLE_LABEL)
                     self._filter_field = ui.StringField(width=ui.Fraction(1), style=COMPACT_STYLE)
                     self._filter_field.model.set_value("max_*.usd")
+
+                # Prune Row: folders (and everything below them) the scan never lists
+                with ui.HStack(spacing=15, height=ui.Pixel(26)):
+                    ui.Label("Skip folders", width=0, style=self._STYLE_LABEL)
+                    self._prune_field = ui.StringField(width=ui.Fraction(1), style=COMPACT_STYLE)
+                    self._prune_field.model.set_value("; ".join(DEFAULT_PRUNE))
+                ui.Label("Filters are ';'-separated globs or re:<regex>; prefix '!' to exclude", style={"color": 0xFF666666, "font_size": 12})
                 
                 # Recurse Row
                 with ui.HStack(height=ui.Pixel(26), spacing=5):
@@ -649,6 +194,11 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
                     self._recurse_cb.model.set_value(True) # Default Checked
                     ui.Label("Recurse", width=0, style=self._STYLE_LABEL)
                     ui.Label("(Search inside sub-folders)", style={"color": 0xFF666666, "font_size": 12})
+                    ui.Spacer(width=20)
+                    self._quick_scan_cb = ui.CheckBox(width=20)
+                    self._quick_scan_cb.model.set_value(True)
+                    ui.Label("Quick rescan", width=0, style=self._STYLE_LABEL)
+                    ui.Label("(Only re-list folders changed since the last scan)", style={"color": 0xFF666666, "font_size": 12})
 
                 # ID Suffix / Overwrite Row
                 with ui.HStack(spacing=10, height=ui.Pixel(26)):
@@ -663,9 +213,22 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
                         self._overwrite_cb.model.set_value(False)
                         ui.Label("Overwrite", style=self._STYLE_LABEL)
 
+                    with ui.HStack(width=0, spacing=5):
+                        self._incremental_cb = ui.CheckBox(width=20)
+                        self._incremental_cb.model.set_value(False)
+                        ui.Label("Incremental", style=self._STYLE_LABEL)
+
+                # Overwrite Sync Row
+                with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                    ui.Label("Overwrite mode", width=0, style=self._STYLE_LABEL)
+                    self._sync_combo = ui.ComboBox(0, "Recopy everything", "Skip unchanged (size + mtime)",
+                                                   "Skip unchanged (checksum)", width=ui.Fraction(1))
+
                 # Scan Button (Inline with Count Label)
                 with ui.HStack(height=30, style={"margin_top": 5}):
                     ui.Button("Scan", clicked_fn=self._on_scan, width=ui.Fraction(1), height=30)
+                    ui.Spacer(width=5)
+                    ui.Button("Stop", clicked_fn=self._on_scan_stop, width=60, height=30)
                     ui.Spacer(width=10)
                     self._count_label = ui.Label("Ready to scan...", width=ui.Fraction(1), alignment=ui.Alignment.CENTER, style={"color": 0xFF888888})
 
@@ -689,6 +252,69 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
                     self._inplace_cb.model.set_value(False)
                     ui.Label("Allow Same Root (in-place) - skips Materials copy", style={"color": 0xFFDDDDDD})
 
+                # Dedup Row
+                with ui.HStack(spacing=5, height=ui.Pixel(26)):
+                    self._dedup_cb = ui.CheckBox(width=20)
+                    self._dedup_cb.model.set_value(False)
+                    ui.Label("Deduplicate Materials (store identical textures once)", style={"color": 0xFFDDDDDD})
+
+                # Dependency copy Row
+                with ui.HStack(spacing=5, height=ui.Pixel(26)):
+                    self._deps_cb = ui.CheckBox(width=20)
+                    self._deps_cb.model.set_value(False)
+                    ui.Label("Copy only dependencies (what max references, not all of Materials)",
+                             style={"color": 0xFFDDDDDD})
+
+                # Bounds Row
+                with ui.HStack(spacing=5, height=ui.Pixel(26)):
+                    self._bounds_cb = ui.CheckBox(width=20)
+                    self._bounds_cb.model.set_value(False)
+                    ui.Label("Author bounds (extentsHint on id and asset roots)", style={"color": 0xFFDDDDDD})
+                    ui.Spacer(width=10)
+                    ui.Label("Arcs", width=0, style=self._STYLE_LABEL)
+                    # 0 = references (load with the stage), 1 = payloads (layouts can open unloaded)
+                    self._arc_combo = ui.ComboBox(0, "References", "Payloads", width=110)
+
+                # Encoding Row (0 = default crate, 1 = usda, 2 = usdc; names stay .usd)
+                with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                    ui.Label("Encoding", width=0, style=self._STYLE_LABEL)
+                    ui.Label("asset", width=0, style=self._STYLE_LABEL)
+                    self._asset_enc_combo = ui.ComboBox(0, "Default", "usda", "usdc", width=ui.Fraction(1))
+                    ui.Label("main", width=0, style=self._STYLE_LABEL)
+                    self._main_enc_combo = ui.ComboBox(0, "Default", "usda", "usdc", width=ui.Fraction(1))
+                    ui.Label("id", width=0, style=self._STYLE_LABEL)
+                    self._id_enc_combo = ui.ComboBox(0, "Default", "usda", "usdc", width=ui.Fraction(1))
+                    with ui.HStack(width=0, spacing=5):
+                        self._usdz_cb = ui.CheckBox(width=20)
+                        self._usdz_cb.model.set_value(False)
+                        ui.Label("Package .usdz", style=self._STYLE_LABEL)
+
+                # Workers / Pool Row
+                with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                    ui.Label("Workers", width=0, style=self._STYLE_LABEL)
+                    self._workers_field = ui.IntField(width=60, style=COMPACT_STYLE)
+                    self._workers_field.model.set_value(_default_workers())
+                    ui.Spacer(width=20)
+                    ui.Label("Pool", width=0, style=self._STYLE_LABEL)
+                    # 0 = threads (Nucleus I/O), 1 = processes (USD authoring)
+                    self._pool_combo = ui.ComboBox(0, "Threads", "Processes", width=ui.Fraction(1))
+                    ui.Spacer(width=20)
+                    with ui.HStack(width=0, spacing=5):
+                        self._pipelined_cb = ui.CheckBox(width=20)
+                        self._pipelined_cb.model.set_value(False)
+                        ui.Label("Build while scanning", style=self._STYLE_LABEL)
+
+                # UI Update Row: how much of each frame result handling may use, and how often progress redraws
+                with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                    ui.Label("Frame budget (ms)", width=0, style=self._STYLE_LABEL)
+                    self._budget_field = ui.IntField(width=60, style=COMPACT_STYLE)
+                    self._budget_field.model.set_value(8)
+                    ui.Spacer(width=20)
+                    ui.Label("UI refresh (ms)", width=0, style=self._STYLE_LABEL)
+                    self._refresh_field = ui.IntField(width=60, style=COMPACT_STYLE)
+                    self._refresh_field.model.set_value(100)
+                    ui.Spacer()
+
             ui.Spacer(height=10)
             # [Mod v1.10.5] Light gray line
             ui.Line(height=1, style={"color": 0xFF555555})
@@ -697,6 +323,10 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             # --- Footer (Compactly Stacked) ---
             with ui.HStack(height=30, spacing=15):
                 ui.Button("Start (build trio)", clicked_fn=self._on_start_clicked, width=150, height=30)
+                ui.Button("Resume", clicked_fn=self._on_resume_clicked, width=80, height=30)
+                ui.Button("Dry run", clicked_fn=self._on_plan_clicked, width=80, height=30)
+                self._pause_btn = ui.Button("Pause", clicked_fn=self._on_pause_clicked, width=80, height=30)
+                ui.Button("Cancel", clicked_fn=self._on_cancel_clicked, width=80, height=30)
                 
                 # Real Progress Bar
                 with ui.ZStack(height=30): 
@@ -706,9 +336,59 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
                     # Overlay Text
                     self._progress_label = ui.Label("0/0", alignment=ui.Alignment.CENTER, style={"color": 0xFFFFFFFF})
 
-    # ---------- Logging (Console Only) ----------
+            # --- Job Queue (source/output pairs built one after another or side by side) ---
+            ui.Spacer(height=10)
+            with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                ui.Button("Add to queue", clicked_fn=self._on_queue_add_clicked, width=110, height=26)
+                ui.Button("Run queue", clicked_fn=self._on_queue_run_clicked, width=90, height=26)
+                ui.Button("Clear finished", clicked_fn=self._on_queue_clear_clicked, width=110, height=26)
+                ui.Label("Jobs at once", width=0, style=self._STYLE_LABEL)
+                self._concurrency_field = ui.IntField(width=40, style=COMPACT_STYLE)
+                self._concurrency_field.model.set_value(int(self._queue.settings.get("concurrency", 1)))
+                ui.Label("I/O cap", width=0, style=self._STYLE_LABEL)
+                # Items in flight across all running jobs (0 = each job's own bound)
+                self._io_cap_field = ui.IntField(width=50, style=COMPACT_STYLE)
+                self._io_cap_field.model.set_value(int(self._queue.settings.get("io_cap", 0)))
+                ui.Spacer()
+            self._queue_label = ui.Label("", word_wrap=True, style={"color": 0xFFAAAAAA, "font_size": 13})
+            self._refresh_queue_view()
+
+            # --- Log View (recent records; the console only shows warnings and errors) ---
+            ui.Spacer(height=10)
+            with ui.HStack(spacing=10, height=ui.Pixel(26)):
+                ui.Label("Log", width=0, style=self._STYLE_LABEL)
+                # 0 = everything, 1 = warnings and errors, 2 = errors only
+                self._log_level_combo = ui.ComboBox(0, "All", "Warnings", "Errors", width=110)
+                self._log_level_combo.model.add_item_changed_fn(lambda *_: self._refresh_log_view())
+                self._log_counts_label = ui.Label("", style={"color": 0xFF888888})
+            with ui.ScrollingFrame(height=140, style={"background_color": 0xFF1E1E1E}):
+                self._log_view = ui.Label("", word_wrap=True, alignment=ui.Alignment.LEFT_TOP,
+                                          style={"font_size": 13, "color": 0xFFCCCCCC})
+
+    # ---------- Logging (buffered sink; console gets warnings and errors) ----------
     def _log_to_console(self, level: str, text: str):
-        print(f"[SmartAssetsBuilder] [{level}] {text}")
+        if getattr(self, "_log", None) is None:
+            self._init_data()
+        self._log.log(level, text)
+        # Builds redraw the view with their progress; scans / dry runs get one deferred redraw.
+        if self._engine is None and not self._log_view_due and self._log_view:
+            self._log_view_due = True
+            asyncio.get_event_loop().call_later(0.1, self._deferred_log_view)
+
+    def _deferred_log_view(self):
+        self._log_view_due = False
+        self._refresh_log_view()
+
+    def _refresh_log_view(self):
+        """Redraw the log view from the sink's recent records at the selected level."""
+        if not self._log_view or self._log is None:
+            return
+        idx = self._log_level_combo.model.get_item_value_model().get_value_as_int()
+        lines = self._log.lines(LEVELS[min(max(idx, 0), 2)], limit=200)
+        self._log_view.text = "\n".join(
+            f"{time.strftime('%H:%M:%S', time.localtime(ts))} [{lvl}] {txt}" for ts, lvl, txt in lines)
+        c = self._log.counts
+        self._log_counts_label.text = f"{c.get('ERROR', 0)} errors, {c.get('WARN', 0)} warnings"
 
     def _info(self, msg: str):  self._log_to_console("INFO", msg)
     def _warn(self, msg: str):  self._log_to_console("WARN", msg)
@@ -726,10 +406,13 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             lvl, txt = "INFO", txt[6:].lstrip()
         self._log_to_console(lvl, txt)
 
-    def _progress(self, i: int, n: int):
-        # Update text label
+    def _progress(self, i: int, n: int, meter: Optional[RateMeter] = None):
+        # Update text label (with live items/sec and ETA while a build runs)
         if self._progress_label:
-            self._progress_label.text = f"{i}/{n}"
+            if meter is not None and i < n:
+                self._progress_label.text = f"{i}/{n}  {meter.rate:.1f}/s  ETA {format_eta(meter.eta(n - i))}"
+            else:
+                self._progress_label.text = f"{i}/{n}"
         
         # Update progress bar (0.0 to 1.0)
         if self._progress_bar and n > 0:
@@ -738,14 +421,10 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             self._progress_bar.model.set_value(0.0)
 
     # ---------- UI actions ----------
-    def _on_scan(self):
-        self._progress(0, 0)
-        if self._count_label:
-            self._count_label.text = "Scanning..."
-            self._count_label.style = {"color": 0xFFFFFF00} # Yellow while scanning
-
+    def _read_scan_inputs(self):
+        """(url, pattern, recurse) from the Source section, or None if the URL is missing."""
         url = self._folder_field.model.get_value_as_string().strip()
-        pattern = (self._filter_field.model.get_value_as_string().strip() or "max_*.usd").lower()
+        prune = [t.strip() for t in self._prune_field.model.get_value_as_string().split(";") if t.strip()]
         recurse = (self._recurse_cb.model.get_value_as_bool()
                    if hasattr(self._recurse_cb.model, "get_value_as_bool")
                    else bool(self._recurse_cb.model.get_value_as_int()))
@@ -755,39 +434,154 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             if self._count_label: 
                 self._count_label.text = "Error: Missing URL"
                 self._count_label.style = {"color": 0xFFFF5555}
+            return None
+        try:
+            pattern = _filter_text(self._filter_field.model.get_value_as_string(), prune)
+        except ValueError as e:
+            self._error(f"Invalid filter: {e}")
+            if self._count_label:
+                self._count_label.text = "Error: Invalid filter"
+                self._count_label.style = {"color": 0xFFFF5555}
+            return None
+        return url, pattern, recurse
+
+    def _on_scan(self):
+        self._progress(0, 0)
+        if self._count_label:
+            self._count_label.text = "Scanning..."
+            self._count_label.style = {"color": 0xFFFFFF00} # Yellow while scanning
+
+        inputs = self._read_scan_inputs()
+        if inputs is None:
             return
+        url, pattern, recurse = inputs
 
+        if self._scanner is not None:
+            self._warn("A scan is already running (press Stop to cancel it)")
+            return
+
+        asyncio.ensure_future(self._on_scan_async(url, pattern, recurse))
+
+    def _on_scan_stop(self):
+        if self._scanner is not None:
+            self._scanner.cancel()
+
+    async def _on_scan_async(self, url: str, pattern: str, recurse: bool):
+        """Scan on a background thread and update the counter live every frame."""
+        found: List[str] = []
+        state = {"finished": False, "error": None}
+
+        def _on_done(err):
+            state["error"] = err
+            state["finished"] = True
+
+        # The index is always kept up to date; "Quick rescan" decides whether it is trusted.
+        index = await asyncio.get_event_loop().run_in_executor(None, ScanIndex.load, url, pattern, recurse)
+        index.reuse = (self._quick_scan_cb.model.get_value_as_bool()
+                       if hasattr(self._quick_scan_cb.model, "get_value_as_bool")
+                       else bool(self._quick_scan_cb.model.get_value_as_int()))
+        scanner = Scanner(url, pattern, recurse, index=index)
+        self._scanner = scanner
+        t0 = time.perf_counter()
+        scanner.start(found.append, _on_done)
         try:
-            # [Fix] Use self._list_... methods
-            files = self._list_nucleus(url, pattern, recurse) if _is_ov_url(url) else self._list_local(url, pattern, recurse)
-            self._found = files
-            self._scan_root = url
-            
-            # Update Counter
-            if self._count_label:
-                count = len(files)
-                if count > 0:
-                    self._count_label.text = f"Found: {count} items"
-                    self._count_label.style = {"color": 0xFF55FF55} # Green on success
-                    self._info(f"Found {count} files")
-                else:
-                    self._count_label.text = f"Found: 0 items (check filter/path)"
-                    self._count_label.style = {"color": 0xFFFFCC00}
-                    self._warn(f"No files matched '{pattern}'")
+            while not state["finished"]:
+                if self._count_label:
+                    self._count_label.text = f"Scanning... {len(found)} found"
+                await omni.kit.app.get_app().next_update_async()
+        finally:
+            self._scanner = None
 
-        except Exception as e:
+        if state["error"] is not None:
+            e = state["error"]
             self._error(f"Scan failed: {e}")
             if self._count_label: 
                 self._count_label.text = "Scan Error (check console)"
                 self._count_label.style = {"color": 0xFFFF5555}
-            traceback.print_exc()
+            traceback.print_exception(type(e), e, e.__traceback__)
+            return
+
+        files = sorted(found)
+        self._found = files
+        self._scan_root = url
+        self._scan_pattern = pattern
+        self._scan_seconds = time.perf_counter() - t0
+        self._log_scan_delta(index, complete=not scanner.cancelled)
+
+        # Update Counter
+        if self._count_label:
+            count = len(files)
+            if scanner.cancelled:
+                self._count_label.text = f"Stopped: {count} items"
+                self._count_label.style = {"color": 0xFFFFCC00}
+                self._warn(f"Scan cancelled after {scanner.dirs_listed} folders; {count} files kept")
+            elif count > 0:
+                self._count_label.text = f"Found: {count} items"
+                self._count_label.style = {"color": 0xFF55FF55} # Green on success
+                self._info(f"Found {count} files")
+            else:
+                self._count_label.text = f"Found: 0 items (check filter/path)"
+                self._count_label.style = {"color": 0xFFFFCC00}
+                self._warn(f"No files matched '{pattern}'")
+
+    def _log_scan_delta(self, index: ScanIndex, complete: bool):
+        """Save the scan index and log what changed since the previous scan of this tree."""
+        delta = index.finish(complete=complete)
+        if not index.save():
+            self._warn(f"Could not write scan index: {index.path}")
+        self._info(f"Scan index: {delta.dirs_listed} folders listed, {delta.dirs_reused} unchanged")
+        if delta.first_scan:
+            return
+        if not delta.changed:
+            self._info("No changes since the last scan")
+            return
+        self._info(f"Since the last scan: {len(delta.added)} added, {len(delta.removed)} removed, "
+                   f"{len(delta.modified)} modified")
+        for label, paths in (("Added", delta.added), ("Removed", delta.removed), ("Modified", delta.modified)):
+            for p in paths[:20]:
+                self._info(f"  {label}: {p}")
+            if len(paths) > 20:
+                self._info(f"  ... and {len(paths) - 20} more {label.lower()}")
 
     def _on_start_clicked(self):
         # Wrapper to fire the async task
-        asyncio.ensure_future(self._on_start_async())
+        self._start_build_task(self._on_start_async())
+
+    def _start_build_task(self, coro) -> None:
+        """Run a Start / Resume coroutine as the tracked build task (one at a time)."""
+        if self._build_task is not None and not self._build_task.done():
+            coro.close()
+            self._warn("A build is already running (press Cancel to stop it)")
+            return
+        self._build_task = asyncio.ensure_future(coro)
+
+    def _on_pause_clicked(self):
+        engine = self._engine
+        if engine is None:
+            return
+        if engine.paused:
+            engine.resume()
+            self._info("Build continued")
+        else:
+            engine.pause()
+            self._info("Build paused: running items stop at their next stage")
+        if self._pause_btn:
+            self._pause_btn.text = "Continue" if engine.paused else "Pause"
+
+    def _on_cancel_clicked(self):
+        if self._engine is not None:
+            self._engine.cancel()
+            self._warn("Cancelling: running items stop at their next stage, half-built trios are rolled back")
+        elif self._build_task is not None and not self._build_task.done():
+            # Still preparing (e.g. rescanning for Resume): nothing has been built yet.
+            self._build_task.cancel()
+            self._warn("Build cancelled")
 
     async def _on_start_async(self):
-        if not self._found:
+        pipelined = (self._pipelined_cb.model.get_value_as_bool()
+                     if hasattr(self._pipelined_cb.model, "get_value_as_bool")
+                     else bool(self._pipelined_cb.model.get_value_as_int()))
+        if not pipelined and not self._found:
             self._warn("Nothing to process: please scan first")
             if self._count_label: 
                 self._count_label.text = "Please Scan First!"
@@ -799,121 +593,411 @@ class SmartAssetsBuilderExtension(omni.ext.IExt):
             self._error("Please enter an Output Root URL")
             return
 
+        feed = None
+        if pipelined:
+            if self._scanner is not None:
+                self._warn("A scan is already running (press Stop to cancel it)")
+                return
+            inputs = self._read_scan_inputs()
+            if inputs is None:
+                return
+            url, pattern, recurse = inputs
+            # Bounded queue: the scanner pauses when builders fall behind.
+            feed = ScanFeed(Scanner(url, pattern, recurse), maxsize=256)
+
+        opts = self._read_build_options(out_root)
+        if feed is not None:
+            scan = (url, pattern, recurse)
+        else:
+            # Recorded in the run journal for reference; the item list itself is journaled.
+            scan = (self._scan_root, self._scan_pattern, True)
+        await self._run_build_async(opts, self._make_engine(), items=None if feed is not None else list(self._found),
+                                    feed=feed, journal=BuildJournal(out_root), scan=scan)
+
+    def _read_build_options(self, out_root: str) -> BuildOptions:
+        """BuildOptions from the Source / Output sections."""
         id_suffix = self._id_field.model.get_value_as_string().strip() or "TEMP00000001"
         overwrite = (self._overwrite_cb.model.get_value_as_bool()
                      if hasattr(self._overwrite_cb.model, "get_value_as_bool")
                      else bool(self._overwrite_cb.model.get_value_as_int()))
+        inplace_ok = (self._inplace_cb.model.get_value_as_bool()
+                      if hasattr(self._inplace_cb.model, "get_value_as_bool")
+                      else bool(self._inplace_cb.model.get_value_as_int()))
+        incremental = (self._incremental_cb.model.get_value_as_bool()
+                       if hasattr(self._incremental_cb.model, "get_value_as_bool")
+                       else bool(self._incremental_cb.model.get_value_as_int()))
+        dedup = (self._dedup_cb.model.get_value_as_bool()
+                 if hasattr(self._dedup_cb.model, "get_value_as_bool")
+                 else bool(self._dedup_cb.model.get_value_as_int()))
+        dependency_copy = (self._deps_cb.model.get_value_as_bool()
+                           if hasattr(self._deps_cb.model, "get_value_as_bool")
+                           else bool(self._deps_cb.model.get_value_as_int()))
+
+        usdz = (self._usdz_cb.model.get_value_as_bool()
+                if hasattr(self._usdz_cb.model, "get_value_as_bool")
+                else bool(self._usdz_cb.model.get_value_as_int()))
+        bounds = (self._bounds_cb.model.get_value_as_bool()
+                  if hasattr(self._bounds_cb.model, "get_value_as_bool")
+                  else bool(self._bounds_cb.model.get_value_as_int()))
+
+        sync_idx = min(2, max(0, self._sync_combo.model.get_item_value_model().get_value_as_int()))
+        encodings = [ENCODINGS[min(2, max(0, c.model.get_item_value_model().get_value_as_int()))]
+                     for c in (self._asset_enc_combo, self._main_enc_combo, self._id_enc_combo)]
 
         # Read material override path
         mat_path_override = self._mat_field.model.get_value_as_string().strip()
 
-        n = len(self._found); done = 0; skipped = 0
-        self._progress(0, n)
+        arc = ARCS[min(1, max(0, self._arc_combo.model.get_item_value_model().get_value_as_int()))]
+
+        return BuildOptions(out_root=out_root, id_suffix=id_suffix, overwrite=overwrite,
+                            mat_path_override=mat_path_override, inplace_ok=inplace_ok,
+                            incremental=incremental, dedup_materials=dedup, dependency_copy=dependency_copy,
+                            sync=(SYNC_OFF, SYNC_MTIME, SYNC_CHECKSUM)[sync_idx],
+                            asset_encoding=encodings[0], main_encoding=encodings[1],
+                            id_encoding=encodings[2], usdz=usdz, bounds=bounds, arc=arc)
+
+    def _on_plan_clicked(self):
+        asyncio.ensure_future(self._on_plan_async())
+
+    async def _on_plan_async(self):
+        """Dry run over the scanned items: log what Start would copy, create and author."""
+        if not self._found:
+            self._warn("Nothing to plan: please scan first")
+            return
+        out_root = self._out_root_field.model.get_value_as_string().strip()
+        if not out_root:
+            self._error("Please enter an Output Root URL")
+            return
+        opts = self._read_build_options(out_root)
+        manifest = BuildManifest.load(out_root) if opts.incremental else None
+        workers = self._workers_field.model.get_value_as_int() or _default_workers()
+        items = list(self._found)
+        self._info(f"Dry run: planning {len(items)} items (nothing is written)")
+        try:
+            plan = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: plan_build(items, opts, workers=workers, manifest=manifest))
+        except Exception as e:
+            self._error(f"Dry run failed: {e}")
+            traceback.print_exc()
+            return
 
-        for i, src in enumerate(self._found, start=1):
+        s = plan.summary()
+        est = s["est_seconds"]
+        self._info(f"Plan: build {s['build']}, skip {s['skipped']}, fail {s['failed']} of {s['items']} items")
+        self._info(f"  copy {s['files_to_copy']} files ({s['bytes_to_copy'] / (1 << 30):.2f} GB), "
+                   f"keep {s['files_kept']}, create {s['dirs_to_create']} folders, author {s['layers_to_author']} layers")
+        took = f"{est / 60.0:.1f} min" if est >= 120 else f"{est:.0f} s"
+        self._info(f"  estimate: ~{took} with {s['workers']} workers at {s['throughput_mbps']} MB/s")
+        for src, n in plan.largest(5):
+            self._info(f"  largest: {n / (1 << 20):.1f} MB  {src}")
+        for _src, reason in plan.failures(10):
+            self._warn(f"  {reason}")
+        for src, path in plan.missing(10):
+            self._warn(f"  missing dependency: {path} ({src})")
+        for note in s["notes"]:
+            self._info(f"  note: {note}")
+
+    def _on_resume_clicked(self):
+        self._start_build_task(self._on_resume_async())
+
+    async def _on_resume_async(self):
+        out_root = self._out_root_field.model.get_value_as_string().strip()
+        if not out_root:
+            self._error("Please enter an Output Root URL")
+            return
+        journal = BuildJournal.load(out_root)
+        if not journal.resumable:
+            self._warn(f"Nothing to resume: no interrupted run journaled for {out_root}")
+            return
+        header = journal.header
+        for role, path in (header.get("templates") or {}).items():
             try:
-                core, asset_name, main_name, id_name = _derive_names(src, id_suffix)
-                src_core_dir = _dirname(src)
-                out_core_dir = _join(out_root, core)
-
-                # Loop-safety & in-place mode
-                inplace_ok = (self._inplace_cb.model.get_value_as_bool()
-                              if hasattr(self._inplace_cb.model, "get_value_as_bool")
-                              else bool(self._inplace_cb.model.get_value_as_int()))
-                same_dir = _is_same_path(out_core_dir, src_core_dir)
-                overlap  = _is_inside(out_core_dir, src_core_dir) or _is_inside(src_core_dir, out_core_dir)
-
-                if overlap or (same_dir and not inplace_ok):
-                    self._error("Invalid Output Root: it must NOT be inside/contain the source <CORE> folder. "
-                                "If you want to build in-place, enable 'Allow Same Root (in-place)'. Skipped.")
-                    self._progress(i, n)
-                    await omni.kit.app.get_app().next_update_async()
-                    continue
-
-                inplace_mode = same_dir and inplace_ok
-
-                # Prepare output dirs
-                (_ensure_dir_ov if _is_ov_url(out_core_dir) else _ensure_dir_local)(out_core_dir)
-                (_ensure_dir_ov if _is_ov_url(out_root) else _ensure_dir_local)(out_root)
-
-                # File paths
-                asset_path = _ensure_usd_ext(_join(out_core_dir, asset_name))
-                main_path  = _ensure_usd_ext(_join(out_core_dir, main_name))
-                id_path    = _ensure_usd_ext(_join(out_root, id_name))
-
-                # Overwrite guard
-                if not overwrite and (_exists(asset_path) or _exists(main_path) or _exists(id_path)):
-                    self._info(f"Skipped (exists): {src}")
-                    skipped += 1
-                    self._progress(i, n)
-                    await omni.kit.app.get_app().next_update_async()
-                    continue
-
-                self._info(f"Processing: {src}")
-                self._info(f"  CORE src : {src_core_dir}")
-                self._info(f"  CORE out : {out_core_dir}")
-                self._info(f"  id out   : {out_root}")
-                self._info(f"  in-place : {'ON' if inplace_mode else 'OFF'}")
-
-                # max_<CORE>.usd
-                if inplace_mode:
-                    max_dst = src
-                    self._info("  max: in-place mode - no copy (using original)")
-                else:
-                    max_dst = _join(out_core_dir, os.path.basename(src))
-                    copied = _copy_file_any_scheme(src, max_dst, overwrite, self._styled)
-                    if not copied and not _exists(max_dst):
-                        self._progress(i, n)
-                        await omni.kit.app.get_app().next_update_async()
-                        continue
-
-                # Materials/
-                if inplace_mode:
-                    self._info("  Materials: in-place mode - skip copy (already alongside max).")
-                else:
-                    _mat_ok = _copy_materials_any_scheme(src_core_dir, out_core_dir, overwrite, self._styled)
-                    if not _mat_ok:
-                        self._warn("Materials not copied or not found. If max references './Materials/...', textures may miss.")
-
-                # Build trio: asset -> main -> id
-                try:
-                    self._info(f"  [1/3] asset -> {asset_path}")
-                    # Pass the material path override here
-                    a_path = _build_asset(asset_path, max_dst, mat_path_override)
-                    self._info(f"      asset done: {a_path}")
-                except Exception as e_asset:
-                    self._error(f"      asset failed: {e_asset}")
-                    self._progress(i, n)
-                    await omni.kit.app.get_app().next_update_async()
-                    continue
-
-                try:
-                    self._info(f"  [2/3] main  -> {main_path}")
-                    m_path = _build_main(main_path, a_path, core)
-                    self._info(f"      main done: {m_path}")
-                except Exception as e_main:
-                    self._error(f"      main failed: {e_main}")
-                    self._progress(i, n)
-                    await omni.kit.app.get_app().next_update_async()
-                    continue
-
-                try:
-                    self._info(f"  [3/3] id    -> {id_path}")
-                    i_path = _build_id(id_path, m_path, core)
-                    self._info(f"      id done: {i_path}")
-                except Exception as e_id:
-                    self._error(f"      id failed: {e_id}")
-                    self._progress(i, n)
-                    await omni.kit.app.get_app().next_update_async()
-                    continue
-
-                done += 1
+                register_template(role, path)
+            except ValueError as e:
+                self._error(f"Cannot resume: {e}")
+                return
+
+        items = journal.items()
+        if items is None:
+            # Pipelined runs do not know their items up front: scan again.
+            self._info(f"Rescanning {header.get('source')} to resume")
+            scanner = Scanner(header.get("source", ""), header.get("pattern", "max_*.usd"), header.get("recurse", True))
+            items = await asyncio.get_event_loop().run_in_executor(None, lambda: sorted(scanner.iter_matches()))
+        pending = journal.pending(items)
+        self._info(f"Resuming {journal.path}: {journal.finished_count} finished, {len(pending)} remaining "
+                   f"(options of the interrupted run are used)")
+        opts = dataclasses.replace(journal.options(), resumed=True)
+        scan = (header.get("source", ""), header.get("pattern", "max_*.usd"), header.get("recurse", True))
+        await self._run_build_async(opts, self._make_engine(), items=pending, journal=journal,
+                                    scan=scan, resumed=True)
+
+    # ---------- Job Queue ----------
+    def _ui_int(self, field_name: str, default: int, minimum: int = 0) -> int:
+        """Value of an IntField, or `default` while the window is not built (queue resumed at startup)."""
+        f = getattr(self, field_name, None)
+        return max(minimum, f.model.get_value_as_int() if f is not None else default)
+
+    def _refresh_queue_view(self):
+        if self._queue_label:
+            self._queue.refresh()   # other processes (CLI) may have changed it
+            jobs = self._queue.jobs
+            self._queue_label.text = "\n".join(j.describe() for j in jobs) if jobs else "Queue is empty"
+
+    def _on_queue_add_clicked(self):
+        """Queue the current Source / Output settings as one job."""
+        inputs = self._read_scan_inputs()
+        if inputs is None:
+            return
+        url, pattern, recurse = inputs
+        out_root = self._out_root_field.model.get_value_as_string().strip()
+        if not out_root:
+            self._error("Please enter an Output Root URL")
+            return
+        job = self._queue.add(make_job(url, pattern, recurse, self._read_build_options(out_root),
+                                       registered_templates()))
+        self._info(f"Queued {job.id}: {url} -> {out_root} ({len(self._queue.queued())} waiting)")
+        self._refresh_queue_view()
+
+    def _on_queue_clear_clicked(self):
+        self._info(f"Removed {self._queue.clear((DONE, FAILED))} finished jobs from the queue")
+        self._refresh_queue_view()
+
+    def _on_queue_run_clicked(self):
+        pool_idx = self._pool_combo.model.get_item_value_model().get_value_as_int()
+        self._queue.configure(settings=dict(workers=self._ui_int("_workers_field", 0),
+                                            pool=MODE_PROCESSES if pool_idx == 1 else MODE_THREADS,
+                                            concurrency=self._ui_int("_concurrency_field", 1, 1),
+                                            io_cap=self._ui_int("_io_cap_field", 0)))
+        self._start_build_task(self._run_queue_async())
+
+    async def _run_queue_async(self):
+        """Run queued jobs until none is left, `concurrency` at a time."""
+        q = self._queue
+        if not q.queued():
+            self._warn("The build queue is empty (use Add to queue)")
+            return
+        st = q.settings
+        concurrency = max(1, int(st.get("concurrency", 1)))
+        io_cap = int(st.get("io_cap", 0))
+        mode = st.get("pool", MODE_THREADS)
+        slots = threading.BoundedSemaphore(io_cap) if io_cap > 0 else None
+        group = EngineGroup()
+        q.configure(autorun=True)
+        self._engine = group
+        if concurrency > 1:
+            self._log.open(log_path())  # jobs side by side share one log file
+        self._info(f"Running {len(q.queued())} queued jobs, {concurrency} at a time ({mode})"
+                   + (f", at most {io_cap} items in flight" if slots is not None else ""))
+        running = set()
+        try:
+            while True:
+                while len(running) < concurrency and not group.cancelled:
+                    job = q.take()
+                    if job is None:
+                        break
+                    running.add(asyncio.ensure_future(
+                        self._run_job_async(job, group, slots, mode, own_log=concurrency == 1)))
+                    self._refresh_queue_view()
+                if not running:
+                    break
+                _finished, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                self._refresh_queue_view()
+        except asyncio.CancelledError:
+            group.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        finally:
+            self._engine = None
+            if self._pause_btn:
+                self._pause_btn.text = "Pause"
+            # Stopped by Kit shutting down: the queue carries on next session; cancelled or drained: it waits.
+            q.configure(autorun=self._shutting_down and bool(q.queued()))
+            self._refresh_queue_view()
+        states = [j.state for j in q.jobs]
+        self._info(f"Queue finished: {states.count(DONE)} jobs done, {states.count(FAILED)} failed, "
+                   f"{len(q.queued())} still queued")
+
+    async def _run_job_async(self, job: BuildJob, group: EngineGroup, slots, mode: str, own_log: bool = True):
+        """One queued job: resume its interrupted run from the journal, or scan and build it."""
+        engine = BuildEngine(workers=int(self._queue.settings.get("workers", 0)), mode=mode,
+                             slots=slots, templates=job.templates)
+        group.add(engine)
+        counts = {}
+        try:
+            journal, resumed = job.journal()
+            scan = (job.source, job.pattern, job.recurse)
+            items = journal.items() if resumed else None
+            if items is None:
+                self._info(f"{job.id}: scanning {job.source}")
+                scanner = Scanner(*scan)
+                items = await asyncio.get_event_loop().run_in_executor(None, lambda: sorted(scanner.iter_matches()))
+            if resumed:
+                items = journal.pending(items)
+                self._info(f"{job.id}: resuming {journal.path}, {len(items)} remaining")
+            else:
+                journal = BuildJournal(job.out_root)
+            self._info(f"{job.id}: building {job.source} -> {job.out_root}")
+            counts = await self._run_build_async(dataclasses.replace(job.options(), resumed=resumed), engine,
+                                                 items=items, journal=journal, scan=scan, resumed=resumed,
+                                                 control=group, own_log=own_log)
+            self._queue.finish(job, counts, cancelled=engine.cancelled,
+                               error="build aborted (see the log)" if counts.get("aborted") else "")
+        except asyncio.CancelledError:
+            self._queue.finish(job, counts, cancelled=True)
+            raise
+        except Exception as e:
+            self._error(f"{job.id} failed: {e}")
+            traceback.print_exc()
+            self._queue.finish(job, counts, error=str(e))
+        finally:
+            group.discard(engine)
+
+    def _make_engine(self) -> BuildEngine:
+        workers = self._workers_field.model.get_value_as_int()
+        pool_idx = self._pool_combo.model.get_item_value_model().get_value_as_int()
+        return BuildEngine(workers=workers, mode=MODE_PROCESSES if pool_idx == 1 else MODE_THREADS)
+
+    async def _run_build_async(self, opts: BuildOptions, engine: BuildEngine, items: Optional[List[str]] = None,
+                               feed: Optional[ScanFeed] = None, journal: Optional[BuildJournal] = None,
+                               scan=("", "", True), resumed: bool = False,
+                               control: Optional[EngineGroup] = None, own_log: bool = True) -> dict:
+        """Build `items` (or whatever `feed` discovers), journaling every finished item.
+
+        Queue runs pass their `control` (what Pause / Cancel act on) and keep
+        one log file for all jobs (`own_log=False`). Returns the item counts
+        ("aborted" is 1 when the run stopped on an error).
+        """
+        out_root = opts.out_root
+        manifest = BuildManifest.load(out_root) if opts.incremental else None
+        counts = {"finished": 0, "done": 0, "skipped": 0, "failed": 0, "cancelled": 0, "aborted": 0}
+        totals = {}
+        self._engine = control if control is not None else engine
+        if own_log:
+            self._log.open(log_path(out_root))
+        report = BuildReport(out_root, engine.workers, engine.mode)
+        meter = RateMeter()
+        if feed is None and self._scan_seconds is not None and not resumed and control is None:
+            report.set_scan(self._scan_seconds, len(self._found))
+
+        def _total() -> int:
+            return feed.discovered if feed is not None else len(items)
+
+        self._progress(0, _total())
+        if feed is not None:
+            self._info(f"Scanning {scan[0]} and building with {engine.workers} {engine.mode} workers")
+            self._scanner = feed.scanner
+            feed.start()
+            run_items = feed
+        else:
+            self._info(f"Building {_total()} items with {engine.workers} {engine.mode} workers")
+            run_items = items
+            try:
+                # One stat/create round trip per folder on Nucleus: keep it off the UI loop.
+                made = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: create_output_dirs(plan_output_dirs(items, opts), engine.io_cache))
+                self._info(f"Prepared {made} output folders")
             except Exception as e:
-                self._error(f"Failed: {src} -> {e}")
-                traceback.print_exc()
-            finally:
-                self._progress(i, n)
-                # Yield control to let UI redraw!
-                await omni.kit.app.get_app().next_update_async()
+                self._warn(f"Output folder planning failed, folders will be created per item: {e}")
 
-        self._info(f"Done {done}/{n}; Skipped: {skipped} (exists & overwrite=off)")
\ No newline at end of file
+        if journal is not None:
+            try:
+                if resumed:
+                    journal.resume()
+                else:
+                    journal.begin(opts, *scan, items=items, templates=engine.run_templates())
+            except OSError as e:
+                self._warn(f"Run journal unavailable, this run cannot be resumed: {e}")
+                journal = None
+
+        def _on_result(res: ItemResult):
+            self._log.item(res)
+            counts["finished"] += 1
+            counts[res.status if res.status in counts else "failed"] += 1
+            for k, v in res.stats.items():
+                totals[k] = totals.get(k, 0) + v
+            if journal is not None:
+                journal.record(res)
+            report.add(res)
+            if manifest is not None and res.manifest_entry:
+                manifest.update(res.src, res.manifest_entry)
+                # Checkpoint periodically so a crash keeps most of the record.
+                if counts["finished"] % 100 == 0:
+                    manifest.save()
+
+        def _on_progress():
+            # Throttled by the engine (at most every "UI refresh" ms), not once per item.
+            meter.update(counts["finished"])
+            self._progress(counts["finished"], _total(), meter)
+            self._refresh_log_view()
+            if feed is not None and self._count_label:
+                state = "found" if feed.finished else "found, scanning..."
+                self._count_label.text = f"{feed.discovered} {state}"
+
+        completed = False
+        try:
+            await engine.run_async(run_items, opts, _on_result, manifest=manifest,
+                                   journal=journal, on_progress=_on_progress,
+                                   frame_budget_ms=self._ui_int("_budget_field", 8, 1),
+                                   progress_ms=self._ui_int("_refresh_field", 100, 16),
+                                   next_frame=omni.kit.app.get_app().next_update_async)
+            completed = (feed is None or feed.error is None) and not engine.cancelled
+        except Exception as e:
+            counts["aborted"] = 1
+            self._error(f"Build aborted: {e}")
+            traceback.print_exc()
+        finally:
+            if control is None:
+                self._engine = None
+            if self._pause_btn and control is None:
+                self._pause_btn.text = "Pause"
+            if manifest is not None and manifest.dirty and not manifest.save():
+                self._error(f"Could not write build manifest: {manifest.path}")
+            if journal is not None:
+                # Failed items keep the run resumable; Resume retries them from their last stage.
+                journal.close(completed=completed and not counts["failed"])
+            if feed is not None:
+                feed.close()
+                self._scanner = None
+                self._found = sorted(feed.found)
+                self._scan_root = scan[0]
+                if feed.error is not None:
+                    self._error(f"Scan failed: {feed.error}")
+                if self._count_label:
+                    self._count_label.text = f"Found: {feed.discovered} items"
+                if feed.seconds is not None:
+                    report.set_scan(feed.seconds, feed.discovered)
+
+        n = _total()
+
+        reason = "up to date" if opts.incremental else "exists & overwrite=off"
+        self._info(f"Done {counts['done']}/{n}; Skipped: {counts['skipped']} ({reason})")
+        if engine.cancelled:
+            self._warn(f"Build cancelled after {counts['finished']}/{n} items ({counts['cancelled']} stopped mid-item)"
+                       + ("; press Resume to continue" if journal is not None else ""))
+        if journal is not None and counts["failed"]:
+            self._warn(f"{counts['failed']} items failed; press Resume to retry them")
+        if opts.overwrite and totals.get("sync_skipped"):
+            self._info(f"Sync: {totals['sync_skipped']} unchanged files kept "
+                       f"({totals.get('sync_bytes_skipped', 0) / (1 << 20):.1f} MB not transferred)")
+        if opts.dependency_copy:
+            self._info(f"Dependencies: {totals.get('deps_copied', 0)} files copied")
+            if totals.get("deps_missing"):
+                self._warn(f"{totals['deps_missing']} missing dependencies (listed above and in the build report)")
+        if opts.dedup_materials:
+            self._info(f"Materials dedup: {totals.get('dedup_hits', 0)} duplicate files, "
+                       f"{totals.get('dedup_bytes_saved', 0) / (1 << 20):.1f} MB saved, "
+                       f"{totals.get('bytes_copied', 0) / (1 << 20):.1f} MB copied")
+
+        report.finish()
+        for line in report.table():
+            self._info(line)
+        path = await asyncio.get_event_loop().run_in_executor(None, report.write)
+        if path:
+            self._info(f"Build report: {path}")
+        else:
+            self._warn(f"Could not write build report under {out_root}")
+        if own_log:
+            self._log.flush()
+            self._info(f"Build log: {self._log.path}")
+        self._refresh_log_view()
+        return counts
@@ -0,0 +1,114 @@
+# SmartAssetsBuilder — iocache.py
+# Run-scoped metadata cache for stat / directory-existence / listing lookups.
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+KIND_FILE = "file"
+KIND_DIR = "dir"
+KIND_MISSING = "missing"
+
+
+def _key(p: str) -> str:
+    if "://" in p:
+        return p.rstrip("/")
+    return os.path.normcase(os.path.abspath(p))
+
+
+def _parents(key: str) -> List[str]:
+    """All ancestors of a normalized key, nearest first (stops at the server root / drive)."""
+    out = []
+    if "://" in key:
+        scheme, rest = key.split("://", 1)
+        segs = rest.split("/")
+        for i in range(len(segs) - 1, 1, -1):
+            out.append(f"{scheme}://" + "/".join(segs[:i]))
+        return out
+    cur = os.path.dirname(key)
+    while cur and cur != key:
+        out.append(cur)
+        key, cur = cur, os.path.dirname(cur)
+    return out
+
+
+class IOCache:
+    """Remembers what exists where for the duration of one build run.
+
+    Answers are assumed stable during a run; the pipeline keeps the cache
+    current for everything it writes, creates or deletes itself. Safe to share
+    between worker threads.
+    """
+
+    def __init__(self, known_dirs: Iterable[str] = ()):
+        self._kinds: Dict[str, str] = {}
+        self._listings: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        for d in known_dirs:
+            self.mark_dir(d)
+
+    # ---------- stat results ----------
+    def kind(self, p: str) -> Optional[str]:
+        """Cached kind of `p` (KIND_*), or None if it was never looked up."""
+        k = self._kinds.get(_key(p))
+        with self._lock:
+            if k is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return k
+
+    def set_kind(self, p: str, kind: str) -> None:
+        if kind == KIND_DIR:
+            self.mark_dir(p)
+        elif kind == KIND_FILE:
+            self.mark_file(p)
+        else:
+            self.mark_missing(p)
+
+    def mark_dir(self, p: str) -> None:
+        key = _key(p)
+        with self._lock:
+            self._kinds[key] = KIND_DIR
+            for parent in _parents(key):
+                if self._kinds.get(parent) == KIND_DIR:
+                    break
+                self._kinds[parent] = KIND_DIR
+
+    def mark_file(self, p: str) -> None:
+        key = _key(p)
+        with self._lock:
+            self._kinds[key] = KIND_FILE
+            for parent in _parents(key):
+                if self._kinds.get(parent) == KIND_DIR:
+                    break
+                self._kinds[parent] = KIND_DIR
+            # The parent listing (if cached) no longer reflects this entry.
+            parents = _parents(key)
+            if parents:
+                self._listings.pop(parents[0], None)
+
+    def mark_missing(self, p: str) -> None:
+        key = _key(p)
+        with self._lock:
+            self._kinds[key] = KIND_MISSING
+            parents = _parents(key)
+            if parents:
+                self._listings.pop(parents[0], None)
+
+    # ---------- directory listings ----------
+    def listing(self, p: str) -> Optional[list]:
+        return self._listings.get(_key(p))
+
+    def set_listing(self, p: str, entries: list) -> None:
+        with self._lock:
+            self._listings[_key(p)] = entries
+
+    def known_dirs(self) -> List[str]:
+        return [k for k, v in self._kinds.items() if v == KIND_DIR]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._kinds), "listings": len(self._listings)}
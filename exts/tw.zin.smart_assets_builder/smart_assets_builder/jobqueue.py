@@ -0,0 +1,370 @@
+# SmartAssetsBuilder — jobqueue.py
+# Persistent queue of build jobs: each job is one source root / pattern built into
+# one output root with its own options (ID suffix, material override, ...). The
+# queue lives in ~/.smart_assets_builder/queue.json, so queued jobs survive a Kit
+# restart, and a job interrupted mid-run resumes through its output's run journal.
+#
+# Jobs run one after another, or several at once on process pools, with one
+# semaphore capping the items in flight across all of them (the global I/O cap).
+
+import os
+import json
+import time
+import threading
+import contextlib
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .pipeline import _abs, BuildOptions
+from .journal import STATE_DIR, BuildJournal, options_to_dict, options_from_dict
+
+QUEUE_VERSION = 1
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+JOB_STATES = (QUEUED, RUNNING, DONE, FAILED)
+
+
+_LOCK_TIMEOUT_S = 30.0   # give up waiting for another process's edit
+_LOCK_STALE_S = 60.0     # a lock file this old was left by a crashed process
+
+
+def queue_path() -> str:
+    return os.path.join(STATE_DIR, "queue.json")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether process `pid` still runs (os.kill(pid, 0) would terminate it on Windows)."""
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)   # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and code.value == 259                # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+@dataclass
+class BuildJob:
+    """One source root built into one output root; `opts` is a serialized BuildOptions."""
+    id: str
+    source: str
+    pattern: str = "max_*.usd"
+    recurse: bool = True
+    opts: dict = field(default_factory=dict)
+    templates: Dict[str, str] = field(default_factory=dict)
+    state: str = QUEUED
+    added: float = 0.0
+    started: float = 0.0
+    ended: float = 0.0
+    runs: int = 0                                          # times started (> 0: may resume its journal)
+    owner: int = 0                                         # pid of the process running it
+    counts: Dict[str, int] = field(default_factory=dict)   # done / skipped / failed of the last run
+    message: str = ""
+
+    @property
+    def out_root(self) -> str:
+        return self.opts.get("out_root", "")
+
+    def options(self) -> BuildOptions:
+        return options_from_dict(self.opts)
+
+    def journal(self) -> Tuple[BuildJournal, bool]:
+        """The job's run journal, and whether it holds an interrupted run of this job to resume."""
+        journal = BuildJournal.load(self.out_root)
+        h = journal.header or {}
+        resumed = (self.runs > 0 and journal.resumable and h.get("source") == self.source
+                   and h.get("pattern") == self.pattern)
+        return journal, resumed
+
+    def describe(self) -> str:
+        n = self.counts
+        tail = f"  {n.get('done', 0)} built, {n.get('skipped', 0)} skipped, {n.get('failed', 0)} failed" if n else ""
+        note = f"  ({self.message})" if self.message else ""
+        return f"{self.id} [{self.state}] {self.source} ({self.pattern}) -> {self.out_root}{tail}{note}"
+
+
+def make_job(source: str, pattern: str, recurse: bool, opts: BuildOptions,
+             templates: Optional[Dict[str, str]] = None) -> BuildJob:
+    """A job for the queue (its id is assigned by `JobQueue.add`)."""
+    return BuildJob("", source, pattern, recurse, options_to_dict(dataclasses.replace(opts, resumed=False)),
+                    dict(templates or {}))
+
+
+class JobQueue:
+    """Build jobs in order, shared through `queue.json` by every process using it.
+
+    Each change (`add`, `remove`, `requeue`, `clear`, `take`, `finish`,
+    `configure`) holds `queue.json.lock`, re-reads the file, applies itself
+    to the job it names and writes the file back, so a `queue add` from
+    another shell is never lost to a runner's stale copy. `take()` hands out
+    the next queued job and marks it running with this process as `owner`
+    (never two at once for the same output root: they would share its journal
+    and manifest); another runner skips it. A running job whose owner process
+    is gone (Kit or the CLI died) is queued again and resumes from its journal,
+    as does a job cancelled mid-run. `settings` (workers, pool, concurrency,
+    I/O cap) and `autorun` are kept so Kit can pick the queue up after a restart.
+    `jobs` is the state as of the last read (`refresh()`).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or queue_path()
+        self.jobs: List[BuildJob] = []
+        self.settings: dict = {}
+        self.autorun = False
+        self._next_id = 1
+        self._lock = threading.RLock()   # threads of this process; the lock file covers other processes
+
+    # ---------- Reading ----------
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "JobQueue":
+        """Read the queue; a missing or unreadable file gives an empty one."""
+        q = cls(path)
+        q.refresh()
+        return q
+
+    def refresh(self) -> None:
+        """Re-read the file (written atomically, so no lock is needed to read it)."""
+        with self._lock:
+            self._read()
+
+    def get(self, job_id: str) -> Optional[BuildJob]:
+        with self._lock:
+            return next((j for j in self.jobs if j.id == job_id), None)
+
+    def queued(self) -> List[BuildJob]:
+        with self._lock:
+            self._read()
+            return [j for j in self.jobs if j.state == QUEUED]
+
+    @property
+    def running(self) -> int:
+        """Jobs this process is running."""
+        with self._lock:
+            return sum(1 for j in self.jobs if j.state == RUNNING and j.owner == os.getpid())
+
+    # ---------- Editing ----------
+    def add(self, job: BuildJob) -> BuildJob:
+        with self._edit():
+            job.id = f"job{self._next_id}"
+            self._next_id += 1
+            job.state, job.added, job.owner = QUEUED, time.time(), 0
+            self.jobs.append(job)
+        return job
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a job that is not running; False if there is no such job or it is running."""
+        with self._edit():
+            job = self.get(job_id)
+            if job is None or job.state == RUNNING:
+                return False
+            self.jobs.remove(job)
+            return True
+
+    def requeue(self, job_id: str) -> bool:
+        """Queue a finished (or failed) job again; its next run resumes or rebuilds as its journal says."""
+        with self._edit():
+            job = self.get(job_id)
+            if job is None or job.state == RUNNING:
+                return False
+            job.state, job.message = QUEUED, ""
+            return True
+
+    def clear(self, states: Iterable[str] = (DONE, FAILED)) -> int:
+        """Drop the jobs in `states` (running jobs stay); returns how many were dropped."""
+        states = set(states) - {RUNNING}
+        with self._edit():
+            keep = [j for j in self.jobs if j.state not in states]
+            dropped = len(self.jobs) - len(keep)
+            self.jobs = keep
+            return dropped
+
+    def configure(self, settings: Optional[dict] = None, autorun: Optional[bool] = None) -> None:
+        """Update the run settings and / or the autorun flag."""
+        with self._edit():
+            if settings:
+                self.settings.update(settings)
+            if autorun is not None:
+                self.autorun = autorun
+
+    # ---------- Running ----------
+    def take(self) -> Optional[BuildJob]:
+        """Mark the next runnable queued job as running here and return it (None: nothing to start now)."""
+        with self._edit():
+            busy = {_abs(j.out_root) for j in self.jobs if j.state == RUNNING}
+            for job in self.jobs:
+                if job.state == QUEUED and _abs(job.out_root) not in busy:
+                    job.state, job.owner, job.started, job.message = RUNNING, os.getpid(), time.time(), ""
+                    job.runs += 1
+                    return job
+            return None
+
+    def finish(self, job: BuildJob, counts: Optional[Dict[str, int]] = None,
+               cancelled: bool = False, error: str = "") -> None:
+        """Record the end of a job's run: cancelled runs are queued again, failures are kept."""
+        job.ended = time.time()
+        job.owner = 0
+        job.counts = {k: int(v) for k, v in (counts or {}).items() if k in ("done", "skipped", "failed")}
+        if cancelled:
+            job.state, job.message = QUEUED, "interrupted, resumes from its journal"
+        elif error or job.counts.get("failed"):
+            job.state, job.message = FAILED, error or f"{job.counts['failed']} items failed"
+        else:
+            job.state, job.message = DONE, ""
+        with self._edit():
+            # The caller's copy is authoritative for its own run; the rest comes from the file.
+            self.jobs = [job if j.id == job.id else j for j in self.jobs]
+
+    # ---------- File ----------
+    @contextlib.contextmanager
+    def _edit(self):
+        """Read-modify-write under the queue lock file."""
+        with self._lock:
+            lock = self._acquire_file_lock()
+            try:
+                self._read()
+                yield
+                self._write()
+            finally:
+                try:
+                    os.remove(lock)
+                except OSError:
+                    pass
+
+    def _acquire_file_lock(self) -> str:
+        lock = self.path + ".lock"
+        os.makedirs(os.path.dirname(lock) or ".", exist_ok=True)
+        deadline = time.time() + _LOCK_TIMEOUT_S
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._lock_is_stale(lock):
+                    try:
+                        os.remove(lock)
+                    except OSError:
+                        pass
+                    continue
+                if time.time() > deadline:
+                    raise TimeoutError(f"Build queue is locked: {lock}")
+                time.sleep(0.02)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return lock
+
+    @staticmethod
+    def _lock_is_stale(lock: str) -> bool:
+        """A lock left behind by a process that died mid-edit (edits take milliseconds)."""
+        try:
+            with open(lock, "r", encoding="utf-8") as f:
+                pid = int(f.read().strip() or 0)
+            age = time.time() - os.path.getmtime(lock)
+        except (OSError, ValueError):
+            return False  # being written / just removed: look again
+        return (pid and not _pid_alive(pid)) or age > _LOCK_STALE_S
+
+    def _read(self) -> None:
+        self.jobs, self.settings, self.autorun, self._next_id = [], {}, False, 1
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != QUEUE_VERSION:
+            return
+        known = {f.name for f in dataclasses.fields(BuildJob)}
+        for rec in data.get("jobs") or []:
+            try:
+                job = BuildJob(**{k: v for k, v in rec.items() if k in known})
+            except TypeError:
+                continue
+            if job.state == RUNNING and not (job.owner and _pid_alive(job.owner)):
+                # Its Kit / CLI process is gone: queue it again, it resumes from the journal.
+                job.state, job.owner, job.message = QUEUED, 0, "interrupted, resumes from its journal"
+            self.jobs.append(job)
+        self.settings = dict(data.get("settings") or {})
+        self.autorun = bool(data.get("autorun"))
+        self._next_id = int(data.get("next_id") or len(self.jobs) + 1)
+
+    def _write(self) -> bool:
+        """Write the queue atomically (temp file + rename); False if it could not be written."""
+        data = {"version": QUEUE_VERSION, "next_id": self._next_id, "autorun": self.autorun,
+                "settings": self.settings, "jobs": [dataclasses.asdict(j) for j in self.jobs]}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            return True
+        except OSError:
+            return False
+
+
+class EngineGroup:
+    """Pause / resume / cancel fanned out to the engines of the jobs running now.
+
+    Same control surface as `BuildEngine`, so the window's Pause / Cancel
+    buttons drive a whole queue run; engines added later inherit the state.
+    """
+
+    def __init__(self):
+        self._engines = set()
+        self._lock = threading.Lock()
+        self._paused = False
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def paused(self) -> bool:
+        return self._paused and not self._cancelled
+
+    def add(self, engine) -> None:
+        with self._lock:
+            if self._cancelled:
+                engine.cancel()
+            elif self._paused:
+                engine.pause()
+            self._engines.add(engine)
+
+    def discard(self, engine) -> None:
+        with self._lock:
+            self._engines.discard(engine)
+
+    def pause(self) -> None:
+        with self._lock:
+            self._paused = True
+            for e in self._engines:
+                e.pause()
+
+    def resume(self) -> None:
+        with self._lock:
+            self._paused = False
+            for e in self._engines:
+                e.resume()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            for e in self._engines:
+                e.cancel()
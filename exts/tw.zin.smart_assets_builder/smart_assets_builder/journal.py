@@ -0,0 +1,241 @@
+# SmartAssetsBuilder — journal.py
+# Append-only run journal: what a build run set out to do and which items (and
+# stages of items) it finished, so an interrupted run can be resumed.
+#
+# One JSON record per line:
+#   {"t": "run", ...}     start of a run: source, pattern, options, item list
+#   {"t": "resume", ...}  a later session picked the run up again
+#   {"t": "stage", ...}   one completed stage of an item, appended by the worker
+#   {"t": "item", ...}    one finished item: status and completed stages
+#   {"t": "end", ...}     the run went through every item (nothing to resume)
+# A torn last line (crash mid-write) is ignored on load. Stage records come from
+# the workers (threads or processes) through their own O_APPEND handle, so a crash
+# keeps every stage finished before it; the item record, written later by the
+# run, is authoritative (a cancelled item's rolled-back stages drop out again).
+
+import os
+import json
+import time
+import hashlib
+import threading
+import dataclasses
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .pipeline import _is_ov_url, _abs, _mark_written, BuildOptions, ItemResult, STAGES
+
+JOURNAL_NAME = ".smart_assets_builder.journal.jsonl"
+JOURNAL_VERSION = 1
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".smart_assets_builder")
+
+_FSYNC_EVERY = 64   # records between fsyncs; every record is flushed to the OS
+
+
+def journal_path(out_root: str) -> str:
+    """Local journal file for `out_root` (Nucleus roots keep theirs under ~/.smart_assets_builder)."""
+    if _is_ov_url(out_root):
+        digest = hashlib.sha1(out_root.rstrip("/").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(STATE_DIR, "journals", f"{digest}.jsonl")
+    return os.path.join(_abs(out_root), JOURNAL_NAME)
+
+
+def options_to_dict(opts: BuildOptions) -> dict:
+    return dataclasses.asdict(opts)
+
+
+def options_from_dict(data: dict) -> BuildOptions:
+    known = {f.name for f in dataclasses.fields(BuildOptions)}
+    return BuildOptions(**{k: v for k, v in data.items() if k in known})
+
+
+class BuildJournal:
+    """Progress record of one build run under an output root.
+
+    `begin()` starts a new run (replacing any previous journal); `record()`
+    appends one finished item; `close(completed=True)` marks the run as done.
+    `load()` reads a journal back so the caller can resume: `pending()` drops
+    finished items and `stages_of()` tells `build_item` which stages of a
+    partially built item to skip. While a run is being written, `StageLog(path)`
+    lets workers add each stage they complete.
+    """
+
+    def __init__(self, out_root: str):
+        self.out_root = out_root
+        self.path = journal_path(out_root)
+        self.header: Optional[dict] = None
+        self.ended = False
+        self._finished: Dict[str, str] = {}               # key -> 'done' / 'skipped'
+        self._stages: Dict[str, Tuple[str, ...]] = {}     # key -> completed stages
+        self._fh = None
+        self._unsynced = 0
+
+    # ---------- Reading ----------
+    @classmethod
+    def load(cls, out_root: str) -> "BuildJournal":
+        """Read the journal for `out_root`; missing or unreadable files give an empty one."""
+        j = cls(out_root)
+        try:
+            with open(j.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return j
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn write
+            kind = rec.get("t")
+            if kind == "run":
+                if rec.get("version") != JOURNAL_VERSION:
+                    return cls(out_root)
+                j.header, j.ended = rec, False
+                j._finished.clear()
+                j._stages.clear()
+            elif kind == "stage" and rec.get("src") and rec.get("stage") in STAGES:
+                key = _abs(rec["src"])
+                if key not in j._finished and rec["stage"] not in j._stages.get(key, ()):
+                    j._stages[key] = j._stages.get(key, ()) + (rec["stage"],)
+            elif kind == "item" and rec.get("src"):
+                key = _abs(rec["src"])
+                if rec.get("status") in ("done", "skipped"):
+                    j._finished[key] = rec["status"]
+                    j._stages.pop(key, None)
+                else:
+                    j._stages[key] = tuple(rec.get("stages") or ())
+            elif kind == "end":
+                j.ended = True
+        return j
+
+    @property
+    def resumable(self) -> bool:
+        """True when a run was started here and never reached its end."""
+        return self.header is not None and not self.ended
+
+    @property
+    def finished_count(self) -> int:
+        return len(self._finished)
+
+    def options(self) -> BuildOptions:
+        return options_from_dict(self.header.get("opts") or {"out_root": self.out_root})
+
+    def items(self) -> Optional[List[str]]:
+        """Items listed when the run started (None for pipelined runs: rescan instead)."""
+        return self.header.get("items") if self.header else None
+
+    def is_finished(self, src: str) -> bool:
+        return _abs(src) in self._finished
+
+    def stages_of(self, src: str) -> Tuple[str, ...]:
+        return self._stages.get(_abs(src), ())
+
+    def pending(self, items: Iterable[str]) -> List[str]:
+        return [s for s in items if _abs(s) not in self._finished]
+
+    @property
+    def writing(self) -> bool:
+        """True between `begin()` / `resume()` and `close()`."""
+        return self._fh is not None
+
+    # ---------- Writing ----------
+    def begin(self, opts: BuildOptions, source: str = "", pattern: str = "", recurse: bool = True,
+              items: Optional[List[str]] = None, templates: Optional[Dict[str, str]] = None) -> None:
+        """Start a new run, replacing whatever was journaled before."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.close()
+        self._finished.clear()
+        self._stages.clear()
+        self.ended = False
+        self.header = {"t": "run", "version": JOURNAL_VERSION, "started": time.time(),
+                       "source": source, "pattern": pattern, "recurse": recurse,
+                       "opts": options_to_dict(opts), "templates": dict(templates or {}),
+                       "items": list(items) if items is not None else None}
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        # Append mode: workers append stage records to the same file (see StageLog).
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._write(self.header, sync=True)
+
+    def resume(self) -> None:
+        """Continue appending to the loaded run."""
+        torn = False
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+        except OSError:
+            pass
+        self._fh = open(self.path, "a", encoding="utf-8")
+        if torn:
+            self._fh.write("\n")  # keep the torn record on its own (ignored) line
+        self._write({"t": "resume", "started": time.time(), "finished": len(self._finished)}, sync=True)
+
+    def record(self, res: ItemResult) -> None:
+        key = _abs(res.src)
+        if res.status in ("done", "skipped"):
+            self._finished[key] = res.status
+            self._stages.pop(key, None)
+        else:
+            self._stages[key] = tuple(res.stages)
+        self._write({"t": "item", "src": res.src, "status": res.status, "stages": list(res.stages)})
+
+    def close(self, completed: bool = False) -> None:
+        if self._fh is None:
+            return
+        if completed:
+            self.ended = True
+            self._write({"t": "end", "ts": time.time(), "finished": len(self._finished)})
+        try:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        except OSError:
+            pass
+        self._fh.close()
+        self._fh = None
+        _mark_written(self.path)
+
+    def _write(self, rec: dict, sync: bool = False) -> None:
+        if self._fh is None:
+            return
+        self._fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= _FSYNC_EVERY:
+            try:
+                os.fsync(self._fh.fileno())
+            except OSError:
+                pass
+            self._unsynced = 0
+
+
+class StageLog:
+    """Appends a `{"t": "stage"}` record to a run journal for each stage a worker completes.
+
+    Process workers build their own from the journal path. Each record is one
+    O_APPEND write, which never interleaves with the run's own records.
+    Write errors are ignored: the item record written by the run still lands.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, src: str, stage: str) -> None:
+        data = (json.dumps({"t": "stage", "src": src, "stage": stage}, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+                os.write(self._fd, data)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+                self._fd = None
@@ -0,0 +1,168 @@
+# SmartAssetsBuilder — logsink.py
+# Buffered, leveled log sink: records go to a JSON-lines file on a timer instead
+# of one console print per line, only warnings and errors reach the console, and
+# the window filters recent records by level without parsing "[ERROR]" strings.
+#
+# One JSON record per line:
+#   {"ts": ..., "level": "INFO", "msg": "..."}                       a UI / run message
+#   {"ts": ..., "level": "WARN", "t": "item", "src": ..., "status": ...,
+#    "lines": [["INFO", "..."], ...], "timings": {...}}               one finished item
+
+import os
+import json
+import time
+import hashlib
+import threading
+import collections
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .pipeline import _is_ov_url, _abs, ItemResult
+from .journal import STATE_DIR
+
+LOG_NAME = "smart_assets_builder.log.jsonl"
+LEVELS = ("INFO", "WARN", "ERROR")
+_RANK = {lvl: i for i, lvl in enumerate(LEVELS)}
+
+
+def log_path(out_root: str = "") -> str:
+    """Log file of a run next to its output (Nucleus roots and the session log under ~/.smart_assets_builder)."""
+    if not out_root:
+        return os.path.join(STATE_DIR, "logs", "session.jsonl")
+    if _is_ov_url(out_root):
+        digest = hashlib.sha1(out_root.rstrip("/").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(STATE_DIR, "logs", f"{digest}.jsonl")
+    return os.path.join(_abs(out_root), LOG_NAME)
+
+
+def _rank(level: str) -> int:
+    return _RANK.get(level, 0)
+
+
+class LogSink:
+    """Leveled records, buffered in memory and appended to `path` by a timer thread.
+
+    `log()` / `item()` only append to a buffer (thread-safe); the writer thread
+    flushes it every `flush_s` seconds, or sooner once `max_buffer` records wait.
+    Records at or above `console_level` are also printed right away. The last
+    `keep` lines, and separately the last `keep` warnings and errors (so a flood
+    of INFO lines cannot push them out), stay in memory for the log view (`lines()`).
+    """
+
+    def __init__(self, path: Optional[str] = None, console_level: str = "WARN", flush_s: float = 1.0,
+                 max_buffer: int = 5000, keep: int = 2000,
+                 echo: Callable[[str], None] = print, prefix: str = "[SmartAssetsBuilder]"):
+        self.path = path or log_path()
+        self.console_level = console_level
+        self.flush_s = flush_s
+        self.max_buffer = max_buffer
+        self.echo = echo
+        self.prefix = prefix
+        self.counts: Dict[str, int] = {lvl: 0 for lvl in LEVELS}
+        self._pending: List[dict] = []
+        self._recent: Deque[Tuple[float, str, str]] = collections.deque(maxlen=keep)
+        self._loud: Deque[Tuple[float, str, str]] = collections.deque(maxlen=keep)
+        self._lock = threading.Lock()        # buffer / recent lines
+        self._io_lock = threading.Lock()     # file handle
+        self._fh = None
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SmartAssetsLog", daemon=True)
+        self._thread.start()
+
+    # ---------- Producers (any thread) ----------
+    def log(self, level: str, msg: str, **fields) -> None:
+        rec = {"ts": time.time(), "level": level, "msg": msg, **fields}
+        with self._lock:
+            self.counts[level] = self.counts.get(level, 0) + 1
+            self._remember((rec["ts"], level, msg))
+            self._pending.append(rec)
+            full = len(self._pending) >= self.max_buffer
+        if _rank(level) >= _rank(self.console_level):
+            self.echo(f"{self.prefix} [{level}] {msg}")
+        self._kick(full)
+
+    def item(self, res: ItemResult) -> None:
+        """One record for a finished item; its level is the worst of its lines."""
+        ts = time.time()
+        level = max((lvl for lvl, _txt in res.logs), key=_rank, default="INFO")
+        rec = {"ts": ts, "level": level, "t": "item", "src": res.src, "status": res.status,
+               "lines": [list(line) for line in res.logs],
+               "timings": {k: round(v, 4) for k, v in res.timings.items()}}
+        loud = _rank(self.console_level)
+        with self._lock:
+            for lvl, txt in res.logs:
+                self.counts[lvl] = self.counts.get(lvl, 0) + 1
+                self._remember((ts, lvl, txt))
+            self._pending.append(rec)
+            full = len(self._pending) >= self.max_buffer
+        for lvl, txt in res.logs:
+            if _rank(lvl) >= loud:
+                self.echo(f"{self.prefix} [{lvl}] {txt}")
+        self._kick(full)
+
+    # ---------- Consumers ----------
+    def lines(self, min_level: str = "INFO", limit: int = 200) -> List[Tuple[float, str, str]]:
+        """The newest `limit` (ts, level, text) lines at or above `min_level`, oldest first."""
+        floor = _rank(min_level)
+        with self._lock:
+            pool = self._loud if floor >= _RANK["WARN"] else self._recent
+            picked = [ln for ln in reversed(pool) if _rank(ln[1]) >= floor]
+        return picked[:limit][::-1]
+
+    def open(self, path: str) -> None:
+        """Send the following records to `path` (what is buffered so far goes to the old file)."""
+        self.flush()
+        with self._io_lock:
+            self._close_file()
+            self.path = path
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        data = "".join(json.dumps(rec, separators=(",", ":")) + "\n" for rec in batch)
+        with self._io_lock:
+            try:
+                if self._fh is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._fh = open(self.path, "a", encoding="utf-8")
+                self._fh.write(data)
+                self._fh.flush()
+            except OSError as e:
+                self._close_file()
+                self.echo(f"{self.prefix} [WARN] Log file not writable ({self.path}): {e}")
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+        with self._io_lock:
+            self._close_file()
+
+    # ---------- Internals ----------
+    def _kick(self, full: bool) -> None:
+        if self._closed.is_set():
+            self.flush()  # closed (Kit shutting down): late records are written directly
+        elif full:
+            self._wake.set()
+
+    def _remember(self, line: Tuple[float, str, str]) -> None:
+        self._recent.append(line)
+        if _rank(line[1]) >= _RANK["WARN"]:
+            self._loud.append(line)
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_s)
+            self._wake.clear()
+            self.flush()
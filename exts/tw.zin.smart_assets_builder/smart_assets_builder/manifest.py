@@ -0,0 +1,74 @@
+# SmartAssetsBuilder — manifest.py
+# Persistent build manifest stored next to the output root (incremental builds).
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from .pipeline import _is_ov_url, _join, _abs, _read_bytes, _write_bytes
+
+MANIFEST_NAME = ".smart_assets_builder.manifest.json"
+MANIFEST_VERSION = 1
+
+
+class BuildManifest:
+    """Per-source record of the inputs that produced each output trio.
+
+    Keys are absolute source paths/URLs; values are the entries produced by
+    `pipeline.build_item` (source size/mtime/sha1, Materials fingerprint,
+    material override, id suffix and output paths).
+    """
+
+    def __init__(self, out_root: str, entries: Optional[Dict[str, dict]] = None):
+        self.out_root = out_root
+        self.path = _join(out_root, MANIFEST_NAME)
+        self.entries: Dict[str, dict] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, out_root: str) -> "BuildManifest":
+        """Read the manifest under `out_root`; a missing or unreadable file gives an empty one."""
+        m = cls(out_root)
+        data = _read_bytes(m.path)
+        if not data:
+            return m
+        try:
+            doc = json.loads(data.decode("utf-8"))
+        except Exception:
+            return m
+        if doc.get("version") == MANIFEST_VERSION:
+            m.entries = dict(doc.get("items") or {})
+        return m
+
+    @staticmethod
+    def key(src: str) -> str:
+        return _abs(src)
+
+    def get(self, src: str) -> Optional[dict]:
+        return self.entries.get(self.key(src))
+
+    def update(self, src: str, entry: dict) -> None:
+        entry = dict(entry)
+        entry["recorded"] = time.time()
+        self.entries[self.key(src)] = entry
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def save(self) -> bool:
+        """Write the manifest (atomically for local output roots)."""
+        payload = json.dumps({"version": MANIFEST_VERSION, "items": self.entries},
+                             indent=1, sort_keys=True).encode("utf-8")
+        if _is_ov_url(self.path):
+            ok = _write_bytes(self.path, payload)
+        else:
+            tmp = self.path + ".tmp"
+            ok = _write_bytes(tmp, payload)
+            if ok:
+                os.replace(tmp, self.path)
+        if ok:
+            self._dirty = False
+        return ok
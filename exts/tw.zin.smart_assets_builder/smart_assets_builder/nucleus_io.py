@@ -0,0 +1,411 @@
+# SmartAssetsBuilder — nucleus_io.py
+# Async Nucleus I/O: the client operations the pipeline helpers use (stat, list,
+# copy, read_file, write_file, create_folder, delete) on the omni.client *_async
+# calls, with many requests in flight at once.
+#
+#   IOBackend          one request per call, normalized results
+#     OmniClientBackend   omni.client.*_async (Kit / Nucleus)
+#     LocalBackend        in-process stand-in on a local folder, with simulated
+#                         round-trip latency and bandwidth (offline tests, benchmarks)
+#   AsyncIO            bounds requests in flight, counts calls, batch helpers
+#   IOLoop             runs an AsyncIO on its own event-loop thread so blocking
+#                      worker threads can submit batches to it
+
+import os
+import random
+import shutil
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import omni.client
+except Exception:
+    omni = None
+
+
+@dataclass
+class Entry:
+    """One stat / list result."""
+    name: str
+    is_dir: bool
+    size: int = 0
+    mtime: float = 0.0
+
+
+# ================================= Backends ==================================
+
+class IOBackend:
+    """One request per call. Failures are reported in the result, never raised."""
+
+    name = "base"
+
+    async def stat(self, url: str) -> Optional[Entry]:
+        raise NotImplementedError
+
+    async def list(self, url: str) -> Optional[List[Entry]]:
+        raise NotImplementedError
+
+    async def copy(self, src: str, dst: str, overwrite: bool = True) -> bool:
+        raise NotImplementedError
+
+    async def read_file(self, url: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def write_file(self, url: str, data: bytes) -> bool:
+        raise NotImplementedError
+
+    async def create_folder(self, url: str) -> bool:
+        """True when the folder exists afterwards (created or already there)."""
+        raise NotImplementedError
+
+    async def delete(self, url: str) -> bool:
+        raise NotImplementedError
+
+
+def _entry_of(e, name: str = "") -> Entry:
+    mt = e.modified_time
+    return Entry(name or e.relative_path,
+                 bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN)),
+                 int(e.size or 0), mt.timestamp() if hasattr(mt, "timestamp") else float(mt or 0))
+
+
+class OmniClientBackend(IOBackend):
+    """Nucleus through the omni.client *_async calls."""
+
+    name = "omni.client"
+
+    def __init__(self):
+        if omni is None:
+            raise RuntimeError("omni.client is not available")
+        self._ok = omni.client.Result.OK
+
+    async def stat(self, url):
+        rc, info = await omni.client.stat_async(url)
+        return _entry_of(info, url.rstrip("/").rsplit("/", 1)[-1]) if rc == self._ok else None
+
+    async def list(self, url):
+        rc, entries = await omni.client.list_async(url.rstrip("/"))
+        if rc != self._ok:
+            return None
+        return [_entry_of(e) for e in entries if e.relative_path not in ("", ".", "..")]
+
+    async def copy(self, src, dst, overwrite=True):
+        behaviors = getattr(omni.client, "CopyBehavior", None)
+        behavior = getattr(behaviors, "OVERWRITE" if overwrite else "ERROR_IF_EXISTS", None)
+        try:
+            rc = (await omni.client.copy_async(src, dst, behavior) if behavior is not None
+                  else await omni.client.copy_async(src, dst))
+        except Exception:
+            return False
+        return (rc[0] if isinstance(rc, tuple) else rc) == self._ok
+
+    async def read_file(self, url):
+        res = await omni.client.read_file_async(url)
+        rc, content = res[0], res[-1]  # (result, version, content)
+        return bytes(memoryview(content)) if rc == self._ok else None
+
+    async def write_file(self, url, data):
+        return await omni.client.write_file_async(url, data) == self._ok
+
+    async def create_folder(self, url):
+        rc = await omni.client.create_folder_async(url.rstrip("/"))
+        return rc in (self._ok, omni.client.Result.ERROR_ALREADY_EXISTS)
+
+    async def delete(self, url):
+        return await omni.client.delete_async(url) == self._ok
+
+
+class LocalBackend(IOBackend):
+    """Stand-in server on a local folder, for offline throughput tests.
+
+    `omniverse://host/a/b` maps to `<root>/host/a/b`; plain paths are used as
+    is. Every request waits `latency` seconds (plus up to `jitter`) before it
+    runs, and transfers are paced to `bandwidth_mbps` when set, so pipelining
+    behaves like it does against a remote server. The file work itself runs on
+    the loop's default executor.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str = "", latency: float = 0.0, jitter: float = 0.0, bandwidth_mbps: float = 0.0):
+        self.root = root
+        self.latency = max(0.0, latency)
+        self.jitter = max(0.0, jitter)
+        self.bandwidth_mbps = max(0.0, bandwidth_mbps)
+
+    def path(self, url: str) -> str:
+        if "://" in url:
+            rest = url.split("://", 1)[1].strip("/")
+            return os.path.join(self.root or os.sep, *rest.split("/"))
+        return url
+
+    async def _round_trip(self, nbytes: int = 0) -> None:
+        delay = self.latency + (random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if nbytes and self.bandwidth_mbps:
+            delay += nbytes / (self.bandwidth_mbps * (1 << 20))
+        if delay:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _run(fn, *args):
+        return await asyncio.get_event_loop().run_in_executor(None, fn, *args)
+
+    async def stat(self, url):
+        await self._round_trip()
+        p = self.path(url)
+        try:
+            st = await self._run(os.stat, p)
+        except OSError:
+            return None
+        return Entry(os.path.basename(p.rstrip(os.sep)), os.path.isdir(p), int(st.st_size), float(st.st_mtime))
+
+    async def list(self, url):
+        await self._round_trip()
+
+        def _scan(p):
+            out = []
+            with os.scandir(p) as it:
+                for e in it:
+                    st = e.stat()
+                    out.append(Entry(e.name, e.is_dir(), int(st.st_size), float(st.st_mtime)))
+            return out
+
+        try:
+            return await self._run(_scan, self.path(url))
+        except OSError:
+            return None
+
+    async def copy(self, src, dst, overwrite=True):
+        s, d = self.path(src), self.path(dst)
+        if not overwrite and os.path.exists(d):
+            await self._round_trip()
+            return False
+        try:
+            size = os.path.getsize(s)
+        except OSError:
+            await self._round_trip()
+            return False
+        await self._round_trip(size)
+
+        def _copy():
+            os.makedirs(os.path.dirname(d), exist_ok=True)
+            shutil.copy2(s, d)
+
+        try:
+            await self._run(_copy)
+            return True
+        except OSError:
+            return False
+
+    async def read_file(self, url):
+        p = self.path(url)
+        try:
+            size = os.path.getsize(p)
+        except OSError:
+            await self._round_trip()
+            return None
+        await self._round_trip(size)
+
+        def _read():
+            with open(p, "rb") as f:
+                return f.read()
+
+        try:
+            return await self._run(_read)
+        except OSError:
+            return None
+
+    async def write_file(self, url, data):
+        await self._round_trip(len(data))
+        p = self.path(url)
+
+        def _write():
+            os.makedirs(os.path.dirname(p), exist_ok=True)
+            with open(p, "wb") as f:
+                f.write(data)
+
+        try:
+            await self._run(_write)
+            return True
+        except OSError:
+            return False
+
+    async def create_folder(self, url):
+        await self._round_trip()
+        try:
+            await self._run(lambda: os.makedirs(self.path(url), exist_ok=True))
+            return True
+        except OSError:
+            return False
+
+    async def delete(self, url):
+        await self._round_trip()
+        p = self.path(url)
+
+        def _delete():
+            if os.path.isdir(p):
+                shutil.rmtree(p)
+            else:
+                os.remove(p)
+
+        try:
+            await self._run(_delete)
+            return True
+        except OSError:
+            return False
+
+
+def default_backend() -> Optional[IOBackend]:
+    """The Nucleus backend when omni.client is importable, else None."""
+    return OmniClientBackend() if omni is not None else None
+
+
+# ================================ Front End ==================================
+
+_OPS = ("stat", "list", "copy", "read_file", "write_file", "create_folder", "delete")
+
+
+class AsyncIO:
+    """Keeps up to `max_in_flight` backend requests running at once.
+
+    Single requests are plain coroutines; the `*_many` helpers and
+    `walk` / `copy_tree` issue whole batches and let the bound do the pacing.
+    `calls` counts requests per operation.
+    """
+
+    def __init__(self, backend: IOBackend, max_in_flight: int = 32):
+        self.backend = backend
+        self.max_in_flight = max(1, max_in_flight)
+        self.calls: Dict[str, int] = {op: 0 for op in _OPS}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _call(self, op: str, *args):
+        if self._slots is None:  # created lazily, on the loop that uses it
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        async with self._slots:
+            self.calls[op] += 1
+            return await getattr(self.backend, op)(*args)
+
+    # ---------- Single requests ----------
+    async def stat(self, url: str) -> Optional[Entry]:
+        return await self._call("stat", url)
+
+    async def list(self, url: str) -> Optional[List[Entry]]:
+        return await self._call("list", url)
+
+    async def copy(self, src: str, dst: str, overwrite: bool = True) -> bool:
+        return await self._call("copy", src, dst, overwrite)
+
+    async def read_file(self, url: str) -> Optional[bytes]:
+        return await self._call("read_file", url)
+
+    async def write_file(self, url: str, data: bytes) -> bool:
+        return await self._call("write_file", url, data)
+
+    async def create_folder(self, url: str) -> bool:
+        return await self._call("create_folder", url)
+
+    async def delete(self, url: str) -> bool:
+        return await self._call("delete", url)
+
+    # ---------- Batches ----------
+    async def stat_many(self, urls: Sequence[str]) -> List[Optional[Entry]]:
+        return list(await asyncio.gather(*(self.stat(u) for u in urls)))
+
+    async def copy_many(self, pairs: Sequence[Tuple[str, str]], overwrite: bool = True) -> List[bool]:
+        return list(await asyncio.gather(*(self.copy(s, d, overwrite) for s, d in pairs)))
+
+    async def walk(self, url: str) -> List[Tuple[str, str]]:
+        """(posix relpath, url) of every file below `url`; each level's folders are listed concurrently."""
+        files, level = [], [(url.rstrip("/"), "")]
+        while level:
+            listings = await asyncio.gather(*(self.list(u) for u, _rel in level))
+            nxt = []
+            for (u, rel), entries in zip(level, listings):
+                for e in entries or ():
+                    child, child_rel = f"{u}/{e.name}", (f"{rel}/{e.name}" if rel else e.name)
+                    if e.is_dir:
+                        nxt.append((child, child_rel))
+                    else:
+                        files.append((child_rel, child))
+            level = nxt
+        return files
+
+    async def copy_tree(self, src: str, dst: str, overwrite: bool = True) -> Tuple[int, List[str]]:
+        """Copy every file below `src` to the same relative path below `dst`: (copied, failed srcs)."""
+        files = await self.walk(src)
+        folders = sorted({rel.rsplit("/", 1)[0] for rel, _u in files if "/" in rel}, key=len)
+        await self.create_folder(dst)
+        for depth_group in _by_depth(folders):
+            await asyncio.gather(*(self.create_folder(f"{dst.rstrip('/')}/{rel}") for rel in depth_group))
+        pairs = [(u, f"{dst.rstrip('/')}/{rel}") for rel, u in files]
+        results = await self.copy_many(pairs, overwrite)
+        failed = [s for (s, _d), ok in zip(pairs, results) if not ok]
+        return len(pairs) - len(failed), failed
+
+
+def _by_depth(rel_folders: Sequence[str]) -> List[List[str]]:
+    """Group relative folders by depth so parents are created before children."""
+    groups: Dict[int, List[str]] = {}
+    for rel in rel_folders:
+        groups.setdefault(rel.count("/"), []).append(rel)
+    return [groups[k] for k in sorted(groups)]
+
+
+# ============================ Loop Thread Bridge =============================
+
+class IOLoop:
+    """An AsyncIO on a private event-loop thread, usable from blocking threads.
+
+    Build workers call `run(coro)` and block until that batch finishes, while
+    the batches of all workers share one bounded pool of in-flight requests.
+    """
+
+    def __init__(self, aio: AsyncIO):
+        self.aio = aio
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "IOLoop":
+        if self._thread is not None:
+            return self
+        ready = threading.Event()
+
+        def _main():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=_main, name="SmartAssetsIO", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run `coro` on the I/O loop and wait for its result (raises what it raises)."""
+        if self._loop is None:
+            raise RuntimeError("IOLoop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self) -> None:
+        """Cancel whatever is still in flight and end the loop thread."""
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+
+        async def _drain():
+            current = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not current]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(_drain(), loop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self._loop, self._thread = None, None
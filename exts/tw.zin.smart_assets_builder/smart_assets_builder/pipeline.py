@@ -0,0 +1,1465 @@
+# SmartAssetsBuilder — pipeline.py
+# Kit-free build pipeline (path/IO helpers, USD authoring, per-item build).
+# Only needs `pxr` (usd-core); Nucleus support is enabled when omni.client imports.
+
+import os
+import mmap
+import hashlib
+import traceback
+import posixpath
+import shutil
+import threading
+import time
+import contextlib
+import concurrent.futures as cf
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pxr import Sdf, Kind, Usd, UsdGeom, UsdUtils
+
+from .iocache import IOCache, KIND_FILE, KIND_DIR, KIND_MISSING
+from .templates import ROLE_ASSET, ROLE_MAIN, ROLE_ID, TemplateSet, instantiate_template, use_templates
+
+# Optional Nucleus support
+try:
+    import omni.client
+except Exception:
+    omni = None
+
+
+# ============================== Path / IO Utilities ============================
+
+# Run state lives in context variables, so engines running side by side in one
+# process (queue jobs) each see only their own: every build_item call runs in a
+# copy of its engine's context (see `run_context`). Outside a run all are None.
+
+# Run-scoped metadata cache (see iocache.py).
+_io_cache: ContextVar[Optional[IOCache]] = ContextVar("smart_assets_io_cache", default=None)
+
+# Async Nucleus I/O loop (see nucleus_io.py) for batched copies; None = blocking calls.
+_async_io: ContextVar = ContextVar("smart_assets_async_io", default=None)
+
+
+def set_io_cache(cache: Optional[IOCache]) -> Optional[IOCache]:
+    """Install the cache used by _exists/_ensure_dir_*/walkers in the current context; returns the previous one."""
+    prev = _io_cache.get()
+    _io_cache.set(cache)
+    return prev
+
+
+# Per-item I/O accounting: build_item points this thread at the record of the
+# stage being run, and the helpers below count every request they really make
+# (cache hits are free) plus the bytes they move.
+_meter = threading.local()
+
+
+def _io(op: str = "", nbytes: int = 0) -> None:
+    """Count one `op` request (stat, list, copy, read, write, mkdir, delete, link) and/or bytes moved."""
+    rec = getattr(_meter, "rec", None)
+    if rec is None:
+        return
+    if op:
+        rec[op] = rec.get(op, 0) + 1
+    if nbytes:
+        rec["bytes"] = rec.get("bytes", 0) + nbytes
+
+
+# Run control shared with the workers (threading or multiprocessing Events):
+# (cancel, gate); cancel = stop at the next stage boundary, gate = cleared while the run is paused.
+_run_control: ContextVar[tuple] = ContextVar("smart_assets_run_control", default=(None, None))
+
+
+class BuildCancelled(Exception):
+    """Raised at a stage boundary of `build_item` once the run was cancelled."""
+
+
+def set_run_control(cancel_event, run_gate) -> tuple:
+    """Install the run's cancel / pause events in the current context; returns the previous pair."""
+    prev = _run_control.get()
+    _run_control.set((cancel_event, run_gate))
+    return prev
+
+
+def _checkpoint() -> None:
+    """Stage boundary: wait while the run is paused, raise BuildCancelled once it is cancelled."""
+    cancel, gate = _run_control.get()
+    if gate is not None:
+        while not gate.wait(0.1):
+            if cancel is not None and cancel.is_set():
+                break
+    if cancel is not None and cancel.is_set():
+        raise BuildCancelled()
+
+
+# Callable(src, stage) told about every stage build_item completes (journal.StageLog); None = not journaled.
+_stage_log: ContextVar = ContextVar("smart_assets_stage_log", default=None)
+
+
+def set_stage_log(stage_log):
+    """Install the per-stage journal writer in the current context; returns the previous one."""
+    prev = _stage_log.get()
+    _stage_log.set(stage_log)
+    return prev
+
+
+def set_async_io(io_loop):
+    """Install the `nucleus_io.IOLoop` used for batched Nucleus copies in the current context; returns the previous one."""
+    prev = _async_io.get()
+    _async_io.set(io_loop)
+    return prev
+
+
+def run_context(io_cache: Optional[IOCache] = None, cancel_event=None, run_gate=None, io_loop=None,
+                templates: Optional[TemplateSet] = None, stage_log=None) -> Context:
+    """A copy of the current context with one run's state installed.
+
+    Call into it with `ctx.copy().run(fn, ...)` (a context can only be entered by
+    one thread at a time); nothing outside it sees the state.
+    """
+    ctx = copy_context()
+
+    def _install():
+        set_io_cache(io_cache)
+        set_run_control(cancel_event, run_gate)
+        set_async_io(io_loop)
+        set_stage_log(stage_log)
+        use_templates(templates)
+
+    ctx.run(_install)
+    return ctx
+
+
+def _is_ov_url(url: str) -> bool:
+    return url.startswith("omniverse://") or url.startswith("omni://")
+
+
+def _dirname(p: str) -> str:
+    if _is_ov_url(p):
+        return p.rsplit("/", 1)[0] if "/" in p else p
+    return os.path.dirname(p)
+
+
+def _join(base: str, *more: str) -> str:
+    if _is_ov_url(base):
+        return "/".join([base.rstrip("/")] + [m.strip("/") for m in more])
+    return os.path.join(base, *more)
+
+
+def _abs(path_or_url: str) -> str:
+    return path_or_url if _is_ov_url(path_or_url) else os.path.abspath(path_or_url)
+
+
+def _ensure_usd_ext(p: str) -> str:
+    if "." not in p:
+        return p + ".usd"
+    root, ext = p.rsplit(".", 1)
+    return p if ext.lower() == "usd" else root + ".usd"
+
+
+def _ensure_dir_local(path: str, cache: Optional[IOCache] = None) -> None:
+    cache = cache if cache is not None else _io_cache.get()
+    if cache is not None and cache.kind(path) == KIND_DIR:
+        return
+    _io("mkdir")
+    os.makedirs(path, exist_ok=True)
+    if cache is not None:
+        cache.mark_dir(path)
+
+
+def _ensure_dir_ov(url: str, cache: Optional[IOCache] = None) -> None:
+    if omni is None:
+        return
+    cache = cache if cache is not None else _io_cache.get()
+    u = url.rstrip("/")
+    if cache is not None and cache.kind(u) == KIND_DIR:
+        return
+    if "://" in u:
+        scheme, rest = u.split("://", 1)
+        netloc, *segs = rest.split("/")
+        cur = f"{scheme}://{netloc}"
+        for s in segs:
+            if not s:
+                continue
+            cur = f"{cur}/{s}"
+            if cache is not None and cache.kind(cur) == KIND_DIR:
+                continue
+            _io("stat")
+            rc, _ = omni.client.stat(cur)
+            if rc != omni.client.Result.OK:
+                _io("mkdir")
+                omni.client.create_folder(cur)
+            if cache is not None:
+                cache.mark_dir(cur)
+    else:
+        _io("stat")
+        rc, _ = omni.client.stat(u)
+        if rc != omni.client.Result.OK:
+            _io("mkdir")
+            omni.client.create_folder(u)
+        if cache is not None:
+            cache.mark_dir(u)
+
+
+def _kind(p: str) -> str:
+    """KIND_FILE / KIND_DIR / KIND_MISSING for a path or URL (cached during a run)."""
+    cache = _io_cache.get()
+    if cache is not None:
+        k = cache.kind(p)
+        if k is not None:
+            return k
+    _io("stat")
+    if _is_ov_url(p):
+        if omni is None:
+            return KIND_MISSING
+        rc, info = omni.client.stat(p)
+        if rc != omni.client.Result.OK:
+            k = KIND_MISSING
+        else:
+            k = KIND_DIR if (info.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN)) else KIND_FILE
+    else:
+        k = KIND_DIR if os.path.isdir(p) else (KIND_FILE if os.path.isfile(p) else KIND_MISSING)
+    if cache is not None:
+        cache.set_kind(p, k)
+    return k
+
+
+def _exists(p: str) -> bool:
+    return _kind(p) == KIND_FILE
+
+
+def _mark_written(p: str) -> None:
+    cache = _io_cache.get()
+    if cache is not None:
+        cache.mark_file(p)
+
+
+def _mark_deleted(p: str) -> None:
+    cache = _io_cache.get()
+    if cache is not None:
+        cache.mark_missing(p)
+
+
+def _list_ov(url: str) -> list:
+    """omni.client.list entries of a Nucleus folder ([] on error), cached during a run."""
+    cache = _io_cache.get()
+    if cache is not None:
+        entries = cache.listing(url)
+        if entries is not None:
+            return entries
+    _io("list")
+    rc, entries = omni.client.list(url.rstrip("/"))
+    entries = list(entries) if int(rc) == int(omni.client.Result.OK) else []
+    if cache is not None and entries:
+        cache.set_listing(url, entries)
+    return entries
+
+
+def _split_ov(url: str):
+    scheme, rest = url.split("://", 1)
+    netloc, *path_parts = rest.split("/")
+    return scheme, netloc, "/" + "/".join(path_parts)
+
+
+def _norm_local(p: str) -> str:
+    return os.path.normcase(os.path.abspath(p))
+
+
+def _norm_ov(p: str) -> Tuple[str, str, str]:
+    s, n, path = _split_ov(p)
+    return s, n, posixpath.normpath(path)
+
+
+def _is_same_path(a: str, b: str) -> bool:
+    if _is_ov_url(a) and _is_ov_url(b):
+        return _norm_ov(a) == _norm_ov(b)
+    if (not _is_ov_url(a)) and (not _is_ov_url(b)):
+        return _norm_local(a) == _norm_local(b)
+    return False
+
+
+def _is_inside(child: str, parent: str) -> bool:
+    """True if `child` is strictly inside `parent` (not equal)."""
+    if _is_ov_url(child) and _is_ov_url(parent):
+        sc, nc, pc = _norm_ov(child)
+        sp, np, pp = _norm_ov(parent)
+        if sc != sp or nc != np:
+            return False
+        if pc == pp:
+            return False
+        return pc.startswith(pp + "/")
+    if (not _is_ov_url(child)) and (not _is_ov_url(parent)):
+        c = _norm_local(child)
+        p = _norm_local(parent)
+        if c == p:
+            return False
+        try:
+            rel = os.path.relpath(c, start=p)
+            return rel != "." and not rel.startswith("..")
+        except Exception:
+            return False
+    return False
+
+
+def _relref(from_file: str, to_file: str) -> str:
+    """Relative reference if same Nucleus host; otherwise absolute. Local uses os.path.relpath."""
+    if _is_ov_url(from_file) and _is_ov_url(to_file):
+        try:
+            sf, sfn, sp = _split_ov(from_file)
+            st, stn, tp = _split_ov(to_file)
+            if sf == st and sfn == stn:
+                from_dir = posixpath.dirname(sp)
+                return posixpath.relpath(tp, start=from_dir)
+        except Exception:
+            pass
+        return to_file
+    from_dir = os.path.dirname(_abs(from_file))
+    tgt_abs = _abs(_ensure_usd_ext(to_file))
+    try:
+        rel = os.path.relpath(tgt_abs, start=from_dir)
+    except Exception:
+        return tgt_abs
+    return rel.replace("\\", "/")
+
+
+def _dotify_rel(rel_path: str) -> str:
+    """Make 'name.usd' -> './name.usd' for subLayers to match sample."""
+    if not rel_path:
+        return rel_path
+    if rel_path.startswith(("omniverse://", "omni://", "/", "../", "./")):
+        return rel_path
+    return f"./{rel_path}"
+
+
+# ======================= File IO (supports cross-scheme) =======================
+
+def _read_bytes(path_or_url: str):
+    if _is_ov_url(path_or_url):
+        if omni is None:
+            return None
+        rc, content = omni.client.read_file(path_or_url)
+        data = bytes(content) if rc == omni.client.Result.OK else None
+    else:
+        try:
+            with open(path_or_url, "rb") as f:
+                data = f.read()
+        except Exception:
+            data = None
+    _io("read", len(data) if data else 0)
+    return data
+
+
+def _write_bytes(path_or_url: str, data: bytes) -> bool:
+    if _is_ov_url(path_or_url):
+        if omni is None:
+            return False
+        _io("write", len(data))
+        _ensure_dir_ov(_dirname(path_or_url))
+        rc = omni.client.write_file(path_or_url, data)
+        if rc != omni.client.Result.OK:
+            return False
+    else:
+        _ensure_dir_local(os.path.dirname(path_or_url))
+        _io("write", len(data))
+        with open(path_or_url, "wb") as f:
+            f.write(data)
+    _mark_written(path_or_url)
+    return True
+
+
+# Streaming copy: memory stays bounded by one chunk regardless of file size.
+_CHUNK = 8 << 20             # 8 MiB per read/write/hash step
+
+
+def _iter_local_chunks(path: str) -> Iterator[bytes]:
+    """Memory-mapped, fixed-size chunks of a local file."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for off in range(0, size, _CHUNK):
+                yield mm[off:off + _CHUNK]
+
+
+def _hash_local(path: str) -> Tuple[int, str]:
+    h = hashlib.sha1()
+    n = 0
+    for chunk in _iter_local_chunks(path):
+        h.update(chunk)
+        n += len(chunk)
+    return n, h.hexdigest()
+
+
+def _partial_path(dst: str) -> str:
+    """Temp name unique per process/thread, so concurrent writers of one target never collide."""
+    return f"{dst}.{os.getpid()}.{threading.get_ident()}.partial"
+
+
+def _write_local_chunks(dst: str, chunks: Iterable[bytes]) -> int:
+    """Write chunks to `dst` via a temp file (atomic replace); returns the bytes written."""
+    _ensure_dir_local(os.path.dirname(dst))
+    tmp = _partial_path(dst)
+    n = 0
+    try:
+        with open(tmp, "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                n += len(chunk)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _mark_written(dst)
+    return n
+
+
+def _client_copy(src: str, dst: str) -> bool:
+    """omni.client.copy (server-side or client-streamed), overwriting `dst`."""
+    if omni is None or not hasattr(omni.client, "copy"):
+        return False
+    behavior = getattr(getattr(omni.client, "CopyBehavior", None), "OVERWRITE", None)
+    _io("copy")
+    try:
+        res = omni.client.copy(src, dst, behavior) if behavior is not None else omni.client.copy(src, dst)
+    except Exception:
+        return False
+    rc = res[0] if isinstance(res, tuple) else res
+    return rc == omni.client.Result.OK
+
+
+def _stream_copy(src: str, dst: str) -> Tuple[bool, int]:
+    """Copy one file in bounded chunks, each byte read once. Returns (ok, bytes).
+
+    local->local : mmap read + chunked write through a temp file.
+    local->Nucleus / Nucleus->local : omni.client.copy streams the transfer (a
+        download lands in a temp file first).
+    Nucleus->Nucleus : server-side copy.
+    Nothing is ever buffered whole: when the client copy fails, the copy fails.
+    """
+    src_ov, dst_ov = _is_ov_url(src), _is_ov_url(dst)
+    try:
+        if not src_ov and not dst_ov:
+            n = _write_local_chunks(dst, _iter_local_chunks(src))
+            shutil.copystat(src, dst)
+            _io("copy", n)
+            return True, n
+
+        if src_ov and dst_ov:
+            ok = _client_copy(src, dst)
+            if ok:
+                _mark_written(dst)
+            st = _stat_any(src) if ok else None
+            _io("", st[0] if st else 0)
+            return ok, (st[0] if st else 0)
+
+        if not src_ov:  # upload
+            n = os.path.getsize(src)
+            _ensure_dir_ov(_dirname(dst))
+            if not _client_copy(_abs(src).replace("\\", "/"), dst):
+                return False, 0
+            _mark_written(dst)
+            _io("", n)
+            return True, n
+
+        # download
+        _ensure_dir_local(os.path.dirname(dst))
+        tmp = _partial_path(dst)
+        if not _client_copy(src, _abs(tmp).replace("\\", "/")):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False, 0
+        os.replace(tmp, dst)
+        _mark_written(dst)
+        n = os.path.getsize(dst)
+        _io("", n)
+        return True, n
+    except Exception:
+        return False, 0
+
+
+# Overwrite sync modes: how an existing destination is judged "unchanged".
+SYNC_OFF = ""                # always recopy (delete + copy)
+SYNC_MTIME = "mtime"         # same size and dst not older than src
+SYNC_CHECKSUM = "checksum"   # same size and same sha1
+
+
+def _needs_copy(src: str, dst: str, sync: str) -> Tuple[bool, Optional[int]]:
+    """(copy needed, source size or None if not stat'ed); False when `dst` already matches `src` under `sync`."""
+    if not sync:
+        return True, None
+    s_st, d_st = _stat_any(src), _stat_any(dst)
+    size = s_st[0] if s_st is not None else None
+    if s_st is None or d_st is None or s_st[0] != d_st[0]:
+        return True, size
+    if sync == SYNC_CHECKSUM:
+        s_h, d_h = _hash_file(src), _hash_file(dst)
+        return (s_h is None or s_h != d_h), size
+    return d_st[1] < s_st[1], size
+
+
+COPY = "copy"          # (re)copy the file
+KEEP = "keep"          # dst exists and overwrite is off
+SYNCED = "synced"      # dst exists and already matches src (sync modes)
+
+
+def _copy_verdict(src: str, dst: str, overwrite: bool, sync: str) -> Tuple[str, Optional[int]]:
+    """What a copy of src -> dst will do (COPY / KEEP / SYNCED), plus the source size when the
+    sync check already stat'ed it (None otherwise); shared with the dry-run planner."""
+    if not _exists(dst):
+        return COPY, None
+    if not overwrite:
+        return KEEP, None
+    needed, size = _needs_copy(src, dst, sync)
+    return (COPY if needed else SYNCED), size
+
+
+def _count_sync_skip(stats: Optional[dict], size: Optional[int]) -> None:
+    if stats is not None:
+        stats["sync_skipped"] = stats.get("sync_skipped", 0) + 1
+        stats["sync_bytes_skipped"] = stats.get("sync_bytes_skipped", 0) + (size or 0)
+
+
+def _copy_file_any_scheme(src: str, dst: str, overwrite: bool, log_fn,
+                          sync: str = SYNC_OFF, stats: Optional[dict] = None) -> bool:
+    """Copy src->dst even across local/Nucleus. Returns True if present at dst (copied or already there).
+
+    With `overwrite` and a `sync` mode, an existing dst that already matches src is kept.
+    """
+    if _is_same_path(src, dst):
+        return True
+
+    verdict, size = _copy_verdict(src, dst, overwrite, sync)
+    if verdict == KEEP:
+        log_fn("[INFO] Exists, skip copy.")
+        return True
+    if verdict == SYNCED:
+        _count_sync_skip(stats, size)
+        return True
+    if _is_ov_url(dst) and _exists(dst):
+        try:
+            _io("delete")
+            omni.client.delete(dst)
+            _mark_deleted(dst)
+        except Exception:
+            pass
+
+    # Same-scheme fast path
+    if _is_ov_url(src) == _is_ov_url(dst):
+        if _is_ov_url(src):
+            _io("copy")
+            rc = omni.client.copy(src, dst)[0] if hasattr(omni.client, "copy") else omni.client.Result.ERROR
+            if rc != omni.client.Result.OK:
+                log_fn(f"[ERROR] Nucleus copy failed ({rc})")
+                return False
+            _mark_written(dst)
+            _io("", (_stat_any(src) or (0, 0.0))[0])
+            return True
+        else:
+            _ensure_dir_local(os.path.dirname(dst))
+            shutil.copy2(src, dst)
+            _io("copy", os.path.getsize(dst))
+            _mark_written(dst)
+            return True
+
+    # Cross-scheme: streamed in bounded chunks
+    ok, _nbytes = _stream_copy(src, dst)
+    if not ok:
+        log_fn("[ERROR] Copy failed (cross-scheme).")
+    return ok
+
+
+def _iter_tree_files(root: str) -> Iterator[Tuple[str, str]]:
+    """(posix relpath, full path/URL) of every file below a local folder or Nucleus URL."""
+    if _is_ov_url(root):
+        if omni is None:
+            return
+        stack = [(root.rstrip("/"), "")]
+        while stack:
+            u, rel = stack.pop()
+            for e in _list_ov(u):
+                name = e.relative_path
+                if not name or name in (".", ".."):
+                    continue
+                child_rel = f"{rel}/{name}" if rel else name
+                if e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN):
+                    stack.append((u + "/" + name, child_rel))
+                else:
+                    yield child_rel, u + "/" + name
+    else:
+        for r, _dirs, files in os.walk(root):
+            for f in files:
+                full = os.path.join(r, f)
+                yield os.path.relpath(full, root).replace("\\", "/"), full
+
+
+def _run_ov_copies(todo: List[Tuple[str, str]], sizes: Dict[str, int], log_fn) -> List[bool]:
+    """Nucleus -> Nucleus server-side copies (overwriting), batched through the async I/O loop when installed."""
+
+    def copy_one(c_src: str, c_dst: str) -> bool:
+        if _exists(c_dst):
+            try:
+                _io("delete")
+                omni.client.delete(c_dst)
+                _mark_deleted(c_dst)
+            except Exception: pass
+        _io("copy")
+        rc2 = omni.client.copy(c_src, c_dst)[0] if hasattr(omni.client, "copy") else omni.client.Result.ERROR
+        if rc2 != omni.client.Result.OK:
+            log_fn(f"[ERROR] Copy failed: {c_src} → {c_dst} ({rc2})")
+            return False
+        return True
+
+    io_loop = _async_io.get()
+    if io_loop is not None and len(todo) > 1:
+        # Every copy in flight at once, instead of one round trip each.
+        results = io_loop.run(io_loop.aio.copy_many(todo, overwrite=True))
+        for (c_src, c_dst), ok in zip(todo, results):
+            _io("copy")
+            if not ok:
+                log_fn(f"[ERROR] Copy failed: {c_src} → {c_dst}")
+    else:
+        results = [copy_one(c_src, c_dst) for c_src, c_dst in todo]
+    for (c_src, c_dst), ok in zip(todo, results):
+        if ok:
+            _mark_written(c_dst)
+            _io("", sizes.get(c_src, 0))
+    return list(results)
+
+
+def _copy_materials_any_scheme(src_core_dir: str, out_core_dir: str, overwrite: bool, log_fn,
+                               sync: str = SYNC_OFF, stats: Optional[dict] = None) -> bool:
+    """Recursively copy 'Materials' from src_core_dir to out_core_dir across local/Nucleus, loop-safe.
+
+    With `overwrite` and a `sync` mode, files whose destination already matches are skipped.
+    """
+    src_mat = _join(src_core_dir, "Materials") if _is_ov_url(src_core_dir) else os.path.join(src_core_dir, "Materials")
+    dst_mat = _join(out_core_dir, "Materials") if _is_ov_url(out_core_dir) else os.path.join(out_core_dir, "Materials")
+
+    # Existence check
+    if _is_ov_url(src_mat) and omni is None:
+        return False
+    if _kind(src_mat) != KIND_DIR:
+        return False
+
+    # Loop-safety (defensive; on_start already guards)
+    if _is_same_path(out_core_dir, src_core_dir) or _is_inside(out_core_dir, src_core_dir) or _is_inside(src_core_dir, out_core_dir):
+        log_fn("[WARN] Loop risk; skip Materials copy.")
+        return False
+
+    def _ensure_dir_any(d):
+        (_ensure_dir_ov if _is_ov_url(d) else _ensure_dir_local)(d)
+
+    # Nucleus -> Nucleus: server-side copies, batched through the async I/O loop when installed
+    if _is_ov_url(src_mat) and _is_ov_url(dst_mat):
+        todo: List[Tuple[str, str]] = []
+        sizes: Dict[str, int] = {}
+
+        def walk(u_src: str, u_dst: str):
+            entries = _list_ov(u_src)
+            if not entries:
+                return
+            _ensure_dir_ov(u_dst)
+            for e in entries:
+                name = e.relative_path
+                if not name or name in (".", ".."):
+                    continue
+                c_src = u_src.rstrip("/") + "/" + name
+                c_dst = u_dst.rstrip("/") + "/" + name
+                is_dir = bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
+                if is_dir:
+                    walk(c_src, c_dst)
+                else:
+                    verdict, size = _copy_verdict(c_src, c_dst, overwrite, sync)
+                    if verdict == KEEP:
+                        continue
+                    if verdict == SYNCED:
+                        _count_sync_skip(stats, size)
+                        continue
+                    todo.append((c_src, c_dst))
+                    sizes[c_src] = int(getattr(e, "size", 0) or 0)
+
+        walk(src_mat, dst_mat)
+        _run_ov_copies(todo, sizes, log_fn)
+        return True
+
+    # General cases (local<->local / cross-scheme): iterate and stream-copy
+    def _iter_local_files(root_dir: str):
+        for r, _dirs, files in os.walk(root_dir, topdown=True):
+            yield r, files
+
+    def _iter_ov_files(root_url: str):
+        entries = _list_ov(root_url)
+        if not entries:
+            return
+        files_here = []
+        dirs_here = []
+        for e in entries:
+            name = e.relative_path
+            if not name or name in (".", ".."):
+                continue
+            is_dir = bool(e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN))
+            (dirs_here if is_dir else files_here).append(name)
+        yield root_url, files_here
+        for d in dirs_here:
+            yield from _iter_ov_files(root_url.rstrip("/") + "/" + d)
+
+    if _is_ov_url(src_mat):
+        for parent, files in _iter_ov_files(src_mat):
+            rel = posixpath.relpath(parent, start=src_mat)
+            target_parent = dst_mat if rel == "." else (_join(dst_mat, rel) if _is_ov_url(dst_mat) else os.path.join(dst_mat, rel))
+            _ensure_dir_any(target_parent)
+            for f in files:
+                s = parent.rstrip("/") + "/" + f
+                d = (target_parent.rstrip("/") + "/" + f) if _is_ov_url(target_parent) else os.path.join(target_parent, f)
+                verdict, size = _copy_verdict(s, d, overwrite, sync)
+                if verdict == KEEP:
+                    continue
+                if verdict == SYNCED:
+                    _count_sync_skip(stats, size)
+                    continue
+                ok, _nbytes = _stream_copy(s, d)
+                if not ok:
+                    log_fn(f"[ERROR] Copy failed: {s} → {d}")
+        return True
+    else:
+        for parent, files in _iter_local_files(src_mat):
+            rel = os.path.relpath(parent, start=src_mat)
+            target_parent = dst_mat if rel == "." else (_join(dst_mat, rel) if _is_ov_url(dst_mat) else os.path.join(dst_mat, rel))
+            _ensure_dir_any(target_parent)
+            for f in files:
+                s = os.path.join(parent, f)
+                d = (target_parent.rstrip("/") + "/" + f) if _is_ov_url(target_parent) else os.path.join(target_parent, f)
+                verdict, size = _copy_verdict(s, d, overwrite, sync)
+                if verdict == KEEP:
+                    continue
+                if verdict == SYNCED:
+                    _count_sync_skip(stats, size)
+                    continue
+                ok, _nbytes = _stream_copy(s, d)
+                if not ok:
+                    log_fn(f"[ERROR] Copy failed: {s} → {d}")
+        return True
+
+
+# ============================ Input Fingerprints ===============================
+
+def _stat_any(p: str) -> Optional[Tuple[int, float]]:
+    """(size, mtime) of a file, or None if missing. mtime is seconds since epoch."""
+    _io("stat")
+    if _is_ov_url(p):
+        if omni is None:
+            return None
+        rc, info = omni.client.stat(p)
+        if rc != omni.client.Result.OK:
+            return None
+        mt = info.modified_time
+        return int(info.size), (mt.timestamp() if hasattr(mt, "timestamp") else float(mt or 0))
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    return int(st.st_size), float(st.st_mtime)
+
+
+def _hash_file(p: str) -> Optional[str]:
+    if _is_ov_url(p):
+        data = _read_bytes(p)
+        if data is None:
+            return None
+        return hashlib.sha1(data).hexdigest()
+    try:
+        n, digest = _hash_local(p)
+    except (OSError, ValueError):
+        return None
+    _io("read", n)
+    return digest
+
+
+def _materials_fingerprint(src_core_dir: str) -> Optional[str]:
+    """Hash of the sorted (relpath, size, mtime) listing of `<core>/Materials`, None if absent."""
+    rows = []
+    if _is_ov_url(src_core_dir):
+        if omni is None:
+            return None
+        root = _join(src_core_dir, "Materials")
+
+        def walk(u: str, rel: str) -> bool:
+            entries = _list_ov(u)
+            if not entries:
+                return False
+            for e in entries:
+                name = e.relative_path
+                if not name or name in (".", ".."):
+                    continue
+                child_rel = f"{rel}/{name}" if rel else name
+                if e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN):
+                    walk(u.rstrip("/") + "/" + name, child_rel)
+                else:
+                    mt = e.modified_time
+                    rows.append(f"{child_rel}\t{e.size}\t{mt.timestamp() if hasattr(mt, 'timestamp') else mt}")
+            return True
+
+        if not walk(root, ""):
+            return None
+    else:
+        root = os.path.join(src_core_dir, "Materials")
+        if not os.path.isdir(root):
+            return None
+        for r, _dirs, files in os.walk(root):
+            for f in files:
+                p = os.path.join(r, f)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                rel = os.path.relpath(p, root).replace("\\", "/")
+                rows.append(f"{rel}\t{st.st_size}\t{st.st_mtime}")
+    rows.sort()
+    return hashlib.sha1("\n".join(rows).encode("utf-8")).hexdigest()
+
+
+def _source_fingerprint(src: str, prev: Optional[dict]) -> Optional[dict]:
+    """Size/mtime/sha1 of a source; the hash is reused when size and mtime are unchanged."""
+    st = _stat_any(src)
+    if st is None:
+        return None
+    size, mtime = st
+    if prev and prev.get("size") == size and prev.get("mtime") == mtime and prev.get("sha1"):
+        return {"size": size, "mtime": mtime, "sha1": prev["sha1"]}
+    return {"size": size, "mtime": mtime, "sha1": _hash_file(src)}
+
+
+# ============================== USD Stage Helpers ==============================
+
+# Output encodings for the `.usd` layers we author. File names always stay `.usd`
+# (so the asset/main/id references never change); the encoding is chosen with the
+# usd file format's "format" argument.
+ENCODING_DEFAULT = ""      # whatever Sdf writes for .usd (crate)
+ENCODING_USDA = "usda"     # ASCII, diff-friendly
+ENCODING_USDC = "usdc"     # binary crate, fastest to open
+ENCODINGS = (ENCODING_DEFAULT, ENCODING_USDA, ENCODING_USDC)
+
+
+def _export_layer(layer: Sdf.Layer, out_path: str, encoding: str = ENCODING_DEFAULT) -> str:
+    """Write in-memory `layer` to `out_path` in one save (overwrites)."""
+    out_path = _ensure_usd_ext(out_path)
+    (_ensure_dir_ov if _is_ov_url(out_path) else _ensure_dir_local)(_dirname(out_path))
+    args = {"format": encoding} if encoding else {}
+    _io("write")
+    if not layer.Export(out_path, args=args):
+        raise RuntimeError(f"Could not write layer: {out_path}")
+    _mark_written(out_path)
+    return out_path
+
+
+def _def_prim(parent, name: str, type_name: str = "") -> Sdf.PrimSpec:
+    """`def <type_name> "<name>"` under `parent` (a layer or a prim spec)."""
+    if isinstance(parent, Sdf.Layer):
+        parent = parent.pseudoRoot
+    return Sdf.PrimSpec(parent, name, Sdf.SpecifierDef, type_name)
+
+
+def _add_reference(prim: Sdf.PrimSpec, asset_path: str) -> None:
+    prim.referenceList.Prepend(Sdf.Reference(asset_path))
+
+
+# Arc type of main -> asset and id -> main. Payloads let a layout of many id files
+# open unloaded (kind and extentsHint sit on the prim above the payload).
+ARC_REFERENCE = "reference"
+ARC_PAYLOAD = "payload"
+ARCS = (ARC_REFERENCE, ARC_PAYLOAD)
+
+
+def _add_arc(prim: Sdf.PrimSpec, asset_path: str, arc: str = ARC_REFERENCE) -> None:
+    if arc == ARC_PAYLOAD:
+        prim.payloadList.Prepend(Sdf.Payload(asset_path))
+    else:
+        _add_reference(prim, asset_path)
+
+
+# =============================== Builders / USD ================================
+
+def _derive_names(src_path: str, id_suffix: str) -> Tuple[str, str, str, str]:
+    base = src_path.rsplit("/", 1)[-1] if _is_ov_url(src_path) else os.path.basename(src_path)
+    name, _, _ = base.partition(".")
+    core = name[4:] if name.lower().startswith("max_") else name
+    
+    # [Logic Change] Handle empty suffix
+    if id_suffix:
+        id_filename = f"id_{core}_{id_suffix}.usd"
+    else:
+        id_filename = f"id_{core}.usd"
+
+    return core, f"asset_{core}.usd", f"{core}.usd", id_filename
+
+
+def _build_asset(out_path: str, sublayer_target: str, mat_path_override: str = "",
+                 encoding: str = ENCODING_DEFAULT) -> str:
+    layer, _world = instantiate_template(ROLE_ASSET)
+    
+    # 1. Process max_{name}.usd (Base layer)
+    rel_max = _dotify_rel(_relref(out_path, sublayer_target))
+    
+    # Prepare subLayer list
+    layers = [rel_max]
+
+    # 2. If material override path is specified, add it to the top (Index 0)
+    if mat_path_override:
+        raw_mat_path = _relref(out_path, mat_path_override)
+        if ":" in raw_mat_path or raw_mat_path.startswith(("/", "\\")):
+            rel_mat = raw_mat_path
+        else:
+            rel_mat = _dotify_rel(raw_mat_path)
+        
+        # Insert at the first position to ensure override
+        layers.insert(0, rel_mat)
+
+    # 3. Set subLayerPaths
+    layer.subLayerPaths = layers
+    
+    return _export_layer(layer, out_path, encoding)
+
+
+def _build_main(out_path: str, asset_path: str, core: str, encoding: str = ENCODING_DEFAULT,
+                arc: str = ARC_REFERENCE) -> str:
+    layer, world = instantiate_template(ROLE_MAIN)
+    scope = _def_prim(world, "ASSET", "Scope")
+    prim = _def_prim(scope, f"asset_{core}")
+    _add_arc(prim, _relref(out_path, asset_path), arc)
+    return _export_layer(layer, out_path, encoding)
+
+
+def _build_id(out_path: str, main_path: str, core: str, encoding: str = ENCODING_DEFAULT,
+              arc: str = ARC_REFERENCE) -> str:
+    layer, world = instantiate_template(ROLE_ID)
+    
+    # Create Prim
+    prim = _def_prim(world, core)
+    
+    # [Logic] Set Kind = component
+    prim.kind = Kind.Tokens.component
+    # With payloads, keep the model hierarchy contiguous (World is a group), so bounds queries on
+    # a layout of id files can stop at the component's extentsHint instead of loading the payload.
+    if arc == ARC_PAYLOAD and not world.kind:
+        world.kind = Kind.Tokens.group
+    
+    _add_arc(prim, _relref(out_path, main_path), arc)
+    return _export_layer(layer, out_path, encoding)
+
+
+def _set_extents_hint(layer: Sdf.Layer, prim_path: Sdf.Path, hint) -> None:
+    spec = layer.GetPrimAtPath(prim_path)
+    if spec is None:
+        return
+    attr = spec.attributes.get("extentsHint") or Sdf.AttributeSpec(spec, "extentsHint", Sdf.ValueTypeNames.Float3Array)
+    attr.default = hint
+
+
+def _author_bounds(asset_path: str, main_path: str, id_path: str, core: str) -> Optional[List[List[float]]]:
+    """Author `extentsHint` on /World/<core> of the id layer, on the asset prim of the
+    main layer (the prims carrying the arcs) and on the asset layer's root prim.
+
+    Bounds come from the composed id stage (geometry is loaded once, here).
+    Returns the world-space [min, max] of the id prim, or None when it has no geometry.
+    """
+    for path in (asset_path, main_path, id_path):
+        stale = Sdf.Layer.Find(path)   # open from an earlier build in this session
+        if stale is not None:
+            stale.Reload(force=True)
+    _io("read")
+    stage = Usd.Stage.Open(id_path)
+    if stage is None:
+        raise RuntimeError(f"Could not open {id_path}")
+    id_prim = stage.GetDefaultPrim().GetChild(core) if stage.GetDefaultPrim() else Usd.Prim()
+    if not id_prim:
+        raise RuntimeError(f"No /{core} prim under the default prim of {id_path}")
+    cache = UsdGeom.BBoxCache(Usd.TimeCode.Default(), [UsdGeom.Tokens.default_, UsdGeom.Tokens.render])
+    world = cache.ComputeWorldBound(id_prim).ComputeAlignedRange()
+    if world.IsEmpty():
+        return None
+
+    id_layer = stage.GetRootLayer()
+    _set_extents_hint(id_layer, id_prim.GetPath(), UsdGeom.ModelAPI(id_prim).ComputeExtentsHint(cache))
+    edited = [id_layer]
+    asset_prim = id_prim.GetChild("ASSET").GetChild(f"asset_{core}")
+    if asset_prim:
+        asset_hint = UsdGeom.ModelAPI(asset_prim).ComputeExtentsHint(cache)
+        asset_layer = Sdf.Layer.Find(asset_path)
+        if asset_layer is not None and asset_layer.defaultPrim:
+            _set_extents_hint(asset_layer, Sdf.Path.absoluteRootPath.AppendChild(asset_layer.defaultPrim), asset_hint)
+            edited.append(asset_layer)
+        main_layer = Sdf.Layer.Find(main_path)
+        if main_layer is not None and main_layer.defaultPrim:
+            _set_extents_hint(main_layer, Sdf.Path(f"/{main_layer.defaultPrim}/ASSET/asset_{core}"), asset_hint)
+            edited.append(main_layer)
+    for layer in edited:
+        _io("write")
+        if not layer.Save():
+            raise RuntimeError(f"Could not write layer: {layer.identifier}")
+        _mark_written(layer.identifier)
+    return [[float(v) for v in world.GetMin()], [float(v) for v in world.GetMax()]]
+
+
+def _package_usdz(root_layer: str, usdz_path: str) -> bool:
+    """Bundle `root_layer` and everything it depends on into one `.usdz` archive."""
+    if _is_ov_url(usdz_path) and omni is None:
+        return False
+    _io("write")
+    ok = bool(UsdUtils.CreateNewUsdzPackage(Sdf.AssetPath(root_layer), usdz_path))
+    if ok:
+        _mark_written(usdz_path)
+    return ok
+
+
+# ============================== Per-item Build ================================
+
+@dataclass
+class BuildOptions:
+    """Run-wide settings shared by every item (must stay picklable for process pools)."""
+    out_root: str
+    id_suffix: str = "TEMP00000001"
+    overwrite: bool = False
+    mat_path_override: str = ""
+    inplace_ok: bool = False
+    incremental: bool = False   # rebuild only items whose manifest inputs changed
+    dedup_materials: bool = False   # store identical material files once (see dedup.py)
+    dependency_copy: bool = False   # copy the max layer's dependency closure, not all of Materials/ (deps.py)
+    sync: str = SYNC_OFF            # with overwrite: keep outputs that already match (SYNC_*)
+    asset_encoding: str = ENCODING_DEFAULT   # ENCODING_* per authored layer role
+    main_encoding: str = ENCODING_DEFAULT
+    id_encoding: str = ENCODING_DEFAULT
+    usdz: bool = False              # also package each main layer as <CORE>/<core>.usdz
+    bounds: bool = False            # author extentsHint on the id / asset roots, report world bounds
+    arc: str = ARC_REFERENCE        # ARC_* used by main -> asset and id -> main
+    resumed: bool = False           # continuing a journaled run: only complete trios count as "exists"
+
+
+# Stages of one item, in build order (recorded in ItemResult.stages / the run journal).
+STAGE_MAX = "max"
+STAGE_MATERIALS = "materials"
+STAGE_ASSET = "asset"
+STAGE_MAIN = "main"
+STAGE_ID = "id"
+STAGES = (STAGE_MAX, STAGE_MATERIALS, STAGE_ASSET, STAGE_MAIN, STAGE_ID)
+# Also timed, but not journaled: the up-front decision probes, the bounds pass
+# (part of the id stage) and the optional usdz package.
+STAGE_CHECK = "check"
+STAGE_BOUNDS = "bounds"
+STAGE_USDZ = "usdz"
+TIMED_STAGES = (STAGE_CHECK,) + STAGES + (STAGE_BOUNDS, STAGE_USDZ)
+
+
+@dataclass
+class ItemResult:
+    """Outcome of one source item. `status` is 'done', 'skipped', 'failed' or 'cancelled'."""
+    src: str
+    status: str = "failed"
+    logs: List[Tuple[str, str]] = field(default_factory=list)
+    manifest_entry: Optional[dict] = None   # set when built/adopted in incremental mode
+    stats: Dict[str, int] = field(default_factory=dict)   # per-item counters (bytes, dedup hits, ...)
+    stages: List[str] = field(default_factory=list)       # STAGE_* completed so far
+    timings: Dict[str, float] = field(default_factory=dict)          # seconds per TIMED_STAGES entry
+    io: Dict[str, Dict[str, int]] = field(default_factory=dict)      # per stage: requests by op, "bytes" moved
+    missing_deps: List[str] = field(default_factory=list)            # unresolved asset paths (dependency copy)
+    bounds: Optional[List[List[float]]] = None                       # world-space [min, max] of the id prim
+
+
+@contextlib.contextmanager
+def _timed(res: ItemResult, stage: str):
+    """Time one stage of `res` and account the I/O this thread makes meanwhile to it."""
+    rec = res.io.setdefault(stage, {})
+    prev = getattr(_meter, "rec", None)
+    _meter.rec = rec
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        res.timings[stage] = res.timings.get(stage, 0.0) + (time.perf_counter() - t0)
+        _meter.rec = prev
+
+
+def _rollback(authored: List[Tuple[str, str]], res: ItemResult, log: "_ItemLog") -> None:
+    """Delete the layers this attempt authored (newest first) and forget their stages."""
+    for stage, path in reversed(authored):
+        try:
+            if _is_ov_url(path):
+                if omni is not None:
+                    _io("delete")
+                    omni.client.delete(path)
+            elif os.path.exists(path):
+                _io("delete")
+                os.remove(path)
+            _mark_deleted(path)
+            log.info(f"  rolled back: {path}")
+        except Exception as e:
+            log.warn(f"  could not roll back {path}: {e}")
+        if stage in res.stages:
+            res.stages.remove(stage)
+
+
+def _stage_done(res: ItemResult, stage: str, done_stages: set) -> None:
+    """Stage boundary reached: record `stage` in the result and, unless a resumed run had it already, the journal."""
+    res.stages.append(stage)
+    stage_log = _stage_log.get()
+    if stage_log is not None and stage not in done_stages:
+        stage_log(res.src, stage)
+
+
+class _ItemLog:
+    """Collects log lines for one item so they can be replayed on the UI thread."""
+
+    def __init__(self, lines: List[Tuple[str, str]]):
+        self._lines = lines
+
+    def info(self, msg: str):  self._lines.append(("INFO", msg))
+    def warn(self, msg: str):  self._lines.append(("WARN", msg))
+    def error(self, msg: str): self._lines.append(("ERROR", msg))
+
+    def styled(self, msg: str):
+        """Accept pre-tagged '[LEVEL] text' strings from the copy helpers."""
+        txt = msg.strip()
+        for lvl in ("ERROR", "WARN", "INFO"):
+            tag = f"[{lvl}]"
+            if txt.startswith(tag):
+                self._lines.append((lvl, txt[len(tag):].lstrip()))
+                return
+        self._lines.append(("INFO", txt))
+
+
+def _is_loop_unsafe(src_core_dir: str, out_core_dir: str, inplace_ok: bool) -> bool:
+    same_dir = _is_same_path(out_core_dir, src_core_dir)
+    overlap = _is_inside(out_core_dir, src_core_dir) or _is_inside(src_core_dir, out_core_dir)
+    return overlap or (same_dir and not inplace_ok)
+
+
+def plan_output_dirs(sources: Iterable[str], opts: BuildOptions) -> List[str]:
+    """Unique output directories a run will need (output root + one <CORE> folder per item)."""
+    dirs = {opts.out_root}
+    for src in sources:
+        core = _derive_names(src, opts.id_suffix)[0]
+        out_core_dir = _join(opts.out_root, core)
+        if not _is_loop_unsafe(_dirname(src), out_core_dir, opts.inplace_ok):
+            dirs.add(out_core_dir)
+    return sorted(dirs, key=lambda d: (len(d), d))
+
+
+def create_output_dirs(dirs: List[str], cache: Optional[IOCache] = None, workers: int = 8) -> int:
+    """Create the planned directories once, up front, recording them in `cache`.
+
+    The cache is passed down explicitly (not installed globally), so runs of
+    several queue jobs at once never see each other's cache.
+    """
+    if not dirs:
+        return 0
+
+    def _mk(d):
+        (_ensure_dir_ov if _is_ov_url(d) else _ensure_dir_local)(d, cache)
+
+    _mk(dirs[0])  # shared root first so the children only create their own leaf
+    with cf.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(_mk, dirs[1:]))
+    return len(dirs)
+
+
+def _manifest_entry(fp: dict, opts: BuildOptions, asset_path: str, main_path: str, id_path: str) -> dict:
+    return {
+        "src": fp["src"],
+        "materials": fp["materials"],
+        "mat_override": opts.mat_path_override,
+        "id_suffix": opts.id_suffix,
+        "outputs": {"asset": asset_path, "main": main_path, "id": id_path},
+        "encoding": _encoding_key(opts),
+    }
+
+
+def _encoding_key(opts: BuildOptions) -> dict:
+    """Non-default output encodings only, so older manifest entries still compare equal."""
+    key = {role: enc for role, enc in (("asset", opts.asset_encoding), ("main", opts.main_encoding),
+                                        ("id", opts.id_encoding)) if enc}
+    if opts.usdz:
+        key["usdz"] = True
+    if opts.bounds:
+        key["bounds"] = True
+    if opts.arc != ARC_REFERENCE:
+        key["arc"] = opts.arc
+    return key
+
+
+def _entry_up_to_date(prev: dict, entry: dict) -> bool:
+    ps, es = prev.get("src") or {}, entry["src"] or {}
+    return (ps.get("sha1") is not None and ps.get("sha1") == es.get("sha1")
+            and prev.get("materials") == entry["materials"]
+            and prev.get("mat_override") == entry["mat_override"]
+            and prev.get("id_suffix") == entry["id_suffix"]
+            and prev.get("outputs") == entry["outputs"]
+            and prev.get("encoding", {}) == entry["encoding"])
+
+
+@dataclass
+class _Decision:
+    """What `build_item` will do with one source; shared with the dry-run planner."""
+    action: str                   # 'build', 'skipped' or 'failed'
+    reason: str = ""              # log line for skipped / failed items
+    core: str = ""
+    src_core_dir: str = ""
+    out_core_dir: str = ""
+    asset_path: str = ""
+    main_path: str = ""
+    id_path: str = ""
+    inplace_mode: bool = False
+    overwrite: bool = False       # for the max copy and the trio
+    mat_overwrite: bool = False   # for the Materials copy
+    entry: Optional[dict] = None  # manifest entry (incremental mode)
+    deps: Optional[object] = None  # deps.DepClosure, when the incremental check already resolved it
+
+
+def _decide(src: str, opts: BuildOptions, prev: Optional[dict] = None,
+            done_stages: Iterable[str] = ()) -> _Decision:
+    """Loop safety, in-place mode, incremental check and overwrite guard for one source.
+
+    Reads only (stats, and hashes in incremental mode); nothing is created or written.
+    """
+    core, asset_name, main_name, id_name = _derive_names(src, opts.id_suffix)
+    src_core_dir = _dirname(src)
+    out_core_dir = _join(opts.out_root, core)
+
+    # Loop-safety & in-place mode
+    same_dir = _is_same_path(out_core_dir, src_core_dir)
+
+    if _is_loop_unsafe(src_core_dir, out_core_dir, opts.inplace_ok):
+        return _Decision("failed", "Invalid Output Root: it must NOT be inside/contain the source <CORE> folder. "
+                                   "If you want to build in-place, enable 'Allow Same Root (in-place)'. Skipped.")
+
+    d = _Decision("build", core=core, src_core_dir=src_core_dir, out_core_dir=out_core_dir,
+                  inplace_mode=same_dir and opts.inplace_ok,
+                  overwrite=opts.overwrite, mat_overwrite=opts.overwrite)
+
+    # File paths
+    d.asset_path = _ensure_usd_ext(_join(out_core_dir, asset_name))
+    d.main_path  = _ensure_usd_ext(_join(out_core_dir, main_name))
+    d.id_path    = _ensure_usd_ext(_join(opts.out_root, id_name))
+    asset_path, main_path, id_path = d.asset_path, d.main_path, d.id_path
+
+    if opts.incremental:
+        if opts.dependency_copy and not d.inplace_mode:
+            from .deps import compute_dependencies
+            d.deps = compute_dependencies(src)
+            materials_fp = d.deps.fingerprint()
+        else:
+            materials_fp = _materials_fingerprint(src_core_dir)
+        fp = {"src": _source_fingerprint(src, (prev or {}).get("src")), "materials": materials_fp}
+        d.entry = entry = _manifest_entry(fp, opts, asset_path, main_path, id_path)
+        outputs_present = _exists(asset_path) and _exists(main_path) and _exists(id_path)
+        if prev and outputs_present and _entry_up_to_date(prev, entry):
+            d.action, d.reason = "skipped", f"Up to date: {src}"
+            return d
+        if not prev and outputs_present and not opts.overwrite:
+            # First incremental run over an existing tree: record a baseline, do not rebuild.
+            d.action, d.reason = "skipped", f"Adopted into manifest (exists): {src}"
+            return d
+        # Inputs changed: refresh outputs; only recopy Materials if that tree changed.
+        d.overwrite = True
+        d.mat_overwrite = opts.overwrite or not prev or prev.get("materials") != entry["materials"]
+
+    # Overwrite guard (a resumed item's outputs are this run's own; an item that was
+    # in flight when the run stopped may have left only part of its trio)
+    elif not opts.overwrite and not done_stages and (
+            (_exists(asset_path) and _exists(main_path) and _exists(id_path)) if opts.resumed
+            else (_exists(asset_path) or _exists(main_path) or _exists(id_path))):
+        d.action, d.reason = "skipped", f"Skipped (exists): {src}"
+    return d
+
+
+def _copy_dependency_closure(src: str, d: _Decision, max_dst: str, overwrite: bool, opts: BuildOptions,
+                             res: ItemResult, log: "_ItemLog") -> None:
+    """Materials stage in dependency mode: copy what `src` depends on, report what is missing."""
+    from .deps import compute_dependencies, dep_pairs, copy_dependencies
+    closure = d.deps or compute_dependencies(src)
+    pairs, outside = dep_pairs(closure, d.out_core_dir, opts.out_root)
+    log.info(f"  dependencies: {len(closure.files)} files, {len(closure.missing)} missing")
+    for path in outside + closure.elsewhere:
+        log.warn(f"  dependency outside the output, referenced in place: {path}")
+    for path in closure.missing:
+        log.warn(f"  missing dependency: {path}")
+    res.missing_deps = list(closure.missing)
+    if closure.missing:
+        res.stats["deps_missing"] = len(closure.missing)
+    if opts.dedup_materials:
+        from .dedup import copy_materials_dedup
+        copy_materials_dedup(d.src_core_dir, d.out_core_dir, opts.out_root, max_dst, overwrite,
+                             log.styled, res.stats, opts.sync, pairs=pairs)
+    else:
+        copy_dependencies(pairs, overwrite, log.styled, opts.sync, res.stats)
+
+
+def build_item(src: str, opts: BuildOptions, prev: Optional[dict] = None,
+               done_stages: Iterable[str] = ()) -> ItemResult:
+    """Copy max + Materials and author the asset/main/id trio for one source.
+
+    `prev` is this source's manifest entry from the last run (incremental mode).
+    `done_stages` are STAGE_* an interrupted run already completed for this
+    source (resume); they are not redone.
+    Never raises: every failure is recorded in the returned result so one bad
+    item cannot stop the batch.
+    """
+    res = ItemResult(src)
+    log = _ItemLog(res.logs)
+    out_root = opts.out_root
+    done_stages = set(done_stages)
+    authored: List[Tuple[str, str]] = []   # (stage, layer) written by this attempt, for rollback
+    try:
+        _checkpoint()
+        with _timed(res, STAGE_CHECK):
+            d = _decide(src, opts, prev, done_stages)
+        if d.action == "failed":
+            log.error(d.reason)
+            return res
+        if d.action == "skipped":
+            log.info(d.reason)
+            res.status = "skipped"
+            res.manifest_entry = d.entry
+            if opts.bounds and prev and prev.get("bounds") and d.entry is not None:
+                res.bounds = d.entry["bounds"] = prev["bounds"]   # unchanged: keep the recorded bounds
+            return res
+
+        core, src_core_dir, out_core_dir = d.core, d.src_core_dir, d.out_core_dir
+        asset_path, main_path, id_path = d.asset_path, d.main_path, d.id_path
+        inplace_mode, overwrite, mat_overwrite, entry = d.inplace_mode, d.overwrite, d.mat_overwrite, d.entry
+
+        # Prepare output dirs
+        with _timed(res, STAGE_CHECK):
+            (_ensure_dir_ov if _is_ov_url(out_core_dir) else _ensure_dir_local)(out_core_dir)
+            (_ensure_dir_ov if _is_ov_url(out_root) else _ensure_dir_local)(out_root)
+
+        log.info(f"Processing: {src}")
+        log.info(f"  CORE src : {src_core_dir}")
+        log.info(f"  CORE out : {out_core_dir}")
+        log.info(f"  id out   : {out_root}")
+        log.info(f"  in-place : {'ON' if inplace_mode else 'OFF'}")
+        if done_stages:
+            log.info(f"  resumed  : {', '.join(s for s in STAGES if s in done_stages)} already done")
+
+        # max_<CORE>.usd
+        _checkpoint()
+        if inplace_mode:
+            max_dst = src
+            log.info("  max: in-place mode - no copy (using original)")
+        else:
+            max_dst = _join(out_core_dir, os.path.basename(src))
+            if STAGE_MAX not in done_stages:
+                with _timed(res, STAGE_MAX):
+                    copied = _copy_file_any_scheme(src, max_dst, overwrite, log.styled, opts.sync, res.stats)
+                    if not copied and not _exists(max_dst):
+                        return res
+        _stage_done(res, STAGE_MAX, done_stages)
+
+        # Materials/
+        _checkpoint()
+        if STAGE_MATERIALS in done_stages:
+            log.info("  Materials: copied before the run was interrupted.")
+        elif inplace_mode:
+            log.info("  Materials: in-place mode - skip copy (already alongside max).")
+        elif opts.dependency_copy:
+            with _timed(res, STAGE_MATERIALS):
+                _copy_dependency_closure(src, d, max_dst, mat_overwrite, opts, res, log)
+        elif opts.dedup_materials:
+            from .dedup import copy_materials_dedup
+            with _timed(res, STAGE_MATERIALS):
+                _mat_ok = copy_materials_dedup(src_core_dir, out_core_dir, out_root, max_dst,
+                                               mat_overwrite, log.styled, res.stats, opts.sync)
+            if not _mat_ok:
+                log.warn("Materials not copied or not found. If max references './Materials/...', textures may miss.")
+        else:
+            with _timed(res, STAGE_MATERIALS):
+                _mat_ok = _copy_materials_any_scheme(src_core_dir, out_core_dir, mat_overwrite, log.styled,
+                                                     opts.sync, res.stats)
+            if not _mat_ok:
+                log.warn("Materials not copied or not found. If max references './Materials/...', textures may miss.")
+        _stage_done(res, STAGE_MATERIALS, done_stages)
+
+        # Build trio: asset -> main -> id
+        a_path, m_path = asset_path, main_path
+        _checkpoint()
+        if STAGE_ASSET not in done_stages:
+            try:
+                log.info(f"  [1/3] asset -> {asset_path}")
+                with _timed(res, STAGE_ASSET):
+                    a_path = _build_asset(asset_path, max_dst, opts.mat_path_override, opts.asset_encoding)
+                authored.append((STAGE_ASSET, a_path))
+                log.info(f"      asset done: {a_path}")
+            except Exception as e_asset:
+                log.error(f"      asset failed: {e_asset}")
+                return res
+        _stage_done(res, STAGE_ASSET, done_stages)
+
+        _checkpoint()
+        if STAGE_MAIN not in done_stages:
+            try:
+                log.info(f"  [2/3] main  -> {main_path}")
+                with _timed(res, STAGE_MAIN):
+                    m_path = _build_main(main_path, a_path, core, opts.main_encoding, opts.arc)
+                authored.append((STAGE_MAIN, m_path))
+                log.info(f"      main done: {m_path}")
+            except Exception as e_main:
+                log.error(f"      main failed: {e_main}")
+                return res
+        _stage_done(res, STAGE_MAIN, done_stages)
+
+        _checkpoint()
+        if STAGE_ID not in done_stages:
+            try:
+                log.info(f"  [3/3] id    -> {id_path}")
+                with _timed(res, STAGE_ID):
+                    i_path = _build_id(id_path, m_path, core, opts.id_encoding, opts.arc)
+                log.info(f"      id done: {i_path}")
+            except Exception as e_id:
+                log.error(f"      id failed: {e_id}")
+                return res
+            if opts.bounds:
+                try:
+                    with _timed(res, STAGE_BOUNDS):
+                        res.bounds = _author_bounds(a_path, m_path, i_path, core)
+                    if res.bounds is None:
+                        log.warn("      bounds: no geometry, extentsHint not authored")
+                    else:
+                        log.info(f"      bounds: {res.bounds[0]} .. {res.bounds[1]}")
+                        if entry is not None:
+                            entry["bounds"] = res.bounds
+                except Exception as e_bounds:
+                    log.warn(f"      bounds failed: {e_bounds}")
+        _stage_done(res, STAGE_ID, done_stages)
+        authored.clear()   # the trio is complete: nothing left to roll back
+
+        if opts.usdz:
+            _checkpoint()
+            usdz_path = _join(out_core_dir, f"{core}.usdz")
+            try:
+                with _timed(res, STAGE_USDZ):
+                    packaged = _package_usdz(m_path, usdz_path)
+                if packaged:
+                    log.info(f"      usdz done: {usdz_path}")
+                else:
+                    log.warn(f"      usdz packaging failed: {usdz_path}")
+            except Exception as e_usdz:
+                log.warn(f"      usdz packaging failed: {e_usdz}")
+
+        res.status = "done"
+        res.manifest_entry = entry
+    except BuildCancelled:
+        # Copied files are whole and reused by Resume; a half-authored trio is not.
+        if authored:
+            log.warn(f"Cancelled mid-trio: {src}")
+            _rollback(authored, res, log)
+        else:
+            log.info(f"Cancelled: {src}")
+        res.status = "cancelled"
+    except Exception as e:
+        log.error(f"Failed: {src} -> {e}")
+        log.error(traceback.format_exc().rstrip())
+    return res
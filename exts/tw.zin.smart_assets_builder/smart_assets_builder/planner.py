@@ -0,0 +1,238 @@
+# SmartAssetsBuilder — planner.py
+# Dry run: what a build would copy, create and author, without writing a byte.
+#
+# Every item goes through the same `_decide` (loop safety, in-place mode,
+# incremental check, overwrite guard) and `_copy_verdict` (per-file overwrite /
+# sync rules) that `build_item` uses. Only reads happen: listings, stats, and
+# hashes where incremental or checksum sync needs them.
+
+import os
+import time
+import threading
+import concurrent.futures as cf
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from .pipeline import (
+    BuildOptions, _decide, _copy_verdict, _iter_tree_files, _stat_any, _read_bytes,
+    _is_ov_url, _join, _dirname, _kind, plan_output_dirs, run_context, COPY, omni,
+)
+from .iocache import IOCache, KIND_DIR
+from .deps import compute_dependencies, dep_pairs
+from .manifest import BuildManifest
+from .templates import ROLES, instantiate_template
+
+_PROBE_BYTES = 32 << 20   # read at most this much when measuring throughput
+
+
+@dataclass
+class ItemPlan:
+    """Planned work for one source."""
+    src: str
+    action: str = "build"        # 'build', 'skipped' or 'failed' (as build_item would decide)
+    reason: str = ""
+    files: int = 0               # files that would be copied
+    bytes: int = 0               # bytes that would be copied
+    kept: int = 0                # existing files left alone (overwrite off / already in sync)
+    layers: int = 0              # layers that would be authored (trio + usdz)
+    missing: List[str] = field(default_factory=list)   # unresolved dependencies (dependency copy)
+    dirs: List[str] = field(default_factory=list)   # destination folders the copies need
+
+
+@dataclass
+class BuildPlan:
+    """Dry-run result for a whole run, with a wall-time estimate."""
+    items: List[ItemPlan]
+    dirs_to_create: List[str]
+    workers: int
+    throughput_mbps: float = 0.0     # measured (or given) copy throughput
+    request_ms: float = 0.0          # mean per-file metadata round trip seen while planning
+    author_ms: float = 0.0           # per-trio authoring time (in memory)
+    plan_seconds: float = 0.0
+    notes: List[str] = field(default_factory=list)
+
+    def count(self, action: str) -> int:
+        return sum(1 for p in self.items if p.action == action)
+
+    @property
+    def files_to_copy(self) -> int:
+        return sum(p.files for p in self.items)
+
+    @property
+    def bytes_to_copy(self) -> int:
+        return sum(p.bytes for p in self.items)
+
+    @property
+    def layers_to_author(self) -> int:
+        return sum(p.layers for p in self.items)
+
+    @property
+    def est_seconds(self) -> float:
+        """Bytes at the measured throughput, plus per-file and per-trio costs spread over the workers."""
+        transfer = self.bytes_to_copy / (self.throughput_mbps * (1 << 20)) if self.throughput_mbps > 0 else 0.0
+        per_item = (self.files_to_copy * 2 * self.request_ms
+                    + self.count("build") * self.author_ms) / 1000.0
+        return transfer + per_item / max(1, self.workers)
+
+    def largest(self, n: int = 10) -> List[Tuple[str, int]]:
+        top = sorted((p for p in self.items if p.bytes), key=lambda p: p.bytes, reverse=True)[:n]
+        return [(p.src, p.bytes) for p in top]
+
+    def failures(self, n: int = 20) -> List[Tuple[str, str]]:
+        return [(p.src, p.reason) for p in self.items if p.action == "failed"][:n]
+
+    def missing(self, n: int = 20) -> List[Tuple[str, str]]:
+        return [(p.src, m) for p in self.items for m in p.missing][:n]
+
+    def summary(self, top: int = 10) -> dict:
+        return {
+            "items": len(self.items), "build": self.count("build"),
+            "skipped": self.count("skipped"), "failed": self.count("failed"),
+            "files_to_copy": self.files_to_copy, "bytes_to_copy": self.bytes_to_copy,
+            "files_kept": sum(p.kept for p in self.items),
+            "dirs_to_create": len(self.dirs_to_create), "layers_to_author": self.layers_to_author,
+            "workers": self.workers, "throughput_mbps": round(self.throughput_mbps, 1),
+            "request_ms": round(self.request_ms, 3), "author_ms": round(self.author_ms, 3),
+            "est_seconds": round(self.est_seconds, 1), "plan_seconds": round(self.plan_seconds, 3),
+            "missing_deps": sum(len(p.missing) for p in self.items),
+            "largest": self.largest(top), "failures": self.failures(top), "missing": self.missing(top),
+            "notes": list(self.notes),
+        }
+
+
+# ================================ Per Item ===================================
+
+class _Timer:
+    """Mean duration of the metadata requests made while planning (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.n = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.n += 1
+            self.total += seconds
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total / self.n * 1000.0 if self.n else 0.0
+
+
+def _plan_copy(ip: ItemPlan, src: str, dst: str, overwrite: bool, sync: str, timer: _Timer) -> None:
+    t0 = time.perf_counter()
+    verdict, size = _copy_verdict(src, dst, overwrite, sync)
+    if verdict == COPY and size is None:
+        size = (_stat_any(src) or (0, 0.0))[0]
+    timer.add(time.perf_counter() - t0)
+    if verdict == COPY:
+        ip.files += 1
+        ip.bytes += size
+        parent = _dirname(dst)
+        if parent not in ip.dirs:
+            ip.dirs.append(parent)
+    else:
+        ip.kept += 1
+
+
+def plan_item(src: str, opts: BuildOptions, prev: Optional[dict] = None, timer: Optional[_Timer] = None) -> ItemPlan:
+    """What `build_item(src, opts, prev)` would do, without doing it."""
+    timer = timer or _Timer()
+    ip = ItemPlan(src)
+    try:
+        d = _decide(src, opts, prev)
+    except Exception as e:
+        ip.action, ip.reason = "failed", f"Failed: {src} -> {e}"
+        return ip
+    if d.action != "build":
+        ip.action, ip.reason = d.action, d.reason
+        return ip
+
+    ip.dirs.append(d.out_core_dir)
+    if not d.inplace_mode:
+        _plan_copy(ip, src, _join(d.out_core_dir, os.path.basename(src)), d.overwrite, opts.sync, timer)
+        src_mat = _join(d.src_core_dir, "Materials")
+        if opts.dependency_copy:
+            closure = d.deps or compute_dependencies(src)
+            ip.missing = list(closure.missing)
+            for f, dst in dep_pairs(closure, d.out_core_dir, opts.out_root)[0]:
+                _plan_copy(ip, f, dst, d.mat_overwrite, opts.sync, timer)
+        elif (not _is_ov_url(src_mat) or omni is not None) and _kind(src_mat) == KIND_DIR:
+            dst_mat = _join(d.out_core_dir, "Materials")
+            for rel, f in _iter_tree_files(src_mat):
+                _plan_copy(ip, f, _join(dst_mat, *rel.split("/")), d.mat_overwrite, opts.sync, timer)
+    ip.layers = 3 + (1 if opts.usdz else 0)
+    return ip
+
+
+# ================================= Probes ====================================
+
+def _measure_throughput(sources: List[str]) -> float:
+    """Read rate (MB/s) of the largest of the first sources (Nucleus: within the probe budget)."""
+    best, best_size = None, 0
+    for src in sources[:64]:
+        st = _stat_any(src)
+        if st and st[0] > best_size and (st[0] <= _PROBE_BYTES or not _is_ov_url(src)):
+            best, best_size = src, st[0]
+    if best is None:
+        return 0.0
+    t0 = time.perf_counter()
+    if _is_ov_url(best):
+        data = _read_bytes(best)
+        n = len(data) if data else 0
+    else:
+        with open(best, "rb") as f:
+            n = len(f.read(_PROBE_BYTES))
+    dt = time.perf_counter() - t0
+    return (n / (1 << 20)) / dt if n and dt > 0 else 0.0
+
+
+def _measure_authoring(repeat: int = 5) -> float:
+    """Milliseconds to clone and serialize one asset/main/id trio in memory."""
+    for role in ROLES:
+        instantiate_template(role)  # prepare the templates outside the measurement
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for role in ROLES:
+            layer, _world = instantiate_template(role)
+            layer.ExportToString()
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+
+# ================================== Plan =====================================
+
+def plan_build(sources: Iterable[str], opts: BuildOptions, workers: int = 8,
+               manifest: Optional[BuildManifest] = None, throughput_mbps: float = 0.0) -> BuildPlan:
+    """Dry-run every source with `workers` threads; nothing is created or written.
+
+    `throughput_mbps` overrides the measured copy throughput (e.g. a known link speed).
+    """
+    sources = list(sources)
+    t0 = time.perf_counter()
+    timer = _Timer()
+    # The plan's own stat cache, handed to each planner thread through a context of its
+    # own: nothing is installed globally, so a plan may overlap a build or another plan.
+    ctx = run_context(io_cache=IOCache())
+
+    def _one(src):
+        prev = manifest.get(src) if (manifest is not None and opts.incremental) else None
+        return ctx.copy().run(plan_item, src, opts, prev, timer)
+
+    with cf.ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="SmartAssetsPlan") as pool:
+        items = list(pool.map(_one, sources))
+
+    wanted = set(plan_output_dirs(sources, opts))
+    for ip in items:
+        wanted.update(ip.dirs)
+    dirs = ctx.copy().run(lambda: [d for d in sorted(wanted, key=lambda d: (len(d), d)) if _kind(d) != KIND_DIR])
+
+    plan = BuildPlan(items=items, dirs_to_create=dirs, workers=max(1, workers),
+                     request_ms=timer.mean_ms, author_ms=_measure_authoring())
+    plan.throughput_mbps = throughput_mbps if throughput_mbps > 0 else _measure_throughput(sources)
+    if opts.dedup_materials:
+        plan.notes.append("Dedup is on: bytes_to_copy is an upper bound (duplicates are stored once).")
+    if throughput_mbps <= 0:
+        plan.notes.append("Throughput is a source read probe; writes to the output may be slower.")
+    plan.plan_seconds = time.perf_counter() - t0
+    return plan
@@ -0,0 +1,215 @@
+# SmartAssetsBuilder — report.py
+# Build report: per-stage timing (p50/p95), bytes moved and I/O request counts
+# aggregated over every item of a run, plus the live items/sec + ETA meter.
+#
+# The JSON report is written next to the output as `smart_assets_builder.report.json`.
+
+import json
+import time
+import collections
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .pipeline import ItemResult, TIMED_STAGES, _join, _write_bytes
+
+REPORT_NAME = "smart_assets_builder.report.json"
+REPORT_VERSION = 1
+STAGE_SCAN = "scan"
+
+_SLOWEST = 10
+
+
+def report_path(out_root: str) -> str:
+    return _join(out_root, REPORT_NAME)
+
+
+def _pct(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """'m:ss' or 'h:mm:ss' ('--:--' when unknown)."""
+    if seconds is None or seconds != seconds or seconds < 0:
+        return "--:--"
+    s = int(round(seconds))
+    h, rem = divmod(s, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+class RateMeter:
+    """Items per second over the last `window` seconds, and the ETA it implies."""
+
+    def __init__(self, window: float = 10.0):
+        self.window = window
+        self._t0 = time.perf_counter()
+        self._marks: Deque[Tuple[float, int]] = collections.deque([(self._t0, 0)])
+
+    def update(self, done: int) -> None:
+        now = time.perf_counter()
+        self._marks.append((now, done))
+        while len(self._marks) > 2 and now - self._marks[0][0] > self.window:
+            self._marks.popleft()
+
+    @property
+    def rate(self) -> float:
+        (t_a, n_a), (t_b, n_b) = self._marks[0], self._marks[-1]
+        return (n_b - n_a) / (t_b - t_a) if t_b > t_a else 0.0
+
+    def eta(self, remaining: int) -> Optional[float]:
+        r = self.rate
+        return remaining / r if r > 0 else None
+
+
+class BuildReport:
+    """Aggregates `ItemResult.timings` / `.io` of a run into stage statistics.
+
+    Feed it every result with `add()`, then `finish()`; `table()` gives the
+    console summary and `write()` the JSON report.
+    """
+
+    def __init__(self, out_root: str, workers: int = 0, mode: str = ""):
+        self.out_root = out_root
+        self.workers = workers
+        self.mode = mode
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.wall_seconds = 0.0
+        self.scan_seconds: Optional[float] = None
+        self.scan_found = 0
+        self.counts: Dict[str, int] = {"done": 0, "skipped": 0, "failed": 0, "cancelled": 0}
+        self._samples: Dict[str, List[float]] = {s: [] for s in TIMED_STAGES}
+        self._bytes: Dict[str, int] = {s: 0 for s in TIMED_STAGES}
+        self._calls: Dict[str, Dict[str, int]] = {s: {} for s in TIMED_STAGES}
+        self._item_seconds: List[Tuple[float, str]] = []
+        self._missing: Dict[str, List[str]] = {}
+        self._bounds: Dict[str, List[List[float]]] = {}
+
+    def set_scan(self, seconds: float, found: int) -> None:
+        self.scan_seconds, self.scan_found = seconds, found
+
+    def add(self, res: ItemResult) -> None:
+        self.counts[res.status if res.status in self.counts else "failed"] += 1
+        for stage, sec in res.timings.items():
+            self._samples.setdefault(stage, []).append(sec)
+        for stage, rec in res.io.items():
+            calls = self._calls.setdefault(stage, {})
+            for op, n in rec.items():
+                if op == "bytes":
+                    self._bytes[stage] = self._bytes.get(stage, 0) + n
+                else:
+                    calls[op] = calls.get(op, 0) + n
+        if res.bounds:
+            self._bounds[res.src] = res.bounds
+        if res.missing_deps:
+            self._missing[res.src] = list(res.missing_deps)
+        if res.timings:
+            self._item_seconds.append((sum(res.timings.values()), res.src))
+
+    def finish(self) -> "BuildReport":
+        self.wall_seconds = time.perf_counter() - self._t0
+        return self
+
+    # ---------- Views ----------
+    @property
+    def items(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def bytes_moved(self) -> int:
+        return sum(self._bytes.values())
+
+    def calls(self) -> Dict[str, int]:
+        total: Dict[str, int] = {}
+        for rec in self._calls.values():
+            for op, n in rec.items():
+                total[op] = total.get(op, 0) + n
+        return dict(sorted(total.items()))
+
+    def bounds_union(self) -> Optional[List[List[float]]]:
+        """World-space [min, max] around every recorded item bound."""
+        if not self._bounds:
+            return None
+        lo = [min(b[0][i] for b in self._bounds.values()) for i in range(3)]
+        hi = [max(b[1][i] for b in self._bounds.values()) for i in range(3)]
+        return [lo, hi]
+
+    def stage_rows(self) -> List[dict]:
+        rows = []
+        if self.scan_seconds is not None:
+            rows.append({"stage": STAGE_SCAN, "n": 1, "total_s": round(self.scan_seconds, 3),
+                         "mean_ms": round(self.scan_seconds * 1000.0, 2), "p50_ms": None, "p95_ms": None,
+                         "max_ms": None, "bytes": 0, "mb_s": None, "calls": {}})
+        for stage in TIMED_STAGES:
+            ordered = sorted(self._samples.get(stage) or ())
+            if not ordered:
+                continue
+            total = sum(ordered)
+            nbytes = self._bytes.get(stage, 0)
+            rows.append({
+                "stage": stage, "n": len(ordered), "total_s": round(total, 3),
+                "mean_ms": round(total / len(ordered) * 1000.0, 2),
+                "p50_ms": round(_pct(ordered, 0.50) * 1000.0, 2),
+                "p95_ms": round(_pct(ordered, 0.95) * 1000.0, 2),
+                "max_ms": round(ordered[-1] * 1000.0, 2),
+                "bytes": nbytes,
+                # per-worker rate: bytes over the time the stage itself took
+                "mb_s": round(nbytes / (1 << 20) / total, 2) if nbytes and total > 0 else None,
+                "calls": dict(sorted(self._calls.get(stage, {}).items())),
+            })
+        return rows
+
+    def to_dict(self) -> dict:
+        wall = self.wall_seconds or (time.perf_counter() - self._t0)
+        return {
+            "version": REPORT_VERSION, "out_root": self.out_root, "started": self.started,
+            "wall_seconds": round(wall, 3), "workers": self.workers, "mode": self.mode,
+            "items": self.items, **self.counts,
+            "items_per_s": round(self.items / wall, 2) if wall > 0 else 0.0,
+            "bytes_moved": self.bytes_moved,
+            "mb_per_s": round(self.bytes_moved / (1 << 20) / wall, 2) if wall > 0 else 0.0,
+            "scan": {"seconds": self.scan_seconds, "found": self.scan_found} if self.scan_seconds is not None else None,
+            "calls": self.calls(), "stages": self.stage_rows(),
+            "slowest": [{"src": src, "seconds": round(sec, 3)}
+                        for sec, src in sorted(self._item_seconds, reverse=True)[:_SLOWEST]],
+            "missing_dependencies": dict(sorted(self._missing.items())),
+            "bounds": {"union": self.bounds_union(), "items": dict(sorted(self._bounds.items()))}
+                      if self._bounds else None,
+        }
+
+    def table(self) -> List[str]:
+        """Fixed-width summary lines for the console."""
+        d = self.to_dict()
+        lines = [f"{'stage':<10}{'n':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+                 f"{'MB':>10}{'MB/s':>9}  requests"]
+
+        def _num(v, fmt):
+            return format(v, fmt) if v is not None else "-"
+
+        for r in d["stages"]:
+            calls = " ".join(f"{op}={n}" for op, n in r["calls"].items())
+            lines.append(f"{r['stage']:<10}{r['n']:>7}{r['total_s']:>10.2f}{_num(r['p50_ms'], '>10.1f'):>10}"
+                         f"{_num(r['p95_ms'], '>10.1f'):>10}{_num(r['max_ms'], '>10.1f'):>10}"
+                         f"{r['bytes'] / (1 << 20):>10.1f}{_num(r['mb_s'], '>9.1f'):>9}  {calls}")
+        cancelled = f", {d['cancelled']} cancelled" if d["cancelled"] else ""
+        lines.append(f"{d['items']} items ({d['done']} done, {d['skipped']} skipped, {d['failed']} failed{cancelled}) in "
+                     f"{d['wall_seconds']:.1f}s: {d['items_per_s']:.1f} items/s, "
+                     f"{d['bytes_moved'] / (1 << 20):.1f} MB moved ({d['mb_per_s']:.1f} MB/s)")
+        union = self.bounds_union()
+        if union is not None:
+            lines.append(f"bounds of {len(self._bounds)} items: "
+                         f"({', '.join(f'{v:g}' for v in union[0])}) .. ({', '.join(f'{v:g}' for v in union[1])})")
+        if self._missing:
+            lines.append(f"{sum(len(m) for m in self._missing.values())} missing dependencies "
+                         f"in {len(self._missing)} items (see missing_dependencies in the report)")
+        return lines
+
+    def write(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the JSON report (default: next to the output); returns its path, None on failure."""
+        path = path or report_path(self.out_root)
+        data = json.dumps(self.to_dict(), indent=2).encode("utf-8")
+        try:
+            return path if _write_bytes(path, data) else None
+        except OSError:
+            return None
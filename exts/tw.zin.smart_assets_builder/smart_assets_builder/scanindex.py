@@ -0,0 +1,169 @@
+# SmartAssetsBuilder — scanindex.py
+# Persistent index of a scanned source tree, so a rescan only re-lists folders
+# that changed and can report which sources were added, removed or modified.
+#
+# Per folder the index keeps its mtime, its sub-folders and the matching files
+# (size + mtime). On a rescan a folder whose mtime is unchanged is not listed
+# again: its sub-folders are taken from the index (and visited in turn, since a
+# change deeper down does not touch the parent's mtime) and so are its matching
+# files. Only files modified within _RACY_SECONDS of the last listing are stat'ed
+# again, since they may still have been written to.
+
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .journal import STATE_DIR
+
+INDEX_VERSION = 1
+
+# A folder modified this recently may change again within the same mtime tick,
+# so its cached listing is not trusted on the next scan (re-listed instead).
+_RACY_SECONDS = 2.0
+
+
+def index_path(root: str, pattern: str, recursive: bool) -> str:
+    key = f"{root.rstrip('/').rstrip(os.sep)}|{pattern}|{int(bool(recursive))}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(STATE_DIR, "index", f"{digest}.json")
+
+
+@dataclass
+class ScanDelta:
+    """Difference between the previous scan of a tree and this one."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    dirs_listed: int = 0      # folders actually listed this scan
+    dirs_reused: int = 0      # folders answered from the index
+    first_scan: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class ScanIndex:
+    """Folder listings of one (root, pattern, recursive) scan, kept across sessions.
+
+    Shared by the scanner's listing threads; `finish()` drops folders the scan
+    no longer reached and returns the delta, `save()` persists the index.
+    """
+
+    def __init__(self, root: str, pattern: str, recursive: bool = True):
+        self.root = root
+        self.pattern = pattern
+        self.recursive = recursive
+        self.path = index_path(root, pattern, recursive)
+        # folder -> {"mtime": m or None, "seen": listed at, "dirs": [child folders],
+        #            "files": {path: [size, mtime]}}
+        self.dirs: Dict[str, dict] = {}
+        self._before: Dict[str, Tuple[int, float]] = {}
+        self._visited = set()
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.reuse = True           # False: list every folder again (full rescan), still diffing
+        self.dirs_listed = 0
+        self.dirs_reused = 0
+
+    @classmethod
+    def load(cls, root: str, pattern: str, recursive: bool = True) -> "ScanIndex":
+        idx = cls(root, pattern, recursive)
+        try:
+            with open(idx.path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            doc = None
+        if doc and doc.get("version") == INDEX_VERSION and doc.get("root") == root:
+            idx.dirs = dict(doc.get("dirs") or {})
+            idx.loaded = True
+        idx._before = idx.matches()
+        return idx
+
+    # ---------- Used by Scanner (any thread) ----------
+    def cached(self, folder: str, mtime) -> Optional[dict]:
+        """The stored listing of `folder` if its mtime still matches, else None."""
+        entry = self.dirs.get(folder) if self.reuse else None
+        if entry is None or mtime is None or entry.get("mtime") != mtime:
+            return None
+        with self._lock:
+            self._visited.add(folder)
+            self.dirs_reused += 1
+        return entry
+
+    def store(self, folder: str, mtime, dirs: List[str], files: Dict[str, Tuple[int, float]]) -> None:
+        if mtime is not None and _mtime_seconds(mtime) > time.time() - _RACY_SECONDS:
+            mtime = None  # too fresh to trust next time
+        with self._lock:
+            self.dirs[folder] = {"mtime": mtime, "seen": time.time(), "dirs": list(dirs),
+                                 "files": {p: list(st) for p, st in files.items()}}
+            self._visited.add(folder)
+            self.dirs_listed += 1
+
+    def racy_files(self, entry: dict) -> List[str]:
+        """Files of a reused folder modified within _RACY_SECONDS of its last listing (worth a stat)."""
+        cutoff = float(entry.get("seen") or 0.0) - _RACY_SECONDS
+        return [p for p, st in entry["files"].items() if st[1] > cutoff]
+
+    def mark_seen(self, folder: str) -> None:
+        """The racy files of `folder` were just stat'ed; trust them from now on."""
+        with self._lock:
+            self.dirs[folder]["seen"] = time.time()
+
+    def update_file(self, folder: str, path: str, st: Optional[Tuple[int, float]]) -> None:
+        """Refresh (or drop, when `st` is None) one matching file of a reused folder."""
+        with self._lock:
+            files = self.dirs[folder]["files"]
+            if st is None:
+                files.pop(path, None)
+            else:
+                files[path] = list(st)
+
+    # ---------- After the scan ----------
+    def matches(self) -> Dict[str, Tuple[int, float]]:
+        out = {}
+        for entry in self.dirs.values():
+            for p, st in entry.get("files", {}).items():
+                out[p] = (st[0], st[1])
+        return out
+
+    def finish(self, complete: bool = True) -> ScanDelta:
+        """Compute the delta against the previous scan.
+
+        With `complete` (the scan was not cancelled) folders that were not
+        reached any more are dropped from the index.
+        """
+        if complete:
+            with self._lock:
+                self.dirs = {d: e for d, e in self.dirs.items() if d in self._visited}
+        now = self.matches()
+        before = self._before
+        delta = ScanDelta(dirs_listed=self.dirs_listed, dirs_reused=self.dirs_reused, first_scan=not self.loaded)
+        delta.added = sorted(p for p in now if p not in before)
+        delta.modified = sorted(p for p in now if p in before and tuple(now[p]) != tuple(before[p]))
+        if complete:
+            delta.removed = sorted(p for p in before if p not in now)
+        return delta
+
+    def save(self) -> bool:
+        """Write the index atomically; False when the state folder is not writable."""
+        doc = {"version": INDEX_VERSION, "root": self.root, "pattern": self.pattern,
+               "recursive": self.recursive, "saved": time.time(), "dirs": self.dirs}
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(doc, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            return True
+        except OSError:
+            return False
+
+
+def _mtime_seconds(mtime) -> float:
+    """Index mtimes are ns integers for local folders and float seconds for Nucleus."""
+    return mtime / 1e9 if isinstance(mtime, int) else float(mtime)
@@ -0,0 +1,406 @@
+# SmartAssetsBuilder — scanner.py
+# Concurrent, streaming directory scanner for local folders and Nucleus URLs.
+
+import os
+import re
+import time
+import queue
+import fnmatch
+import threading
+import concurrent.futures as cf
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .pipeline import _is_ov_url, _stat_any, omni
+from .scanindex import ScanIndex, ScanDelta
+
+
+# ================================== Filters ===================================
+
+# Folders that never hold sources; pruned by default in the UI and the CLI.
+DEFAULT_PRUNE = ("Materials", ".thumbs", "backup*")
+
+_REGEX_PREFIX = "re:"
+
+
+def _compile_names(patterns: Sequence[str]) -> Optional[Callable[[str], bool]]:
+    """One case-insensitive predicate for several globs / `re:` regexes (None when empty).
+
+    Globs match the whole name and are folded into a single regex; regexes use
+    search semantics (anchor them with ^ and $).
+    """
+    globs = [fnmatch.translate(p) for p in patterns if not p.startswith(_REGEX_PREFIX)]
+    tests = []
+    if globs:
+        tests.append(re.compile("|".join(globs), re.IGNORECASE).match)
+    for p in patterns:
+        if p.startswith(_REGEX_PREFIX):
+            try:
+                tests.append(re.compile(p[len(_REGEX_PREFIX):], re.IGNORECASE).search)
+            except re.error as e:
+                raise ValueError(f"Bad regex {p!r}: {e}") from None
+    if not tests:
+        return None
+    if len(tests) == 1:
+        only = tests[0]
+        return lambda name: only(name) is not None
+    return lambda name: any(t(name) is not None for t in tests)
+
+
+class FilterSpec:
+    """Compiled include / exclude / prune rules of one scan.
+
+    Text form (what the filter field, `--pattern` and the journal hold): tokens
+    separated by `;`, each a glob or `re:<regex>` tested against a file or
+    folder *name*, case-insensitively:
+
+        max_*.usd          include files (no include = every file)
+        !*_old.usd         exclude files
+        Materials/         prune folders: never listed, nor anything below
+    """
+
+    def __init__(self, include: Sequence[str] = (), exclude: Sequence[str] = (), prune: Sequence[str] = ()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.prune = list(prune)
+        self._include = _compile_names(self.include)
+        self._exclude = _compile_names(self.exclude)
+        self._prune = _compile_names(self.prune)
+
+    @classmethod
+    def parse(cls, text: str, prune: Sequence[str] = ()) -> "FilterSpec":
+        """Parse the text form; `prune` adds folder rules (e.g. `DEFAULT_PRUNE`). Raises ValueError."""
+        include, exclude, pruned = [], [], []
+        for tok in (text or "").split(";"):
+            tok = tok.strip()
+            if not tok:
+                continue
+            if tok.endswith("/"):
+                pruned.append(tok.lstrip("!").rstrip("/"))
+            elif tok.startswith("!"):
+                exclude.append(tok[1:].strip())
+            else:
+                include.append(tok)
+        for name in prune:
+            if name and name not in pruned:
+                pruned.append(name)
+        return cls(include, [e for e in exclude if e], [p for p in pruned if p])
+
+    @classmethod
+    def coerce(cls, spec) -> "FilterSpec":
+        return spec if isinstance(spec, FilterSpec) else cls.parse(spec)
+
+    @property
+    def text(self) -> str:
+        """Canonical text form (parses back to the same spec)."""
+        return "; ".join(self.include + ["!" + e for e in self.exclude] + [p + "/" for p in self.prune])
+
+    def __str__(self) -> str:
+        return self.text
+
+    def match(self, name: str) -> bool:
+        if self._include is not None and not self._include(name):
+            return False
+        return self._exclude is None or not self._exclude(name)
+
+    def prunes(self, name: str) -> bool:
+        return self._prune is not None and self._prune(name)
+
+
+def _filter_text(text: str, prune: Sequence[str] = DEFAULT_PRUNE) -> str:
+    """Normalized filter text for a filename filter plus prune folder names."""
+    return FilterSpec.parse(text or "max_*.usd", prune).text
+
+
+# ================================== Scanner ===================================
+
+
+class Scanner:
+    """Lists many directories at once and yields matching files as they are found.
+
+    At most `max_concurrency` directory listings are in flight, so a deep tree
+    never floods the Nucleus server. `cancel()` may be called from any thread;
+    the scan stops after the listings already in flight return.
+
+    `pattern` is a `FilterSpec` or its text form; pruned folders are never
+    listed. With an `index` (see `scanindex.ScanIndex`) folders whose mtime did not
+    change are answered from the index instead of being listed again.
+    """
+
+    def __init__(self, root: str, pattern, recursive: bool = True, max_concurrency: int = 8,
+                 index: Optional[ScanIndex] = None):
+        self.root = root
+        self.filter = FilterSpec.coerce(pattern)
+        self.pattern = self.filter.text
+        self.recursive = recursive
+        self.max_concurrency = max(1, max_concurrency)
+        self._match = self.filter.match
+        self._prunes = self.filter.prunes
+        self._cancel = threading.Event()
+        self.index = index
+        self.dirs_listed = 0
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # ---------- One directory ----------
+    def _list_dir_local(self, folder: str) -> Tuple[List[str], List[str]]:
+        files, dirs = [], []
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            if not self._prunes(e.name):
+                                dirs.append(e.path)
+                        elif not e.is_dir() and self._match(e.name):
+                            files.append(e.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, dirs
+
+    def _list_dir_ov(self, url: str) -> Tuple[List[str], List[str]]:
+        files, dirs = [], []
+        rc, entries = omni.client.list(url.rstrip("/"))
+        if int(rc) != int(omni.client.Result.OK):
+            return files, dirs
+        for e in entries:
+            name = e.relative_path
+            if not name or name in (".", ".."):
+                continue
+            child = url.rstrip("/") + "/" + name
+            if e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN):
+                if not self._prunes(name.rstrip("/")):
+                    dirs.append(child)
+            elif self._match(name):
+                files.append(child)
+        return files, dirs
+
+    # ---------- One directory, through the index ----------
+    def _dir_mtime(self, folder: str):
+        """Local: st_mtime_ns (exact); Nucleus: modified time in seconds. None if unknown."""
+        if _is_ov_url(folder):
+            st = _stat_any(folder.rstrip("/"))
+            return st[1] if st else None
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_dir_local(self, folder: str) -> Tuple[Dict[str, Tuple[int, float]], List[str]]:
+        files, dirs = {}, []
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            if not self._prunes(e.name):
+                                dirs.append(e.path)
+                        elif not e.is_dir() and self._match(e.name):
+                            st = e.stat()
+                            files[e.path] = (int(st.st_size), float(st.st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, dirs
+
+    def _read_dir_ov(self, url: str) -> Tuple[Dict[str, Tuple[int, float]], List[str]]:
+        files, dirs = {}, []
+        rc, entries = omni.client.list(url.rstrip("/"))
+        if int(rc) != int(omni.client.Result.OK):
+            return files, dirs
+        for e in entries:
+            name = e.relative_path
+            if not name or name in (".", ".."):
+                continue
+            child = url.rstrip("/") + "/" + name
+            if e.flags & int(omni.client.ItemFlags.CAN_HAVE_CHILDREN):
+                if not self._prunes(name.rstrip("/")):
+                    dirs.append(child)
+            elif self._match(name):
+                mt = e.modified_time
+                files[child] = (int(e.size), mt.timestamp() if hasattr(mt, "timestamp") else float(mt or 0))
+        return files, dirs
+
+    def _visit(self, folder: str) -> Tuple[List[str], List[str]]:
+        """List `folder`, or reuse its indexed listing when the folder's mtime is unchanged."""
+        mtime = self._dir_mtime(folder)  # taken before listing: a concurrent change shows up next scan
+        entry = self.index.cached(folder, mtime)
+        if entry is None:
+            read = self._read_dir_ov if _is_ov_url(folder) else self._read_dir_local
+            files, dirs = read(folder)
+            self.index.store(folder, mtime, dirs, files)
+            return list(files), dirs
+        # Same entries as last time; only matches written just before that listing
+        # may have changed in place since, so only those are stat'ed.
+        racy = self.index.racy_files(entry)
+        files = [p for p in entry["files"] if p not in racy]
+        for path in racy:
+            st = _stat_any(path)
+            if st is None or tuple(st) != tuple(entry["files"][path]):
+                self.index.update_file(folder, path, st)
+            if st is not None:
+                files.append(path)
+        if racy:
+            self.index.mark_seen(folder)
+        return files, list(entry["dirs"])
+
+    # ---------- Walk ----------
+    def iter_matches(self) -> Iterator[str]:
+        """Yield matching file paths/URLs in discovery order (not sorted)."""
+        if _is_ov_url(self.root):
+            if omni is None:
+                return
+            list_dir = self._list_dir_ov
+        else:
+            if not os.path.isdir(self.root):
+                return
+            list_dir = self._list_dir_local
+        if self.index is not None:
+            list_dir = self._visit
+
+        todo = [self.root]
+        with cf.ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                   thread_name_prefix="SmartAssetsScan") as pool:
+            pending = set()
+            try:
+                while (todo or pending) and not self.cancelled:
+                    while todo and len(pending) < self.max_concurrency:
+                        pending.add(pool.submit(list_dir, todo.pop()))
+                    finished, pending = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+                    for fut in finished:
+                        files, dirs = fut.result()
+                        self.dirs_listed += 1
+                        if self.recursive:
+                            todo.extend(dirs)
+                        for f in files:
+                            yield f
+            finally:
+                for fut in pending:
+                    fut.cancel()
+
+    def run(self, sink: Callable[[str], None]) -> None:
+        """Blocking helper: push every match into `sink`."""
+        for path in self.iter_matches():
+            if self.cancelled:
+                break
+            sink(path)
+
+    def start(self, sink: Callable[[str], None],
+              on_done: Optional[Callable[[Optional[BaseException]], None]] = None) -> threading.Thread:
+        """Run the scan on a background thread; `on_done(error)` fires when it ends."""
+        def _worker():
+            err = None
+            try:
+                self.run(sink)
+            except BaseException as e:  # reported to the caller, not swallowed
+                err = e
+            if on_done is not None:
+                on_done(err)
+
+        t = threading.Thread(target=_worker, name="SmartAssetsScanner", daemon=True)
+        t.start()
+        return t
+
+
+# ================================== Listing ===================================
+
+def _list_local(folder: str, pattern: str, recursive: bool) -> List[str]:
+    return sorted(Scanner(folder, pattern, recursive).iter_matches())
+
+
+def _list_nucleus(url: str, pattern: str, recursive: bool) -> List[str]:
+    return sorted(Scanner(url, pattern, recursive).iter_matches())
+
+
+def _scan_indexed(root: str, pattern: str, recursive: bool, reuse: bool = True) -> Tuple[List[str], ScanDelta]:
+    """Scan through the persistent index of `root` and save it; returns (matches, delta).
+
+    `reuse=False` lists every folder again (full rescan) but still reports the delta.
+    """
+    index = ScanIndex.load(root, FilterSpec.coerce(pattern).text, recursive)
+    index.reuse = reuse
+    files = sorted(Scanner(root, pattern, recursive, index=index).iter_matches())
+    delta = index.finish()
+    index.save()
+    return files, delta
+
+
+# ============================== Scan -> Build Feed ============================
+
+class ScanFeed:
+    """Bounded queue between a background `Scanner` and the build engine.
+
+    The scanner blocks once `maxsize` discovered items are waiting, so a fast
+    scan cannot run arbitrarily far ahead of the builders (backpressure).
+    Iterating yields `None` as a heartbeat whenever nothing arrived within
+    `heartbeat` seconds, letting a blocking consumer deliver finished results.
+    """
+
+    _END = object()
+
+    def __init__(self, scanner: Scanner, maxsize: int = 256, heartbeat: float = 0.1):
+        self.scanner = scanner
+        self.heartbeat = heartbeat
+        self.found: List[str] = []
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self.seconds: Optional[float] = None   # scan wall time, once the scanner is done
+        self._t0 = 0.0
+        self._closed = False
+        self._q: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+
+    @property
+    def discovered(self) -> int:
+        return len(self.found)
+
+    def start(self) -> "ScanFeed":
+        self._t0 = time.perf_counter()
+        self.scanner.start(self._put, self._on_done)
+        return self
+
+    def close(self) -> None:
+        """Stop the scanner (e.g. the consumer aborted) without waiting for it."""
+        self._closed = True
+        self.scanner.cancel()
+
+    # ---------- Producer side (scanner thread) ----------
+    def _offer(self, item) -> bool:
+        while not self._closed:
+            try:
+                self._q.put(item, timeout=self.heartbeat)
+                return True
+            except queue.Full:
+                if self.scanner.cancelled and item is not self._END:
+                    return False
+        return False
+
+    def _put(self, path: str) -> None:
+        # Count before queueing so a consumer never sees more items than `discovered`.
+        self.found.append(path)
+        if not self._offer(path):
+            self.found.pop()
+
+    def _on_done(self, err: Optional[BaseException]) -> None:
+        self.error = err
+        self.seconds = time.perf_counter() - self._t0
+        self._offer(self._END)
+
+    # ---------- Consumer side ----------
+    def __iter__(self) -> Iterator[Optional[str]]:
+        while True:
+            try:
+                item = self._q.get(timeout=self.heartbeat)
+            except queue.Empty:
+                yield None
+                continue
+            if item is self._END:
+                self.finished = True
+                return
+            yield item
@@ -0,0 +1,192 @@
+# SmartAssetsBuilder — templates.py
+# Layer skeletons for the asset/main/id trio, prepared once per run and cloned per output.
+#
+# A template holds everything the three layers share: stage metadata (upAxis,
+# metersPerUnit, time codes), customLayerData (cameras, render settings) and a
+# `def Xform "World"` default prim. Builders clone it with `instantiate_template`
+# and only author the per-asset fields (subLayers, prims, references).
+
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from pxr import UsdGeom, Sdf, Gf
+
+ROLE_ASSET = "asset"
+ROLE_MAIN = "main"
+ROLE_ID = "id"
+ROLES = (ROLE_ASSET, ROLE_MAIN, ROLE_ID)
+
+# --------------------------- customLayerData presets ---------------------------
+
+_RENDER_SETTINGS = {
+    "rtx:debugView:pixelDebug:textColor":                  Gf.Vec3f(0.0, 1.0e18, 0.0),
+    "rtx:fog:fogColor":                                    Gf.Vec3f(0.75, 0.75, 0.75),
+    "rtx:index:regionOfInterestMax":                       Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:index:regionOfInterestMin":                       Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:iray:environment_dome_ground_position":           Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:iray:environment_dome_ground_reflectivity":       Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:iray:environment_dome_rotation_axis":             Gf.Vec3f(3.4028235e38, 3.4028235e38, 3.4028235e38),
+    "rtx:post:backgroundZeroAlpha:backgroundDefaultColor": Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:post:colorcorr:contrast":                         Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorcorr:gain":                             Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorcorr:gamma":                            Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorcorr:offset":                           Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:post:colorcorr:saturation":                       Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorgrad:blackpoint":                       Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:post:colorgrad:contrast":                         Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorgrad:gain":                             Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorgrad:gamma":                            Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorgrad:lift":                             Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:post:colorgrad:multiply":                         Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:colorgrad:offset":                           Gf.Vec3f(0.0, 0.0, 0.0),
+    "rtx:post:colorgrad:whitepoint":                       Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:post:lensDistortion:lensFocalLengthArray":        Gf.Vec3f(10.0, 30.0, 50.0),
+    "rtx:post:lensFlares:anisoFlareFalloffX":              Gf.Vec3f(450.0, 475.0, 500.0),
+    "rtx:post:lensFlares:anisoFlareFalloffY":              Gf.Vec3f(10.0, 10.0, 10.0),
+    "rtx:post:tonemap:whitepoint":                         Gf.Vec3f(1.0, 1.0, 1.0),
+    "rtx:raytracing:inscattering:singleScatteringAlbedo":  Gf.Vec3f(0.9, 0.9, 0.9),
+    "rtx:raytracing:inscattering:transmittanceColor":      Gf.Vec3f(0.5, 0.5, 0.5),
+    "rtx:sceneDb:ambientLightColor":                       Gf.Vec3f(0.1, 0.1, 0.1),
+}
+
+def _make_custom_layer_data(persp_pos: Gf.Vec3d, persp_tgt: Gf.Vec3d) -> dict:
+    return {
+        "cameraSettings": {
+            "Front": {"position": Gf.Vec3d(50000.0, 0.0, 0.0), "radius": 500.0},
+            "Perspective": {"position": persp_pos, "target": persp_tgt},
+            "Right": {"position": Gf.Vec3d(0.0, -50000.0, 0.0), "radius": 500.0},
+            "Top":   {"position": Gf.Vec3d(0.0, 0.0, 50000.0), "radius": 500.0},
+            "boundCamera": "/OmniverseKit_Persp",
+        },
+        "navmeshSettings": {"agentHeight": 180.0, "agentRadius": 20.0, "excludeRigidBodies": True, "ver": 1, "voxelCeiling": 460.0},
+        "omni_layer": {"locked": {}, "muteness": {}},
+        "renderSettings": dict(_RENDER_SETTINGS),
+        "xrSettings": {},
+    }
+
+_ASSET_CAM = (Gf.Vec3d(468.23583907821103, 207.3167254218987, 136.30348999707007),
+              Gf.Vec3d(1.8999877335081692, 0.000004266803131258712, 111.00506298576693))
+
+_MAIN_CAM  = (Gf.Vec3d(438.24681779843604, 222.6747569439535, 257.21875304644374),
+              Gf.Vec3d(10.307273578659249, -7.256348633949841, 98.82433171214586))
+
+_ID_CAM    = (Gf.Vec3d(563.6285775303645, 274.16293093872434, 178.3208850340164),
+              Gf.Vec3d(1.8999929336483774, 0.00003321702774883306, 111.00497360562268))
+
+_DEFAULT_CAMS = {ROLE_ASSET: _ASSET_CAM, ROLE_MAIN: _MAIN_CAM, ROLE_ID: _ID_CAM}
+
+
+# ============================== Default Templates ==============================
+
+def _set_layer_defaults(layer: Sdf.Layer) -> None:
+    root = layer.pseudoRoot
+    root.SetInfo(UsdGeom.Tokens.upAxis, UsdGeom.Tokens.z)
+    root.SetInfo(UsdGeom.Tokens.metersPerUnit, 0.01)
+    layer.timeCodesPerSecond = 60
+    layer.startTimeCode = 0
+    layer.endTimeCode = 100
+
+
+def _default_template(role: str) -> Sdf.Layer:
+    layer = Sdf.Layer.CreateAnonymous(f"{role}_template.usd")
+    _set_layer_defaults(layer)
+    Sdf.PrimSpec(layer.pseudoRoot, "World", Sdf.SpecifierDef, "Xform")
+    layer.defaultPrim = "World"
+    layer.customLayerData = _make_custom_layer_data(*_DEFAULT_CAMS[role])
+    return layer
+
+
+def _file_template(role: str, path: str) -> Sdf.Layer:
+    src = Sdf.Layer.FindOrOpen(path)
+    if src is None:
+        raise ValueError(f"Could not open {role} template layer: {path}")
+    layer = Sdf.Layer.CreateAnonymous(f"{role}_template.usd")
+    layer.TransferContent(src)
+    if not layer.GetPrimAtPath("/World"):
+        Sdf.PrimSpec(layer.pseudoRoot, "World", Sdf.SpecifierDef, "Xform")
+    if not layer.defaultPrim:
+        layer.defaultPrim = "World"
+    return layer
+
+
+# ================================== Registry ===================================
+
+def _check_role(role: str) -> str:
+    if role not in ROLES:
+        raise ValueError(f"Unknown template role {role!r} (expected one of {', '.join(ROLES)})")
+    return role
+
+
+class TemplateSet:
+    """Custom template layer paths (role -> path) and the skeletons prepared from them.
+
+    The session set is what `register_template` edits; each build run authors
+    with its own set (see `use_templates`), so runs side by side never share or
+    reset each other's skeletons.
+    """
+
+    def __init__(self, registry: Optional[Dict[str, str]] = None):
+        self.registry: Dict[str, str] = {_check_role(r): p for r, p in (registry or {}).items()}
+        self.prepared: Dict[str, Sdf.Layer] = {}
+        self._lock = threading.Lock()
+
+    def layer(self, role: str) -> Sdf.Layer:
+        """The prepared skeleton for `role` (built on first use). Treat it as read-only."""
+        layer = self.prepared.get(role)
+        if layer is not None:
+            return layer
+        with self._lock:
+            layer = self.prepared.get(_check_role(role))
+            if layer is None:
+                path = self.registry.get(role)
+                layer = _file_template(role, path) if path else _default_template(role)
+                self.prepared[role] = layer
+            return layer
+
+
+_session = TemplateSet()
+_run_templates: ContextVar[Optional[TemplateSet]] = ContextVar("smart_assets_templates", default=None)
+
+
+def use_templates(templates: Optional[TemplateSet]) -> Optional[TemplateSet]:
+    """Author with `templates` in the current context (None = the session set); returns the previous one."""
+    prev = _run_templates.get()
+    _run_templates.set(templates)
+    return prev
+
+
+def register_template(role: str, path: str) -> None:
+    """Use the layer at `path` as the skeleton for `role` instead of the built-in one.
+
+    Its metadata, customLayerData and prims are copied into every output of that
+    role; a `/World` Xform is added (and made the default prim) if missing.
+    Asset paths inside the template are copied verbatim, so keep them absolute.
+    """
+    with _session._lock:
+        _session.registry[_check_role(role)] = path
+        _session.prepared.pop(role, None)
+
+
+def unregister_template(role: str) -> None:
+    """Go back to the built-in skeleton for `role`."""
+    with _session._lock:
+        _session.registry.pop(_check_role(role), None)
+        _session.prepared.pop(role, None)
+
+
+def registered_templates() -> Dict[str, str]:
+    with _session._lock:
+        return dict(_session.registry)
+
+
+def template_layer(role: str) -> Sdf.Layer:
+    """The prepared skeleton for `role` of the current run (or session). Treat it as read-only."""
+    return (_run_templates.get() or _session).layer(role)
+
+
+def instantiate_template(role: str) -> Tuple[Sdf.Layer, Sdf.PrimSpec]:
+    """New in-memory layer cloned from the `role` skeleton; returns it and its /World spec."""
+    layer = Sdf.Layer.CreateAnonymous(".usd")
+    layer.TransferContent(template_layer(role))
+    return layer, layer.GetPrimAtPath("/World")
@@ -0,0 +1,38 @@
+# Shared fixtures: small source trees authored with pxr in the test's tmp_path.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pxr import Usd, UsdGeom  # noqa: E402
+
+
+def write_source(root, name, size=2.0, texture=None):
+    """<root>/<name>/max_<name>.usd (a /World/Cube) with Materials/b.png and Materials/tex/a.png.
+
+    b.png has the same bytes in every source; a.png is unique per source unless `texture` is given.
+    """
+    core = os.path.join(str(root), name)
+    os.makedirs(os.path.join(core, "Materials", "tex"), exist_ok=True)
+    with open(os.path.join(core, "Materials", "b.png"), "wb") as f:
+        f.write(b"shared" * 100)
+    with open(os.path.join(core, "Materials", "tex", "a.png"), "wb") as f:
+        f.write(texture if texture is not None else name.encode("utf-8") * 50)
+    path = os.path.join(core, f"max_{name}.usd")
+    stage = Usd.Stage.CreateNew(path)
+    UsdGeom.Xform.Define(stage, "/World")
+    UsdGeom.Cube.Define(stage, "/World/Cube").CreateSizeAttr(size)
+    stage.SetDefaultPrim(stage.GetPrimAtPath("/World"))
+    stage.Save()
+    return path
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Factory: sources("A", "B") -> their max layer paths under tmp_path/src."""
+    def _make(*names, **kw):
+        return [write_source(tmp_path / "src", n, **kw) for n in names]
+    return _make
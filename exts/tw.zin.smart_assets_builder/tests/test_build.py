@@ -0,0 +1,117 @@
+# Whole builds through BuildEngine: incremental manifest skips, overwrite sync modes,
+# deduplicated Materials, bounds and the composition arc of the authored trio.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pxr import Usd, UsdGeom  # noqa: E402
+
+from conftest import write_source  # noqa: E402
+from smart_assets_builder.engine import BuildEngine  # noqa: E402
+from smart_assets_builder.manifest import BuildManifest  # noqa: E402
+from smart_assets_builder.pipeline import (  # noqa: E402
+    BuildOptions, ARC_PAYLOAD, ARC_REFERENCE, SYNC_CHECKSUM, SYNC_MTIME, SYNC_OFF,
+)
+
+
+def _build(srcs, opts, manifest=None):
+    results = []
+
+    def _on_result(res):
+        results.append(res)
+        if manifest is not None and res.manifest_entry:
+            manifest.update(res.src, res.manifest_entry)
+
+    BuildEngine(workers=2).run(srcs, opts, _on_result, manifest=manifest)
+    if manifest is not None:
+        manifest.save()
+    return {os.path.basename(os.path.dirname(r.src)): r for r in results}
+
+
+def _total(results, key):
+    return sum(r.stats.get(key, 0) for r in results.values())
+
+
+def test_incremental_rebuilds_only_changed_sources(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    opts = BuildOptions(out_root=out, incremental=True)
+
+    first = _build(srcs, opts, BuildManifest.load(out))
+    assert {k: r.status for k, r in first.items()} == {"A": "done", "B": "done"}
+
+    second = _build(srcs, opts, BuildManifest.load(out))
+    assert {k: r.status for k, r in second.items()} == {"A": "skipped", "B": "skipped"}
+
+    time.sleep(0.05)
+    write_source(tmp_path / "src", "B", size=4.0)
+    third = _build(srcs, opts, BuildManifest.load(out))
+    assert {k: r.status for k, r in third.items()} == {"A": "skipped", "B": "done"}
+
+
+def test_sync_modes_keep_outputs_that_already_match(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    _build(srcs, BuildOptions(out_root=out))
+
+    for sync in (SYNC_MTIME, SYNC_CHECKSUM):
+        again = _build(srcs, BuildOptions(out_root=out, overwrite=True, sync=sync))
+        assert all(r.status == "done" for r in again.values())
+        assert _total(again, "sync_skipped") == 6, sync       # max + two Materials files per source
+
+    # A source texture that changed is copied again, the rest still match.
+    with open(os.path.join(str(tmp_path / "src"), "A", "Materials", "tex", "a.png"), "wb") as f:
+        f.write(b"changed" * 10)
+    again = _build(srcs, BuildOptions(out_root=out, overwrite=True, sync=SYNC_CHECKSUM))
+    assert _total(again, "sync_skipped") == 5
+    with open(os.path.join(out, "A", "Materials", "tex", "a.png"), "rb") as f:
+        assert f.read() == b"changed" * 10
+
+    recopied = _build(srcs, BuildOptions(out_root=out, overwrite=True, sync=SYNC_OFF))
+    assert _total(recopied, "sync_skipped") == 0
+
+
+def test_dedup_hardlinks_identical_material_files(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    results = _build(srcs, BuildOptions(out_root=out, dedup_materials=True))
+    assert all(r.status == "done" for r in results.values())
+    assert _total(results, "dedup_hits") == 1
+
+    shared_a = os.stat(os.path.join(out, "A", "Materials", "b.png"))
+    shared_b = os.stat(os.path.join(out, "B", "Materials", "b.png"))
+    assert shared_a.st_ino == shared_b.st_ino and shared_a.st_nlink >= 3   # both items + the blob
+    own_a = os.stat(os.path.join(out, "A", "Materials", "tex", "a.png"))
+    own_b = os.stat(os.path.join(out, "B", "Materials", "tex", "a.png"))
+    assert own_a.st_ino != own_b.st_ino
+
+
+def test_bounds_are_reported_and_authored_as_extents_hint(tmp_path, sources):
+    src, = sources("A", size=4.0)
+    out = str(tmp_path / "out")
+    res = _build([src], BuildOptions(out_root=out, bounds=True))["A"]
+    assert res.bounds == [[-2.0, -2.0, -2.0], [2.0, 2.0, 2.0]]
+
+    stage = Usd.Stage.Open(os.path.join(out, "id_A_TEMP00000001.usd"))
+    hint = UsdGeom.ModelAPI(stage.GetPrimAtPath("/World/A")).GetExtentsHintAttr().Get()
+    assert [list(v) for v in hint] == [[-2.0, -2.0, -2.0], [2.0, 2.0, 2.0]]
+
+
+def test_arc_choice_composes_the_trio(tmp_path, sources):
+    srcs = sources("A")
+    for arc in (ARC_REFERENCE, ARC_PAYLOAD):
+        out = str(tmp_path / arc)
+        assert _build(srcs, BuildOptions(out_root=out, arc=arc))["A"].status == "done"
+
+        stage = Usd.Stage.Open(os.path.join(out, "id_A_TEMP00000001.usd"))
+        item = stage.GetPrimAtPath("/World/A")
+        assert item.HasAuthoredPayloads() == (arc == ARC_PAYLOAD)
+        assert item.HasAuthoredReferences() == (arc == ARC_REFERENCE)
+        assert stage.GetPrimAtPath("/World/A/ASSET/asset_A/Cube").IsValid()   # fully composed down to the max layer
+
+        closed = Usd.Stage.Open(os.path.join(out, "id_A_TEMP00000001.usd"), Usd.Stage.LoadNone)
+        assert closed.GetPrimAtPath("/World/A/ASSET/asset_A/Cube").IsValid() == (arc == ARC_REFERENCE)
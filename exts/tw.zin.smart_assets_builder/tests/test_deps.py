@@ -0,0 +1,104 @@
+# Dependency closure of a max layer (only what it references is copied, unresolved paths
+# reported) and asset paths redirected to deduplicated blobs, local or on Nucleus.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pxr import Sdf  # noqa: E402
+
+from smart_assets_builder.dedup import rewrite_asset_paths  # noqa: E402
+from smart_assets_builder.deps import compute_dependencies, dep_pairs  # noqa: E402
+from smart_assets_builder.engine import BuildEngine  # noqa: E402
+from smart_assets_builder.pipeline import BuildOptions  # noqa: E402
+
+_MAX = """#usda 1.0
+(
+    defaultPrim = "World"
+    subLayers = [@./Materials/looks.usda@]
+)
+
+def Xform "World"
+{
+    def Cube "Cube"
+    {
+    }
+}
+"""
+
+_LOOKS = """#usda 1.0
+
+def Shader "Wood"
+{
+    asset inputs:file = @./tex/used.png@
+    asset inputs:file2 = @../../Shared/wood.png@
+    asset inputs:file3 = @./tex/gone.png@
+}
+"""
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data if isinstance(data, bytes) else data.encode("utf-8"))
+    return path
+
+
+def _library(root):
+    """lib/C0/max_C0.usd -> Materials/looks.usda -> used.png, ../Shared/wood.png and a missing gone.png."""
+    lib = os.path.join(str(root), "lib")
+    src = _write(os.path.join(lib, "C0", "max_C0.usd"), _MAX)
+    _write(os.path.join(lib, "C0", "Materials", "looks.usda"), _LOOKS)
+    _write(os.path.join(lib, "C0", "Materials", "tex", "used.png"), b"used" * 10)
+    _write(os.path.join(lib, "C0", "Materials", "tex", "unused_8k.png"), b"big" * 1000)
+    _write(os.path.join(lib, "Shared", "wood.png"), b"wood" * 10)
+    return src
+
+
+def test_closure_lists_referenced_files_and_missing_paths(tmp_path):
+    src = _library(tmp_path)
+    closure = compute_dependencies(src)
+    assert sorted(rel for rel, _path in closure.files) == ["../Shared/wood.png", "Materials/looks.usda",
+                                                         "Materials/tex/used.png"]
+    assert closure.elsewhere == []
+    assert [os.path.basename(p) for p in closure.missing] == ["gone.png"]
+
+    out = str(tmp_path / "out")
+    pairs, _dirs = dep_pairs(closure, os.path.join(out, "C0"), out)
+    targets = {os.path.relpath(dst, out) for _src, dst in pairs}
+    assert targets == {os.path.join("Shared", "wood.png"), os.path.join("C0", "Materials", "looks.usda"),
+                       os.path.join("C0", "Materials", "tex", "used.png")}
+
+
+def test_dependency_copy_skips_unreferenced_materials(tmp_path):
+    src = _library(tmp_path)
+    out = str(tmp_path / "out")
+    results = []
+    BuildEngine(workers=1).run([src], BuildOptions(out_root=out, dependency_copy=True), results.append)
+    res, = results
+    assert res.status == "done"
+    assert [os.path.basename(p) for p in res.missing_deps] == ["gone.png"]
+    assert os.path.exists(os.path.join(out, "C0", "Materials", "tex", "used.png"))
+    assert os.path.exists(os.path.join(out, "Shared", "wood.png"))
+    assert not os.path.exists(os.path.join(out, "C0", "Materials", "tex", "unused_8k.png"))
+
+
+def test_rewrite_points_asset_paths_at_blobs(tmp_path):
+    looks = _write(str(tmp_path / "C0" / "Materials" / "looks.usda"), _LOOKS)
+    anchor = os.path.dirname(looks)
+    local_blob = _write(str(tmp_path / ".cas" / "ab" / "ab12.png"), b"used")
+    nucleus_blob = "omniverse://server/library/.cas/cd/cd34.png"
+    redirects = {
+        os.path.normcase(os.path.join(anchor, "tex", "used.png")): local_blob,
+        os.path.normcase(os.path.normpath(os.path.join(anchor, "..", "..", "Shared", "wood.png"))): nucleus_blob,
+    }
+    assert rewrite_asset_paths(looks, anchor, redirects) == 2
+
+    layer = Sdf.Layer.FindOrOpen(looks)
+    shader = layer.GetPrimAtPath("/Wood")
+    value = {name: shader.attributes[name].default.path for name in ("inputs:file", "inputs:file2", "inputs:file3")}
+    assert value["inputs:file"] == "../../.cas/ab/ab12.png"
+    assert value["inputs:file2"] == nucleus_blob                 # a local layer reaches Nucleus by URL
+    assert value["inputs:file3"] == "./tex/gone.png"             # no blob: left alone
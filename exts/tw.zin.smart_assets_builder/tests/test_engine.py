@@ -0,0 +1,113 @@
+# Run control and resume: pause / cancel honoured at stage boundaries, half-built trios
+# rolled back, and a journaled run continuing from the stages it already finished.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+import dataclasses
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_assets_builder.engine import BuildEngine  # noqa: E402
+from smart_assets_builder.journal import BuildJournal, StageLog  # noqa: E402
+from smart_assets_builder.pipeline import (  # noqa: E402
+    BuildOptions, build_item, run_context, STAGE_ASSET, STAGE_MATERIALS, STAGE_MAX, STAGES,
+)
+
+
+def _id_layer(out, name):
+    return os.path.join(out, f"id_{name}_TEMP00000001.usd")
+
+
+def test_paused_engine_builds_nothing_until_resumed(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    engine = BuildEngine(workers=2)
+    results = []
+    engine.pause()
+    runner = threading.Thread(target=engine.run, args=(srcs, BuildOptions(out_root=out), results.append))
+    runner.start()
+    time.sleep(0.5)
+    assert results == [] and not os.path.exists(_id_layer(out, "A"))
+
+    engine.resume()
+    runner.join(timeout=60)
+    assert sorted(r.status for r in results) == ["done", "done"]
+
+
+def test_cancel_drops_queued_items_and_leaves_no_half_trio(tmp_path, sources):
+    names = [f"S{i}" for i in range(8)]
+    srcs = sources(*names)
+    out = str(tmp_path / "out")
+    engine = BuildEngine(workers=1)
+    results = []
+
+    def _on_result(res):
+        results.append(res)
+        engine.cancel()
+
+    engine.run(srcs, BuildOptions(out_root=out), _on_result)
+    assert results[0].status == "done"
+    assert len(results) < len(srcs)
+    assert {r.status for r in results[1:]} <= {"done", "cancelled"}
+    built = {os.path.basename(os.path.dirname(r.src)) for r in results if r.status == "done"}
+    for name in names:
+        complete = os.path.exists(_id_layer(out, name))
+        assert complete == (name in built)
+        if not complete:
+            assert not os.path.exists(os.path.join(out, name, f"asset_{name}.usd"))
+
+
+def test_cancel_mid_item_rolls_back_authored_layers(tmp_path, sources):
+    src, = sources("A")
+    out = str(tmp_path / "out")
+    cancel = threading.Event()
+
+    def _stage_done(_src, stage):
+        if stage == STAGE_ASSET:
+            cancel.set()   # the asset layer is written; stop before main
+
+    res = run_context(cancel_event=cancel, stage_log=_stage_done).run(build_item, src, BuildOptions(out_root=out))
+    assert res.status == "cancelled"
+    assert res.stages == [STAGE_MAX, STAGE_MATERIALS]
+    assert not os.path.exists(os.path.join(out, "A", "asset_A.usd"))
+    assert os.path.exists(os.path.join(out, "A", "max_A.usd"))
+
+
+def test_resume_skips_the_stages_a_crashed_run_journaled(tmp_path, sources):
+    src, = sources("A")
+    out = str(tmp_path / "out")
+    opts = BuildOptions(out_root=out)
+    journal = BuildJournal.load(out)
+    journal.begin(opts, items=[src])
+    cancel = threading.Event()
+    stage_log = StageLog(journal.path)
+
+    def _stage_done(s, stage):
+        stage_log(s, stage)
+        if stage == STAGE_MATERIALS:
+            cancel.set()
+
+    # The worker gets as far as Materials; the run dies before its item record is written.
+    run_context(cancel_event=cancel, stage_log=_stage_done).run(build_item, src, opts)
+    stage_log.close()
+    journal.close()
+
+    loaded = BuildJournal.load(out)
+    assert loaded.resumable
+    assert loaded.stages_of(src) == (STAGE_MAX, STAGE_MATERIALS)
+    os.remove(os.path.join(out, "A", "Materials", "b.png"))   # would come back if Materials were redone
+
+    results = []
+    loaded.resume()
+    BuildEngine(workers=1).run(loaded.pending(loaded.items()), dataclasses.replace(loaded.options(), resumed=True),
+                               lambda r: (loaded.record(r), results.append(r)), journal=loaded)
+    loaded.close(completed=True)
+
+    assert [r.status for r in results] == ["done"]
+    assert results[0].stages == list(STAGES)
+    assert os.path.exists(_id_layer(out, "A"))
+    assert not os.path.exists(os.path.join(out, "A", "Materials", "b.png"))
+    assert not BuildJournal.load(out).resumable
@@ -0,0 +1,60 @@
+# Job queue shared by several processes: every change re-reads queue.json under its lock file.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_assets_builder.jobqueue import JobQueue, make_job, QUEUED, RUNNING, DONE  # noqa: E402
+from smart_assets_builder.pipeline import BuildOptions  # noqa: E402
+
+
+def _job(out_root):
+    return make_job("/src", "max_*.usd", True, BuildOptions(out_root=out_root))
+
+
+def test_interleaved_add_and_take(tmp_path):
+    path = str(tmp_path / "queue.json")
+    runner, shell = JobQueue.load(path), JobQueue.load(path)
+
+    first = runner.add(_job(str(tmp_path / "out1")))
+    taken = runner.take()
+    assert taken.id == first.id
+
+    # Added from "another shell" while the runner builds job1.
+    second = shell.add(_job(str(tmp_path / "out2")))
+    assert second.id != first.id
+
+    runner.finish(taken, {"done": 3})
+    assert runner.take().id == second.id
+
+    states = {j.id: j.state for j in JobQueue.load(path).jobs}
+    assert states == {first.id: DONE, second.id: RUNNING}
+
+
+def test_running_job_is_not_taken_twice(tmp_path):
+    path = str(tmp_path / "queue.json")
+    a, b = JobQueue.load(path), JobQueue.load(path)
+    a.add(_job(str(tmp_path / "out")))
+    a.add(_job(str(tmp_path / "out")))      # same output root: waits for the first
+
+    assert a.take() is not None
+    assert b.take() is None                 # running state and owner are in the file
+    assert [j.state for j in b.queued()] == [QUEUED]
+
+
+def test_job_of_dead_owner_is_queued_again(tmp_path):
+    path = str(tmp_path / "queue.json")
+    job = JobQueue.load(path).add(_job(str(tmp_path / "out")))
+
+    # Another process takes the job and dies without finishing it.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c",
+                    "import sys; from smart_assets_builder.jobqueue import JobQueue; "
+                    "assert JobQueue.load(sys.argv[1]).take() is not None", path],
+                   cwd=root, check=True)
+
+    again = JobQueue.load(path).take()
+    assert again is not None and again.id == job.id and again.runs == 2
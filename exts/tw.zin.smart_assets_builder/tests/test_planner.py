@@ -0,0 +1,40 @@
+# Dry-run planning: counts what a build would copy and author, decides skips like the
+# build does, and never creates or writes anything.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_assets_builder.engine import BuildEngine  # noqa: E402
+from smart_assets_builder.pipeline import BuildOptions, SYNC_MTIME  # noqa: E402
+from smart_assets_builder.planner import plan_build  # noqa: E402
+
+
+def test_plan_counts_the_work_without_writing(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    plan = plan_build(srcs, BuildOptions(out_root=out), workers=2, throughput_mbps=100.0)
+
+    assert plan.count("build") == 2
+    assert plan.files_to_copy == 6                    # max + two Materials files per source
+    assert plan.bytes_to_copy == sum(p.bytes for p in plan.items) > 0
+    assert plan.layers_to_author == 6                 # asset / main / id per source
+    assert {os.path.relpath(d, out) for d in plan.dirs_to_create} >= {"A", "B"}
+    assert plan.est_seconds > 0
+    assert not os.path.exists(out)
+
+
+def test_plan_matches_what_the_build_then_does(tmp_path, sources):
+    srcs = sources("A", "B")
+    out = str(tmp_path / "out")
+    BuildEngine(workers=2).run(srcs, BuildOptions(out_root=out), lambda _res: None)
+
+    again = plan_build(srcs, BuildOptions(out_root=out), workers=2)
+    assert again.count("skipped") == 2 and again.files_to_copy == 0
+
+    synced = plan_build(srcs, BuildOptions(out_root=out, overwrite=True, sync=SYNC_MTIME), workers=2)
+    assert synced.count("build") == 2
+    assert synced.files_to_copy == 0 and sum(p.kept for p in synced.items) == 6
+    assert synced.layers_to_author == 6
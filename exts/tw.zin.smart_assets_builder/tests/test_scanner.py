@@ -0,0 +1,51 @@
+# Scan filters: include / exclude globs and regexes on file names, pruned folders never listed.
+# Run from exts/tw.zin.smart_assets_builder:  python -m pytest -q tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_assets_builder.scanner import FilterSpec, Scanner, DEFAULT_PRUNE  # noqa: E402
+
+
+def _touch(root, *parts):
+    path = os.path.join(str(root), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    return path
+
+
+def test_filter_text_round_trips():
+    spec = FilterSpec.parse("max_*.usd; !*_old.usd; re:^max_\\d+\\.usda$; Materials/", prune=DEFAULT_PRUNE)
+    assert spec.include == ["max_*.usd", "re:^max_\\d+\\.usda$"]
+    assert spec.exclude == ["*_old.usd"]
+    assert spec.prune[0] == "Materials" and ".thumbs" in spec.prune
+    again = FilterSpec.parse(spec.text)
+    assert (again.include, again.exclude, again.prune) == (spec.include, spec.exclude, spec.prune)
+
+
+def test_filter_matches_names_case_insensitively():
+    spec = FilterSpec.parse("max_*.usd; re:^max_\\d+\\.usda$; !*_old.usd; backup*/")
+    assert spec.match("max_A.usd") and spec.match("MAX_b.USD") and spec.match("max_12.usda")
+    assert not spec.match("max_A_old.usd")
+    assert not spec.match("max_x.usda") and not spec.match("asset_A.usd")
+    assert spec.prunes("backup_2024") and not spec.prunes("lib")
+    assert FilterSpec.parse("").match("anything.txt")
+
+
+def test_scanner_skips_excluded_files_and_pruned_folders(tmp_path):
+    keep = {
+        _touch(tmp_path, "A", "max_A.usd"),
+        _touch(tmp_path, "lib", "B", "max_B.usd"),
+    }
+    _touch(tmp_path, "A", "max_A_old.usd")
+    _touch(tmp_path, "A", "notes.txt")
+    _touch(tmp_path, "A", "Materials", "max_inside.usd")
+    _touch(tmp_path, "backup_1", "C", "max_C.usd")
+
+    found = set(Scanner(str(tmp_path), FilterSpec.parse("max_*.usd; !*_old.usd", prune=DEFAULT_PRUNE)).iter_matches())
+    assert {os.path.normpath(p) for p in found} == keep
+
+    flat = set(Scanner(str(tmp_path / "A"), "max_*.usd", recursive=False).iter_matches())
+    assert {os.path.basename(p) for p in flat} == {"max_A.usd", "max_A_old.usd"}